@@ -30,6 +30,7 @@ from .engine import (
     docker_logout,
     build_image,
     push_image,
+    build_and_push_image,
     pull_image,
     list_images,
     remove_image,
@@ -48,12 +49,15 @@ from .services import (
     deploy_application,
     deploy_and_run_container,
     create_deployment_plan,
-    scale_application
+    scale_application,
+    scale_application_async,
+    format_log
 )
 
 # Utilities
 from .utils import (
     detect_project_ports,
+    get_port_mappings,
     parse_dockerfile_info,
     detect_project_type,
     generate_container_name
@@ -75,6 +79,7 @@ __all__ = [
     "docker_logout",
     "build_image",
     "push_image",
+    "build_and_push_image",
     "pull_image",
     "list_images",
     "remove_image",
@@ -92,9 +97,12 @@ __all__ = [
     "deploy_and_run_container",
     "create_deployment_plan",
     "scale_application",
+    "scale_application_async",
+    "format_log",
     
     # Utilities
     "detect_project_ports",
+    "get_port_mappings",
     "parse_dockerfile_info",
     "detect_project_type",
     "generate_container_name"
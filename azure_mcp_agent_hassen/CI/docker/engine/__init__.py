@@ -10,6 +10,7 @@ from .client import (
     docker_logout,
     build_image,
     push_image,
+    build_and_push_image,
     pull_image,
     list_images,
     remove_image
@@ -23,7 +24,22 @@ from .containers import (
     restart_container,
     remove_container,
     get_container_logs,
-    inspect_container
+    stream_container_logs,
+    inspect_container,
+    run_container_async,
+    list_containers_async,
+    stop_container_async,
+    start_container_async,
+    restart_container_async,
+    remove_container_async,
+    get_container_logs_async,
+    stream_container_logs_async,
+    inspect_container_async
+)
+
+from .events import (
+    containers_for_image,
+    containers_for_image_async
 )
 
 __all__ = [
@@ -32,6 +48,7 @@ __all__ = [
     "docker_logout",
     "build_image",
     "push_image",
+    "build_and_push_image",
     "pull_image",
     "list_images",
     "remove_image",
@@ -44,5 +61,19 @@ __all__ = [
     "restart_container",
     "remove_container",
     "get_container_logs",
-    "inspect_container"
+    "stream_container_logs",
+    "inspect_container",
+    "run_container_async",
+    "list_containers_async",
+    "stop_container_async",
+    "start_container_async",
+    "restart_container_async",
+    "remove_container_async",
+    "get_container_logs_async",
+    "stream_container_logs_async",
+    "inspect_container_async",
+    
+    # Container index
+    "containers_for_image",
+    "containers_for_image_async"
 ]
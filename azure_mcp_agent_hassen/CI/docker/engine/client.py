@@ -6,24 +6,181 @@ container operations, and registry interactions.
 """
 
 import os
+import json
+import atexit
+import functools
+import hashlib
+import shutil
 import subprocess
 import logging
-from typing import Dict, List, Optional, Any
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from dotenv import load_dotenv
 
-from ..models import DockerRegistryCredentials, ContainerInfo, ImageInfo
+from ..models import DockerRegistryCredentials
+
+try:
+    import docker
+    DOCKER_SDK_AVAILABLE = True
+except ImportError:
+    DOCKER_SDK_AVAILABLE = False
 
 load_dotenv()
 
+# Registry settings don't change while the process runs, so read them once
+_DOCKER_USER = os.getenv("DOCKER_USERNAME")
+_DOCKER_REGISTRY = os.getenv("DOCKER_REGISTRY", "docker.io")
+
+# Successful logins are reused for this long, keyed by (username, registry,
+# password digest, via CLI); an auth failure on push/pull forgets them all
+DOCKER_LOGIN_TTL = 3600
+_LOGINS: Dict[Tuple[str, str, bytes, bool], float] = {}
+# Lower-case fragments of registry errors that mean the credentials are bad
+_AUTH_ERROR_MARKERS = ("unauthorized", "authentication required", "denied", "401")
+
+# Full build/push/pull output goes to disk; only the tail is kept in memory.
+# Only the newest DOCKER_LOG_KEEP log files are kept.
+DOCKER_LOG_DIR = Path(tempfile.gettempdir()) / "docker_mcp_logs"
+DOCKER_LOG_KEEP = 50
+LOG_TAIL_LINES = 200
+
+# Resolved once so CLI calls skip the PATH search and can use posix_spawn
+DOCKER_CMD = shutil.which("docker") or "docker"
+
+# Keep-alive connections the shared client may hold open to the daemon at once
+DOCKER_POOL_SIZE = max(4, os.cpu_count() or 1)
+
 
-def docker_login(credentials: Optional[DockerRegistryCredentials] = None) -> Dict[str, Any]:
-    """Login to Docker registry"""
+@functools.lru_cache(maxsize=1)
+def get_docker_client() -> "docker.DockerClient":
+    """Get the shared Docker Engine API client (talks to the daemon socket directly)
+    
+    One client is reused for the life of the process; its HTTP adapter pools
+    up to DOCKER_POOL_SIZE daemon connections, so concurrent callers share
+    sockets instead of opening new ones per call.
+    """
+    client = docker.from_env(timeout=600, max_pool_size=DOCKER_POOL_SIZE)
+    atexit.register(client.close)
+    return client
+
+
+def _prune_logs(keep: int) -> None:
+    """Delete all but the newest `keep` log files"""
+    try:
+        with os.scandir(DOCKER_LOG_DIR) as entries:
+            logs = [(entry.stat().st_mtime_ns, entry.path) for entry in entries if entry.name.endswith(".log")]
+    except OSError:
+        return
+    logs.sort(reverse=True)
+    for _, path in logs[keep:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _write_log(lines: Iterable[str], operation: str) -> Tuple[str, str]:
+    """Write output lines to a new log file, keeping only the tail in memory
+    
+    Returns the last LOG_TAIL_LINES lines and the log file path. Older log
+    files beyond DOCKER_LOG_KEEP are removed first.
+    """
+    DOCKER_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    # Leave room for the file about to be written
+    _prune_logs(DOCKER_LOG_KEEP - 1)
+    fd, log_path = tempfile.mkstemp(prefix=f"{operation}-", suffix=".log", dir=DOCKER_LOG_DIR)
+    tail = deque(maxlen=LOG_TAIL_LINES)
+    
+    with os.fdopen(fd, "w") as log_file:
+        for line in lines:
+            line = line.rstrip("\n")
+            log_file.write(f"{line}\n")
+            tail.append(line)
+    
+    return "\n".join(tail), log_path
+
+
+def _run_streamed(cmd: List[str], operation: str) -> Tuple[str, str]:
+    """Run a docker command, streaming its output to a log file
+    
+    Raises CalledProcessError (with the tail as stderr) on a non-zero exit.
+    """
+    with subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, close_fds=False
+    ) as proc:
+        output, log_path = _write_log(proc.stdout, operation)
+    
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output, stderr=output)
+    return output, log_path
+
+
+def _run_quiet(cmd: List[str]) -> Tuple[str, None]:
+    """Run a docker command whose progress output isn't wanted (no log file)
+    
+    Returns the command's (short) stdout, e.g. the image ID from `build -q`.
+    """
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False)
+    return result.stdout.strip(), None
+
+
+def _drain(lines: Iterable[str]) -> Tuple[str, None]:
+    """Consume an SDK progress stream (raising on errors) without logging it"""
+    deque(lines, maxlen=0)
+    return "", None
+
+
+def _event_lines(events: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Turn a decoded Docker API progress stream into log lines"""
+    for event in events:
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        if "stream" in event:
+            yield event["stream"]
+        elif "status" in event:
+            yield f"{event['id']}: {event['status']}" if "id" in event else event["status"]
+
+
+def _forget_logins_on_auth_error(error: str) -> None:
+    """Drop reused logins when a registry call was rejected for its credentials"""
+    if any(marker in error.lower() for marker in _AUTH_ERROR_MARKERS):
+        _LOGINS.clear()
+
+
+def _human_size(size: float) -> str:
+    """Format a byte count the way the docker CLI does (decimal units)"""
+    for unit in ("B", "kB", "MB", "GB", "TB"):
+        if size < 1000:
+            break
+        size /= 1000
+    return f"{size:.4g}{unit}"
+
+
+@functools.lru_cache(maxsize=256)
+def _qualify(image_name: str) -> str:
+    """Prefix the Docker Hub username onto an image name without a namespace"""
+    if "/" in image_name or not _DOCKER_USER:
+        return image_name
+    return f"{_DOCKER_USER}/{image_name}"
+
+
+def docker_login(credentials: Optional[DockerRegistryCredentials] = None,
+                 cli: bool = False) -> Dict[str, Any]:
+    """Login to Docker registry
+    
+    With the SDK installed the login only lives on the shared client; pass
+    cli=True to log the docker CLI in too (its credential store is what
+    `docker buildx` pushes with).
+    """
     try:
         if not credentials:
             # Use environment variables
-            username = os.getenv("DOCKER_USERNAME")
+            username = _DOCKER_USER
             password = os.getenv("DOCKER_PASSWORD")
-            registry = os.getenv("DOCKER_REGISTRY", "docker.io")
+            registry = _DOCKER_REGISTRY
             
             if not username or not password:
                 return {
@@ -37,13 +194,42 @@ def docker_login(credentials: Optional[DockerRegistryCredentials] = None) -> Dic
                 registry=registry
             )
         
-        cmd = ["docker", "login"]
-        if credentials.registry != "docker.io":
-            cmd.append(credentials.registry)
+        use_cli = cli or not DOCKER_SDK_AVAILABLE
         
-        cmd.extend(["--username", credentials.username, "--password", credentials.password])
+        # Failed logins are never recorded, so they are always retried
+        login_key = (
+            credentials.username,
+            credentials.registry,
+            hashlib.blake2b(credentials.password.encode(), digest_size=16).digest(),
+            use_cli
+        )
+        logged_in_at = _LOGINS.get(login_key)
+        if logged_in_at is not None and time.monotonic() - logged_in_at < DOCKER_LOGIN_TTL:
+            return {
+                "status": "ok",
+                "message": "Docker login reused",
+                "registry": credentials.registry
+            }
+        
+        if not use_cli:
+            # Credentials stay on the shared client for later pushes and pulls
+            get_docker_client().login(
+                username=credentials.username,
+                password=credentials.password,
+                registry=credentials.registry
+            )
+        else:
+            cmd = [DOCKER_CMD, "login"]
+            if credentials.registry != "docker.io":
+                cmd.append(credentials.registry)
+            
+            # Feed the password on stdin so it never appears in the process list
+            cmd.extend(["--username", credentials.username, "--password-stdin"])
+            
+            subprocess.run(cmd, input=credentials.password, capture_output=True, text=True,
+                           check=True, close_fds=False)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        _LOGINS[login_key] = time.monotonic()
         
         return {
             "status": "ok",
@@ -62,11 +248,15 @@ def docker_login(credentials: Optional[DockerRegistryCredentials] = None) -> Dic
 def docker_logout(registry: Optional[str] = None) -> Dict[str, Any]:
     """Logout from Docker registry"""
     try:
-        cmd = ["docker", "logout"]
+        cmd = [DOCKER_CMD, "logout"]
         if registry:
             cmd.append(registry)
         
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False)
+        
+        logged_out = registry or _DOCKER_REGISTRY
+        for login_key in [key for key in _LOGINS if key[1] == logged_out]:
+            del _LOGINS[login_key]
         
         return {
             "status": "ok",
@@ -80,38 +270,53 @@ def docker_logout(registry: Optional[str] = None) -> Dict[str, Any]:
 
 def build_image(repo_path: str, image_name: str, tag: str = "latest",
                dockerfile: str = "Dockerfile", build_args: Optional[Dict[str, str]] = None,
-               no_cache: bool = False) -> Dict[str, Any]:
-    """Build Docker image"""
+               no_cache: bool = False, quiet: bool = False) -> Dict[str, Any]:
+    """Build Docker image (quiet skips the build log for unattended runs)"""
     try:
         # Ensure image name includes Docker Hub username if not already present
-        if "/" not in image_name:
-            username = os.getenv("DOCKER_USERNAME")
-            if username:
-                image_name = f"{username}/{image_name}"
+        image_name = _qualify(image_name)
         
         full_image_name = f"{image_name}:{tag}"
         
-        cmd = ["docker", "build", "-t", full_image_name]
-        
-        if dockerfile != "Dockerfile":
-            cmd.extend(["-f", dockerfile])
-        
-        if build_args:
-            for key, value in build_args.items():
-                cmd.extend(["--build-arg", f"{key}={value}"])
-        
-        if no_cache:
-            cmd.append("--no-cache")
-        
-        cmd.append(repo_path)
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        if DOCKER_SDK_AVAILABLE:
+            events = get_docker_client().api.build(
+                path=repo_path,
+                tag=full_image_name,
+                dockerfile=dockerfile,
+                buildargs=build_args,
+                nocache=no_cache,
+                rm=True,
+                decode=True
+            )
+            build_log_tail, log_file = (
+                _drain(_event_lines(events)) if quiet else _write_log(_event_lines(events), "build")
+            )
+        else:
+            cmd = [DOCKER_CMD, "build", "-t", full_image_name]
+            
+            if dockerfile != "Dockerfile":
+                cmd.extend(["-f", dockerfile])
+            
+            if build_args:
+                for key, value in build_args.items():
+                    cmd.extend(["--build-arg", f"{key}={value}"])
+            
+            if no_cache:
+                cmd.append("--no-cache")
+            
+            if quiet:
+                cmd.append("--quiet")
+            
+            cmd.append(repo_path)
+            
+            build_log_tail, log_file = _run_quiet(cmd) if quiet else _run_streamed(cmd, "build")
         
         return {
             "status": "ok",
             "image": full_image_name,
             "message": f"Built Docker image: {full_image_name}",
-            "build_log": result.stdout
+            "build_log_tail": build_log_tail,
+            "log_file": log_file
         }
         
     except subprocess.CalledProcessError as e:
@@ -122,88 +327,169 @@ def build_image(repo_path: str, image_name: str, tag: str = "latest",
         return {"status": "error", "error": str(e)}
 
 
-def push_image(image_name: str, tag: str = "latest") -> Dict[str, Any]:
-    """Push Docker image to registry"""
+def push_image(image_name: str, tag: str = "latest", quiet: bool = False) -> Dict[str, Any]:
+    """Push Docker image to registry (quiet skips the push log)"""
     try:
         # Ensure image name includes Docker Hub username if not already present
-        if "/" not in image_name:
-            username = os.getenv("DOCKER_USERNAME")
-            if username:
-                image_name = f"{username}/{image_name}"
+        image_name = _qualify(image_name)
         
         full_image_name = f"{image_name}:{tag}"
         
-        result = subprocess.run(
-            ["docker", "push", full_image_name],
-            capture_output=True, text=True, check=True
-        )
+        if DOCKER_SDK_AVAILABLE:
+            events = get_docker_client().images.push(image_name, tag=tag, stream=True, decode=True)
+            push_log_tail, log_file = (
+                _drain(_event_lines(events)) if quiet else _write_log(_event_lines(events), "push")
+            )
+        elif quiet:
+            push_log_tail, log_file = _run_quiet([DOCKER_CMD, "push", "--quiet", full_image_name])
+        else:
+            push_log_tail, log_file = _run_streamed([DOCKER_CMD, "push", full_image_name], "push")
         
         return {
             "status": "ok",
             "image": full_image_name,
             "message": f"Pushed Docker image: {full_image_name}",
-            "push_log": result.stdout
+            "push_log_tail": push_log_tail,
+            "log_file": log_file
         }
         
     except subprocess.CalledProcessError as e:
         logging.error(f"Docker push failed: {e.stderr}")
+        _forget_logins_on_auth_error(e.stderr or "")
         return {"status": "error", "error": f"Docker push failed: {e.stderr}"}
     except Exception as e:
         logging.error(f"Docker push error: {e}")
+        _forget_logins_on_auth_error(str(e))
         return {"status": "error", "error": str(e)}
 
 
-def pull_image(image_name: str, tag: str = "latest") -> Dict[str, Any]:
-    """Pull Docker image from registry"""
+def build_and_push_image(repo_path: str, image_name: str, tag: str = "latest",
+                         dockerfile: str = "Dockerfile", build_args: Optional[Dict[str, str]] = None,
+                         platforms: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build and push a Docker image in one `docker buildx build --push`
+    
+    Layers upload while later ones are still building, and the pushed image
+    carries inline cache metadata that the next build reuses. Requires the
+    buildx plugin; this always goes through the CLI.
+    """
     try:
+        # An SDK login doesn't reach the CLI's credential store, so log the
+        # CLI in when credentials are configured (else rely on `docker login`)
+        if _DOCKER_USER and os.getenv("DOCKER_PASSWORD"):
+            login_result = docker_login(cli=True)
+            if login_result["status"] != "ok":
+                return login_result
+        
+        image_name = _qualify(image_name)
         full_image_name = f"{image_name}:{tag}"
         
-        result = subprocess.run(
-            ["docker", "pull", full_image_name],
-            capture_output=True, text=True, check=True
-        )
+        cmd = [
+            DOCKER_CMD, "buildx", "build", "--push",
+            "-t", full_image_name,
+            "--cache-to", "type=inline",
+            "--cache-from", full_image_name
+        ]
+        
+        if dockerfile != "Dockerfile":
+            cmd.extend(["-f", dockerfile])
+        
+        for key, value in (build_args or {}).items():
+            cmd.extend(["--build-arg", f"{key}={value}"])
+        
+        if platforms:
+            cmd.extend(["--platform", ",".join(platforms)])
+        
+        cmd.append(repo_path)
+        
+        build_log_tail, log_file = _run_streamed(cmd, "buildx")
+        
+        return {
+            "status": "ok",
+            "image": full_image_name,
+            "message": f"Built and pushed Docker image: {full_image_name}",
+            "build_log_tail": build_log_tail,
+            "log_file": log_file
+        }
+        
+    except subprocess.CalledProcessError as e:
+        logging.error(f"Docker buildx build failed: {e.stderr}")
+        _forget_logins_on_auth_error(e.stderr or "")
+        return {"status": "error", "error": f"Docker buildx build failed: {e.stderr}"}
+    except Exception as e:
+        logging.error(f"Docker buildx build error: {e}")
+        return {"status": "error", "error": str(e)}
+
+
+def pull_image(image_name: str, tag: str = "latest", quiet: bool = False) -> Dict[str, Any]:
+    """Pull Docker image from registry (quiet skips the pull log)"""
+    try:
+        full_image_name = f"{image_name}:{tag}"
+        
+        if DOCKER_SDK_AVAILABLE:
+            events = get_docker_client().api.pull(image_name, tag=tag, stream=True, decode=True)
+            pull_log_tail, log_file = (
+                _drain(_event_lines(events)) if quiet else _write_log(_event_lines(events), "pull")
+            )
+        elif quiet:
+            pull_log_tail, log_file = _run_quiet([DOCKER_CMD, "pull", "--quiet", full_image_name])
+        else:
+            pull_log_tail, log_file = _run_streamed([DOCKER_CMD, "pull", full_image_name], "pull")
         
         return {
             "status": "ok",
             "image": full_image_name,
             "message": f"Pulled Docker image: {full_image_name}",
-            "pull_log": result.stdout
+            "pull_log_tail": pull_log_tail,
+            "log_file": log_file
         }
         
     except subprocess.CalledProcessError as e:
         logging.error(f"Docker pull failed: {e.stderr}")
+        _forget_logins_on_auth_error(e.stderr or "")
         return {"status": "error", "error": f"Docker pull failed: {e.stderr}"}
     except Exception as e:
         logging.error(f"Docker pull error: {e}")
+        _forget_logins_on_auth_error(str(e))
         return {"status": "error", "error": str(e)}
 
 
 def list_images() -> Dict[str, Any]:
     """List all Docker images"""
     try:
-        result = subprocess.run(
-            ["docker", "images", "--format", "table {{.Repository}}\t{{.Tag}}\t{{.ID}}\t{{.Size}}\t{{.CreatedAt}}"],
-            capture_output=True, text=True, check=True
-        )
-        
-        images = []
-        lines = result.stdout.strip().split('\n')[1:]  # Skip header
-        
-        for line in lines:
-            if line.strip():
-                parts = line.split('\t')
-                if len(parts) >= 5:
-                    images.append(ImageInfo(
-                        repository=parts[0],
-                        tag=parts[1],
-                        image_id=parts[2],
-                        size=parts[3],
-                        created=parts[4]
-                    ))
+        if DOCKER_SDK_AVAILABLE:
+            # One entry per repo:tag, matching the CLI listing
+            images = [
+                {
+                    "image_id": image.id,
+                    "repository": repo_tag.rpartition(":")[0],
+                    "tag": repo_tag.rpartition(":")[2],
+                    "size": _human_size(image.attrs.get("Size", 0)),
+                    "created": image.attrs.get("Created", "")
+                }
+                for image in get_docker_client().images.list()
+                for repo_tag in (image.tags or ["<none>:<none>"])
+            ]
+        else:
+            result = subprocess.run(
+                [DOCKER_CMD, "images", "--format", "{{json .}}", "--no-trunc"],
+                capture_output=True, text=True, check=True, close_fds=False
+            )
+            
+            # One JSON object per line; keys match ImageInfo's fields
+            images = [
+                {
+                    "image_id": image["ID"],
+                    "repository": image["Repository"],
+                    "tag": image["Tag"],
+                    "size": image["Size"],
+                    "created": image["CreatedAt"]
+                }
+                for image in map(json.loads, filter(str.strip, result.stdout.splitlines()))
+            ]
         
         return {
             "status": "ok",
-            "images": [img.dict() for img in images],
+            "images": images,
             "count": len(images)
         }
         
@@ -219,19 +505,25 @@ def remove_image(image_name: str, tag: str = "latest", force: bool = False) -> D
     """Remove Docker image"""
     try:
         full_image_name = f"{image_name}:{tag}"
-        cmd = ["docker", "rmi"]
-        
-        if force:
-            cmd.append("--force")
-        
-        cmd.append(full_image_name)
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        if DOCKER_SDK_AVAILABLE:
+            removed = get_docker_client().api.remove_image(full_image_name, force=force)
+            output = "\n".join(
+                f"{action}: {ref}" for entry in removed for action, ref in entry.items()
+            )
+        else:
+            cmd = [DOCKER_CMD, "rmi"]
+            
+            if force:
+                cmd.append("--force")
+            
+            cmd.append(full_image_name)
+            
+            output = subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False).stdout
         
         return {
             "status": "ok",
             "message": f"Removed Docker image: {full_image_name}",
-            "output": result.stdout
+            "output": output
         }
         
     except subprocess.CalledProcessError as e:
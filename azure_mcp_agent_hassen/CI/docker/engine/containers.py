@@ -5,55 +5,96 @@ Container lifecycle operations including creation, running,
 stopping, and monitoring of Docker containers.
 """
 
+import asyncio
+import shlex
 import subprocess
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import datetime, timezone
+from itertools import chain
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Any
 
-from ..models import ContainerInfo, ContainerRunOptions
+from ..models import ContainerRunOptions
+from .client import DOCKER_CMD, DOCKER_SDK_AVAILABLE, get_docker_client
+
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# docker CLI calls use the resolved binary path and close_fds=False so
+# CPython can launch them with posix_spawn instead of fork; our own
+# descriptors are non-inheritable (PEP 446), so nothing leaks into the child
+
+# Cap on log bytes collected by get_container_logs; use stream_container_logs for more
+CONTAINER_LOG_MAX_BYTES = 1024 * 1024
+
+
+def _restart_policy(policy: str) -> Dict[str, Any]:
+    """Convert a CLI restart policy (e.g. "on-failure:3") to the Engine API form"""
+    name, _, retries = policy.partition(":")
+    if retries:
+        return {"Name": name, "MaximumRetryCount": int(retries)}
+    return {"Name": name}
+
+
+def _format_ports(ports: List[Dict[str, Any]]) -> str:
+    """Render Engine API port bindings the way `docker ps` shows them"""
+    return ", ".join(
+        f"{port.get('IP', '0.0.0.0')}:{port['PublicPort']}->{port['PrivatePort']}/{port['Type']}"
+        if port.get("PublicPort") else f"{port['PrivatePort']}/{port['Type']}"
+        for port in ports
+    )
+
+
+def _run_with_sdk(options: ContainerRunOptions) -> str:
+    """Run a container through the Engine API and return its ID (or output when attached)"""
+    container = get_docker_client().containers.run(
+        options.image,
+        detach=options.detach,
+        remove=options.remove,
+        name=options.name,
+        ports={container_port: host_port for host_port, container_port in options.ports.items()},
+        environment=options.environment,
+        volumes=[f"{host_path}:{container_path}" for host_path, container_path in options.volumes.items()],
+        network=options.network,
+        restart_policy=_restart_policy(options.restart_policy) if options.restart_policy else None
+    )
+    if options.detach:
+        return container.id
+    return container.decode().strip()
+
+
+def _run_args(options: ContainerRunOptions) -> List[str]:
+    """Build the `docker run` argv for the given options in one pass"""
+    return [
+        DOCKER_CMD, "run",
+        *(("-d",) if options.detach else ()),
+        *(("--rm",) if options.remove else ()),
+        *(("--name", options.name) if options.name else ()),
+        *chain.from_iterable(("-p", f"{host_port}:{container_port}")
+                             for host_port, container_port in options.ports.items()),
+        *chain.from_iterable(("-e", f"{key}={value}")
+                             for key, value in options.environment.items()),
+        *chain.from_iterable(("-v", f"{host_path}:{container_path}")
+                             for host_path, container_path in options.volumes.items()),
+        *(("--network", options.network) if options.network else ()),
+        *(("--restart", options.restart_policy) if options.restart_policy else ()),
+        options.image
+    ]
 
 
 def run_container(options: ContainerRunOptions) -> Dict[str, Any]:
     """Run a Docker container with specified options"""
     try:
-        cmd = ["docker", "run"]
-        
-        # Add detach flag
-        if options.detach:
-            cmd.append("-d")
-        
-        # Add remove flag
-        if options.remove:
-            cmd.append("--rm")
-        
-        # Add container name
-        if options.name:
-            cmd.extend(["--name", options.name])
-        
-        # Add port mappings
-        for host_port, container_port in options.ports.items():
-            cmd.extend(["-p", f"{host_port}:{container_port}"])
-        
-        # Add environment variables
-        for key, value in options.environment.items():
-            cmd.extend(["-e", f"{key}={value}"])
-        
-        # Add volume mappings
-        for host_path, container_path in options.volumes.items():
-            cmd.extend(["-v", f"{host_path}:{container_path}"])
-        
-        # Add network
-        if options.network:
-            cmd.extend(["--network", options.network])
-        
-        # Add restart policy
-        if options.restart_policy:
-            cmd.extend(["--restart", options.restart_policy])
-        
-        # Add image
-        cmd.append(options.image)
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        container_id = result.stdout.strip()
+        if DOCKER_SDK_AVAILABLE:
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug("Running container via Engine API, CLI equivalent: %s",
+                              shlex.join(_run_args(options)))
+            container_id = _run_with_sdk(options)
+        else:
+            result = subprocess.run(_run_args(options), capture_output=True, text=True, check=True, close_fds=False)
+            container_id = result.stdout.strip()
         
         return {
             "status": "ok",
@@ -71,37 +112,55 @@ def run_container(options: ContainerRunOptions) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
-def list_containers(all_containers: bool = False) -> Dict[str, Any]:
-    """List Docker containers"""
+def list_containers(all_containers: bool = False,
+                    filters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """List Docker containers, optionally filtered by the daemon (e.g. {"ancestor": image})"""
     try:
-        cmd = ["docker", "ps", "--format", 
-               "table {{.ID}}\t{{.Names}}\t{{.Image}}\t{{.Status}}\t{{.Ports}}\t{{.CreatedAt}}\t{{.Command}}"]
-        
-        if all_containers:
-            cmd.append("-a")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        
         containers = []
-        lines = result.stdout.strip().split('\n')[1:]  # Skip header
         
-        for line in lines:
-            if line.strip():
-                parts = line.split('\t')
-                if len(parts) >= 6:
-                    containers.append(ContainerInfo(
-                        container_id=parts[0],
-                        name=parts[1],
-                        image=parts[2],
-                        status=parts[3],
-                        ports=[parts[4]] if parts[4] else [],
-                        created=parts[5],
-                        command=parts[6] if len(parts) > 6 else None
-                    ))
+        # Rows are built as plain dicts in the ContainerInfo shape; the
+        # daemon's output is already well-typed, so skip model validation
+        if DOCKER_SDK_AVAILABLE:
+            # Low-level list: one request, no per-container inspect
+            for container in get_docker_client().api.containers(all=all_containers, filters=filters):
+                ports = _format_ports(container.get("Ports", []))
+                containers.append({
+                    "container_id": container["Id"][:12],
+                    "name": container["Names"][0].lstrip("/") if container.get("Names") else "",
+                    "image": container["Image"],
+                    "status": container["Status"],
+                    "ports": [ports] if ports else [],
+                    "created": datetime.fromtimestamp(container["Created"], timezone.utc).strftime("%Y-%m-%d %H:%M:%S %z %Z"),
+                    "command": container.get("Command")
+                })
+        else:
+            cmd = [DOCKER_CMD, "ps", "--format", "{{json .}}"]
+            
+            if all_containers:
+                cmd.append("-a")
+            
+            for key, value in (filters or {}).items():
+                cmd.extend(["--filter", f"{key}={value}"])
+            
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False)
+            
+            # One JSON object per line, no header
+            for line in result.stdout.splitlines():
+                if line.strip():
+                    record = _loads(line)
+                    containers.append({
+                        "container_id": record["ID"],
+                        "name": record["Names"],
+                        "image": record["Image"],
+                        "status": record["Status"],
+                        "ports": [record["Ports"]] if record["Ports"] else [],
+                        "created": record["CreatedAt"],
+                        "command": record.get("Command")
+                    })
         
         return {
             "status": "ok",
-            "containers": [container.dict() for container in containers],
+            "containers": containers,
             "count": len(containers)
         }
         
@@ -116,10 +175,13 @@ def list_containers(all_containers: bool = False) -> Dict[str, Any]:
 def stop_container(container_id: str, timeout: int = 10) -> Dict[str, Any]:
     """Stop a running Docker container"""
     try:
-        result = subprocess.run(
-            ["docker", "stop", "-t", str(timeout), container_id],
-            capture_output=True, text=True, check=True
-        )
+        if DOCKER_SDK_AVAILABLE:
+            get_docker_client().api.stop(container_id, timeout=timeout)
+        else:
+            subprocess.run(
+                [DOCKER_CMD, "stop", "-t", str(timeout), container_id],
+                capture_output=True, text=True, check=True, close_fds=False
+            )
         
         return {
             "status": "ok",
@@ -138,10 +200,13 @@ def stop_container(container_id: str, timeout: int = 10) -> Dict[str, Any]:
 def start_container(container_id: str) -> Dict[str, Any]:
     """Start a stopped Docker container"""
     try:
-        result = subprocess.run(
-            ["docker", "start", container_id],
-            capture_output=True, text=True, check=True
-        )
+        if DOCKER_SDK_AVAILABLE:
+            get_docker_client().api.start(container_id)
+        else:
+            subprocess.run(
+                [DOCKER_CMD, "start", container_id],
+                capture_output=True, text=True, check=True, close_fds=False
+            )
         
         return {
             "status": "ok",
@@ -160,10 +225,13 @@ def start_container(container_id: str) -> Dict[str, Any]:
 def restart_container(container_id: str, timeout: int = 10) -> Dict[str, Any]:
     """Restart a Docker container"""
     try:
-        result = subprocess.run(
-            ["docker", "restart", "-t", str(timeout), container_id],
-            capture_output=True, text=True, check=True
-        )
+        if DOCKER_SDK_AVAILABLE:
+            get_docker_client().api.restart(container_id, timeout=timeout)
+        else:
+            subprocess.run(
+                [DOCKER_CMD, "restart", "-t", str(timeout), container_id],
+                capture_output=True, text=True, check=True, close_fds=False
+            )
         
         return {
             "status": "ok",
@@ -179,17 +247,23 @@ def restart_container(container_id: str, timeout: int = 10) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
-def remove_container(container_id: str, force: bool = False) -> Dict[str, Any]:
-    """Remove a Docker container"""
+def remove_container(container_id: str, force: bool = False, volumes: bool = False) -> Dict[str, Any]:
+    """Remove a Docker container (force also kills it if running; volumes drops its anonymous volumes)"""
     try:
-        cmd = ["docker", "rm"]
-        
-        if force:
-            cmd.append("-f")
-        
-        cmd.append(container_id)
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        if DOCKER_SDK_AVAILABLE:
+            get_docker_client().api.remove_container(container_id, force=force, v=volumes)
+        else:
+            cmd = [DOCKER_CMD, "rm"]
+            
+            if force:
+                cmd.append("-f")
+            
+            if volumes:
+                cmd.append("-v")
+            
+            cmd.append(container_id)
+            
+            subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False)
         
         return {
             "status": "ok",
@@ -205,26 +279,140 @@ def remove_container(container_id: str, force: bool = False) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
+def stream_container_logs(container_id: str, tail: int = 100, follow: bool = False) -> Iterator[bytes]:
+    """Yield a container's combined stdout/stderr as it arrives"""
+    if DOCKER_SDK_AVAILABLE:
+        chunks = get_docker_client().api.logs(
+            container_id, stdout=True, stderr=True, stream=True,
+            follow=follow, tail=tail if tail > 0 else "all"
+        )
+        try:
+            yield from chunks
+        finally:
+            chunks.close()
+        return
+    
+    cmd = [DOCKER_CMD, "logs"]
+    if tail > 0:
+        cmd.extend(["--tail", str(tail)])
+    if follow:
+        cmd.append("-f")
+    cmd.append(container_id)
+    
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          close_fds=False) as proc:
+        try:
+            yield from proc.stdout
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+
+
+async def stream_container_logs_async(container_id: str, tail: int = 100,
+                                      follow: bool = False) -> AsyncIterator[bytes]:
+    """Async variant of stream_container_logs
+    
+    One worker thread drives the blocking generator and hands chunks to the
+    event loop, so the generator is only ever resumed and closed from that
+    thread. Once the consumer stops, the thread closes the stream after the
+    next chunk arrives (or when the stream ends).
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    
+    def put(item: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            pass  # event loop already closed
+    
+    def pump() -> None:
+        chunks = stream_container_logs(container_id, tail, follow)
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                put(chunk)
+        except Exception as e:
+            put(e)
+        finally:
+            chunks.close()
+            put(None)
+    
+    threading.Thread(target=pump, name="docker-logs", daemon=True).start()
+    try:
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
 def get_container_logs(container_id: str, tail: int = 100, follow: bool = False) -> Dict[str, Any]:
-    """Get logs from a Docker container"""
+    """Get logs from a Docker container
+    
+    At most CONTAINER_LOG_MAX_BYTES are collected; with follow=True this
+    returns once the container stops or the cap is reached.
+    """
     try:
-        cmd = ["docker", "logs"]
+        if DOCKER_SDK_AVAILABLE:
+            chunks = get_docker_client().api.logs(
+                container_id, stdout=True, stderr=True, stream=True, demux=True,
+                follow=follow, tail=tail if tail > 0 else "all"
+            )
+            logs, errors = bytearray(), bytearray()
+            truncated = False
+            try:
+                for out, err in chunks:
+                    logs += out or b""
+                    errors += err or b""
+                    if len(logs) + len(errors) >= CONTAINER_LOG_MAX_BYTES:
+                        truncated = True
+                        break
+            finally:
+                chunks.close()
+            return {
+                "status": "ok",
+                "container_id": container_id,
+                "logs": logs.decode(errors="replace"),
+                "errors": errors.decode(errors="replace"),
+                "truncated": truncated
+            }
+        
+        if follow:
+            # The CLI interleaves both streams once they share a pipe
+            logs = bytearray()
+            truncated = False
+            for chunk in stream_container_logs(container_id, tail, follow):
+                logs += chunk
+                if len(logs) >= CONTAINER_LOG_MAX_BYTES:
+                    truncated = True
+                    break
+            return {
+                "status": "ok",
+                "container_id": container_id,
+                "logs": logs.decode(errors="replace"),
+                "errors": "",
+                "truncated": truncated
+            }
+        
+        cmd = [DOCKER_CMD, "logs"]
         
         if tail > 0:
             cmd.extend(["--tail", str(tail)])
         
-        if follow:
-            cmd.append("-f")
-        
         cmd.append(container_id)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True, close_fds=False)
         
         return {
             "status": "ok",
             "container_id": container_id,
             "logs": result.stdout,
-            "errors": result.stderr
+            "errors": result.stderr,
+            "truncated": False
         }
         
     except subprocess.CalledProcessError as e:
@@ -238,13 +426,15 @@ def get_container_logs(container_id: str, tail: int = 100, follow: bool = False)
 def inspect_container(container_id: str) -> Dict[str, Any]:
     """Get detailed information about a Docker container"""
     try:
-        result = subprocess.run(
-            ["docker", "inspect", container_id],
-            capture_output=True, text=True, check=True
-        )
-        
-        import json
-        container_details = json.loads(result.stdout)[0]
+        if DOCKER_SDK_AVAILABLE:
+            container_details = get_docker_client().api.inspect_container(container_id)
+        else:
+            result = subprocess.run(
+                [DOCKER_CMD, "inspect", container_id],
+                capture_output=True, text=True, check=True, close_fds=False
+            )
+            
+            container_details = _loads(result.stdout)[0]
         
         return {
             "status": "ok",
@@ -258,3 +448,45 @@ def inspect_container(container_id: str) -> Dict[str, Any]:
     except Exception as e:
         logging.error(f"Inspect container error: {e}")
         return {"status": "error", "error": str(e)}
+
+
+async def run_container_async(options: ContainerRunOptions) -> Dict[str, Any]:
+    """Async variant of run_container that keeps the event loop free"""
+    return await asyncio.to_thread(run_container, options)
+
+
+async def list_containers_async(all_containers: bool = False,
+                                filters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Async variant of list_containers that keeps the event loop free"""
+    return await asyncio.to_thread(list_containers, all_containers, filters)
+
+
+async def stop_container_async(container_id: str, timeout: int = 10) -> Dict[str, Any]:
+    """Async variant of stop_container that keeps the event loop free"""
+    return await asyncio.to_thread(stop_container, container_id, timeout)
+
+
+async def start_container_async(container_id: str) -> Dict[str, Any]:
+    """Async variant of start_container that keeps the event loop free"""
+    return await asyncio.to_thread(start_container, container_id)
+
+
+async def restart_container_async(container_id: str, timeout: int = 10) -> Dict[str, Any]:
+    """Async variant of restart_container that keeps the event loop free"""
+    return await asyncio.to_thread(restart_container, container_id, timeout)
+
+
+async def remove_container_async(container_id: str, force: bool = False,
+                                 volumes: bool = False) -> Dict[str, Any]:
+    """Async variant of remove_container that keeps the event loop free"""
+    return await asyncio.to_thread(remove_container, container_id, force, volumes)
+
+
+async def get_container_logs_async(container_id: str, tail: int = 100, follow: bool = False) -> Dict[str, Any]:
+    """Async variant of get_container_logs that keeps the event loop free"""
+    return await asyncio.to_thread(get_container_logs, container_id, tail, follow)
+
+
+async def inspect_container_async(container_id: str) -> Dict[str, Any]:
+    """Async variant of inspect_container that keeps the event loop free"""
+    return await asyncio.to_thread(inspect_container, container_id)
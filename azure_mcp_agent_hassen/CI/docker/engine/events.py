@@ -0,0 +1,128 @@
+"""
+Docker Container Index
+
+In-process index of containers per image, kept current from the
+daemon's event stream so repeated lookups (e.g. scaling checks) don't
+have to list every container on the host each time.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Any
+
+from .client import DOCKER_SDK_AVAILABLE, get_docker_client
+from .containers import list_containers
+
+# image -> {container_id: name}, newest container first; only images that
+# have been snapshotted are tracked
+_INDEX: Dict[str, Dict[str, str]] = {}
+# image -> events seen while its snapshot is being listed, replayed onto it
+_PENDING: Dict[str, List[Dict[str, Any]]] = {}
+_INDEX_LOCK = threading.Lock()
+_watcher: Optional[threading.Thread] = None
+
+
+def _replay(containers: Dict[str, str], event: Dict[str, Any]) -> Dict[str, str]:
+    """Return an image's containers with one create/destroy event applied"""
+    actor = event.get("Actor", {})
+    container_id = actor.get("ID", "")[:12]
+    if event.get("Action") == "create":
+        return {container_id: actor.get("Attributes", {}).get("name", ""), **containers}
+    if event.get("Action") == "destroy":
+        containers.pop(container_id, None)
+    return containers
+
+
+def _apply_event(event: Dict[str, Any]) -> None:
+    """Update the index from one container create/destroy event"""
+    image = event.get("Actor", {}).get("Attributes", {}).get("image")
+
+    with _INDEX_LOCK:
+        containers = _INDEX.get(image)
+        if containers is not None:
+            _INDEX[image] = _replay(containers, event)
+        elif image in _PENDING:
+            _PENDING[image].append(event)
+
+
+def _watch_events(events: Any) -> None:
+    """Apply daemon events until the stream ends, then drop the index"""
+    global _watcher
+    try:
+        for event in events:
+            _apply_event(event)
+    except Exception as e:
+        logging.warning("Docker event stream ended: %s", e)
+    finally:
+        # Without the stream the index can go stale, so start over next time
+        with _INDEX_LOCK:
+            _INDEX.clear()
+            _PENDING.clear()
+            _watcher = None
+
+
+def _ensure_watcher() -> None:
+    """Subscribe to container create/destroy events once per process"""
+    global _watcher
+    with _INDEX_LOCK:
+        if _watcher is not None:
+            return
+        events = get_docker_client().api.events(
+            decode=True, filters={"type": "container", "event": ["create", "destroy"]}
+        )
+        _watcher = threading.Thread(target=_watch_events, args=(events,),
+                                    name="docker-events", daemon=True)
+        _watcher.start()
+
+
+def containers_for_image(image: str) -> List[Dict[str, str]]:
+    """Get the containers (running or not) created from an image, newest first
+
+    Containers match on the image reference they were created with, as the
+    daemon's events report it. The first lookup for an image lists its
+    containers once; after that the index is maintained from `docker events`.
+    Without the Docker SDK this falls back to listing containers on every call.
+    """
+    if not DOCKER_SDK_AVAILABLE:
+        result = list_containers(all_containers=True, filters={"ancestor": image})
+        if result["status"] != "ok":
+            raise RuntimeError(result["error"])
+        return [
+            {"container_id": c["container_id"], "name": c["name"]}
+            for c in result["containers"] if c["image"] == image
+        ]
+
+    _ensure_watcher()
+
+    with _INDEX_LOCK:
+        containers = _INDEX.get(image)
+        if containers is not None:
+            return [{"container_id": cid, "name": name} for cid, name in containers.items()]
+        # Buffer this image's events from here on so any create/destroy that
+        # lands while the snapshot is listed gets replayed onto it
+        _PENDING.setdefault(image, [])
+
+    # `ancestor` also matches other tags of the image and images built
+    # from it; keep only what the create/destroy events are keyed by
+    snapshot = {
+        container["Id"][:12]: container["Names"][0].lstrip("/") if container.get("Names") else ""
+        for container in get_docker_client().api.containers(all=True, filters={"ancestor": image})
+        if container.get("Image") == image
+    }
+    with _INDEX_LOCK:
+        containers = _INDEX.get(image)
+        if containers is None:
+            pending = _PENDING.pop(image, None)
+            containers = snapshot
+            for event in pending or []:
+                containers = _replay(containers, event)
+            if pending is not None:
+                # Otherwise the event stream ended meanwhile; don't index
+                _INDEX[image] = containers
+        return [{"container_id": cid, "name": name} for cid, name in containers.items()]
+
+
+async def containers_for_image_async(image: str) -> List[Dict[str, str]]:
+    """Async variant of containers_for_image that keeps the event loop free"""
+    return await asyncio.to_thread(containers_for_image, image)
@@ -9,12 +9,16 @@ from .deployment import (
     deploy_application,
     deploy_and_run_container,
     create_deployment_plan,
-    scale_application
+    scale_application,
+    scale_application_async,
+    format_log
 )
 
 __all__ = [
     "deploy_application",
     "deploy_and_run_container",
     "create_deployment_plan",
-    "scale_application"
+    "scale_application",
+    "scale_application_async",
+    "format_log"
 ]
@@ -5,54 +5,86 @@ High-level deployment and orchestration services for Docker containers
 including automated deployment pipelines and container management.
 """
 
+import asyncio
 import os
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 
 from ..models import DeployRequest, ContainerRunOptions, PortDetectionResult
-from ..engine import build_image, push_image, run_container, docker_login
-from ..utils import detect_project_ports, generate_container_name
+from ..engine import build_image, push_image, run_container, run_container_async, docker_login
+from ..utils import detect_project_ports, generate_container_name, get_port_mappings
+
+# Upper bound on concurrent container creations/removals while scaling
+SCALE_WORKERS = 16
+
+# Deployment and scaling logs are collected as (status, stage, payload)
+# entries; format_log turns them into the lines returned to callers
+LogEntry = Tuple[str, str, Optional[str]]
+
+_LOG_MESSAGES = {
+    ("ok", "login"): "✅ Docker login successful",
+    ("ok", "build"): "✅ Built image: {}",
+    ("ok", "push"): "✅ Pushed image: {}",
+    ("ok", "start_replica"): "✅ Started replica: {}",
+    ("error", "start_replica"): "❌ Failed to start replica: {}",
+    ("ok", "remove_replica"): "✅ Removed replica: {}",
+    ("error", "stop_replica"): "❌ Failed to stop replica: {}",
+    ("warning", "remove_replica"): "⚠️ Stopped but failed to remove: {}",
+    ("error", "remove_replica"): "❌ Failed to remove replica: {}",
+}
+
+
+def format_log(entries: List[LogEntry]) -> List[str]:
+    """Render structured deployment/scaling log entries as display strings"""
+    return [
+        _LOG_MESSAGES[(status, stage)].format(payload)
+        for status, stage, payload in entries
+    ]
 
 
 async def deploy_application(deploy_request: DeployRequest) -> Dict[str, Any]:
     """Complete deployment pipeline for a repository"""
     try:
-        deployment_log = []
+        deployment_log: List[LogEntry] = []
         
         # Step 1: Docker login
-        login_result = docker_login()
+        login_result = await asyncio.to_thread(docker_login)
         if login_result["status"] != "ok":
             return {"status": "error", "error": f"Docker login failed: {login_result.get('error')}"}
-        deployment_log.append("✅ Docker login successful")
+        deployment_log.append(("ok", "login", None))
         
-        # Step 2: Build image
-        build_result = build_image(
-            repo_path=deploy_request.repo_path,
-            image_name=deploy_request.image_name,
-            tag=deploy_request.tag
+        # Step 2: Build image, detecting ports from the same checkout meanwhile
+        build_result, port_detection = await asyncio.gather(
+            asyncio.to_thread(
+                build_image,
+                repo_path=deploy_request.repo_path,
+                image_name=deploy_request.image_name,
+                tag=deploy_request.tag
+            ),
+            asyncio.to_thread(detect_project_ports, deploy_request.repo_path)
         )
         if build_result["status"] != "ok":
             return {"status": "error", "error": f"Build failed: {build_result.get('error')}"}
-        deployment_log.append(f"✅ Built image: {build_result['image']}")
+        deployment_log.append(("ok", "build", build_result["image"]))
         
         # Step 3: Push image
-        push_result = push_image(
+        push_result = await asyncio.to_thread(
+            push_image,
             image_name=deploy_request.image_name,
             tag=deploy_request.tag
         )
         if push_result["status"] != "ok":
             return {"status": "error", "error": f"Push failed: {push_result.get('error')}"}
-        deployment_log.append(f"✅ Pushed image: {push_result['image']}")
-        
-        # Step 4: Detect ports for deployment
-        port_detection = detect_project_ports(deploy_request.repo_path)
+        deployment_log.append(("ok", "push", push_result["image"]))
         
         return {
             "status": "success",
             "image": build_result["image"],
-            "deployment_log": deployment_log,
+            "deployment_log": format_log(deployment_log),
             "repo_full_name": deploy_request.repo_full_name,
             "detected_ports": port_detection.detected_ports,
+            "port_detection": port_detection,
             "message": "Application deployed successfully"
         }
         
@@ -61,22 +93,19 @@ async def deploy_application(deploy_request: DeployRequest) -> Dict[str, Any]:
         return {"status": "error", "error": f"Deployment failed: {str(e)}"}
 
 
-def deploy_and_run_container(deploy_request: DeployRequest, 
+async def deploy_and_run_container(deploy_request: DeployRequest, 
                            port_mappings: Optional[Dict[str, str]] = None,
                            environment: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """Deploy application and immediately run container"""
     try:
         # First deploy the application
-        deploy_result = deploy_application(deploy_request)
+        deploy_result = await deploy_application(deploy_request)
         if deploy_result["status"] != "success":
             return deploy_result
         
-        # Detect ports if not provided
+        # Reuse the ports found during deployment if none were provided
         if not port_mappings:
-            port_detection = detect_project_ports(deploy_request.repo_path)
-            port_mappings = {}
-            for port in port_detection.detected_ports[:3]:  # Use first 3 detected ports
-                port_mappings[str(port)] = str(port)
+            port_mappings = get_port_mappings(deploy_result["port_detection"])
         
         # Generate container name
         container_name = generate_container_name(deploy_request.image_name, deploy_request.tag)
@@ -92,7 +121,7 @@ def deploy_and_run_container(deploy_request: DeployRequest,
         )
         
         # Run container
-        run_result = run_container(run_options)
+        run_result = await run_container_async(run_options)
         if run_result["status"] != "ok":
             return {"status": "error", "error": f"Failed to run container: {run_result.get('error')}"}
         
@@ -163,21 +192,24 @@ def create_deployment_plan(repo_path: str, image_name: str) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
-def scale_application(image_name: str, tag: str, replicas: int) -> Dict[str, Any]:
-    """Scale application by running multiple container instances"""
+def scale_application(image_name: str, tag: str, replicas: int,
+                      stop_timeout: Optional[int] = None) -> Dict[str, Any]:
+    """Scale application by running multiple container instances concurrently
+    
+    Excess replicas are force-removed; pass stop_timeout to give them a
+    graceful stop first.
+    """
     try:
-        from ..engine import list_containers
-        
-        # Get existing containers for this image
-        containers_result = list_containers(all_containers=True)
-        if containers_result["status"] != "ok":
-            return {"status": "error", "error": "Failed to list containers"}
+        from ..engine import containers_for_image
         
         full_image_name = f"{image_name}:{tag}"
-        existing_containers = [
-            c for c in containers_result["containers"]
-            if c["image"] == full_image_name
-        ]
+        
+        # Get existing containers for this image from the event-fed index
+        try:
+            existing_containers = containers_for_image(full_image_name)
+        except Exception as e:
+            logging.error(f"Failed to list containers: {e}")
+            return {"status": "error", "error": "Failed to list containers"}
         
         current_replicas = len(existing_containers)
         
@@ -188,54 +220,67 @@ def scale_application(image_name: str, tag: str, replicas: int) -> Dict[str, Any
                 "current_replicas": current_replicas
             }
         
-        scaling_log = []
+        scaling_log: List[LogEntry] = []
         
         if replicas > current_replicas:
-            # Scale up - create new containers
-            for i in range(replicas - current_replicas):
-                container_name = f"{image_name.replace('/', '_')}_{tag}_replica_{current_replicas + i + 1}"
-                
-                run_options = ContainerRunOptions(
-                    image=full_image_name,
-                    name=container_name,
-                    detach=True,
-                    restart_policy="unless-stopped"
-                )
-                
-                run_result = run_container(run_options)
-                if run_result["status"] == "ok":
-                    scaling_log.append(f"✅ Started replica: {container_name}")
-                else:
-                    scaling_log.append(f"❌ Failed to start replica: {container_name}")
+            # Scale up - create the new containers side by side
+            container_names = [
+                f"{image_name.replace('/', '_')}_{tag}_replica_{current_replicas + i + 1}"
+                for i in range(replicas - current_replicas)
+            ]
+            with ThreadPoolExecutor(max_workers=min(len(container_names), SCALE_WORKERS)) as executor:
+                run_results = list(executor.map(run_container, (
+                    ContainerRunOptions(
+                        image=full_image_name,
+                        name=container_name,
+                        detach=True,
+                        restart_policy="unless-stopped"
+                    )
+                    for container_name in container_names
+                )))
+            
+            for container_name, run_result in zip(container_names, run_results):
+                status = "ok" if run_result["status"] == "ok" else "error"
+                scaling_log.append((status, "start_replica", container_name))
         
         else:
-            # Scale down - stop excess containers
+            # Scale down - remove excess containers
             from ..engine import stop_container, remove_container
             
-            containers_to_remove = existing_containers[replicas:]
-            for container in containers_to_remove:
+            def retire(container: Dict[str, Any]) -> LogEntry:
                 container_id = container["container_id"]
                 
-                # Stop container
-                stop_result = stop_container(container_id)
-                if stop_result["status"] == "ok":
-                    # Remove container
-                    remove_result = remove_container(container_id)
-                    if remove_result["status"] == "ok":
-                        scaling_log.append(f"✅ Removed replica: {container['name']}")
-                    else:
-                        scaling_log.append(f"⚠️ Stopped but failed to remove: {container['name']}")
-                else:
-                    scaling_log.append(f"❌ Failed to stop replica: {container['name']}")
+                if stop_timeout is not None:
+                    stop_result = stop_container(container_id, timeout=stop_timeout)
+                    if stop_result["status"] != "ok":
+                        return ("error", "stop_replica", container["name"])
+                
+                # Kill (if still running) and remove in one daemon call
+                remove_result = remove_container(container_id, force=True, volumes=True)
+                if remove_result["status"] != "ok":
+                    status = "warning" if stop_timeout is not None else "error"
+                    return (status, "remove_replica", container["name"])
+                return ("ok", "remove_replica", container["name"])
+            
+            # Removals are pure waits on the daemon, so run them side by side
+            containers_to_remove = existing_containers[replicas:]
+            with ThreadPoolExecutor(max_workers=min(len(containers_to_remove), SCALE_WORKERS)) as executor:
+                scaling_log.extend(executor.map(retire, containers_to_remove))
         
         return {
             "status": "ok",
             "message": f"Scaled application to {replicas} replicas",
             "previous_replicas": current_replicas,
             "target_replicas": replicas,
-            "scaling_log": scaling_log
+            "scaling_log": format_log(scaling_log)
         }
         
     except Exception as e:
         logging.error(f"Scaling failed: {e}")
         return {"status": "error", "error": f"Scaling failed: {str(e)}"}
+
+
+async def scale_application_async(image_name: str, tag: str, replicas: int,
+                                  stop_timeout: Optional[int] = None) -> Dict[str, Any]:
+    """Async variant of scale_application that keeps the event loop free"""
+    return await asyncio.to_thread(scale_application, image_name, tag, replicas, stop_timeout)
@@ -7,6 +7,7 @@ port detection, project analysis, and container configuration.
 
 from .ports import (
     detect_project_ports,
+    get_port_mappings,
     parse_dockerfile_info,
     detect_nodejs_ports,
     detect_python_ports,
@@ -19,6 +20,7 @@ from .ports import (
 
 __all__ = [
     "detect_project_ports",
+    "get_port_mappings",
     "parse_dockerfile_info",
     "detect_nodejs_ports",
     "detect_python_ports",
@@ -5,98 +5,260 @@ Utilities for detecting ports from project configuration and
 intelligently configuring container deployments.
 """
 
+import functools
+import itertools
 import os
 import re
 import json
+import shlex
+import string
 import logging
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional, Any, Set, Tuple
 
 from ..models import PortDetectionResult, DockerfileInfo
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Patterns are compiled once here; port detection runs them per line/file
+_DIGIT_RE = re.compile(r'\d+')
+_LABEL_RE = re.compile(r'(\w+)="([^"]+)"')
+_DOCKERFILE_DIRECTIVE_RE = re.compile(
+    r'^\s*(FROM|EXPOSE|ENV|ARG|LABEL|WORKDIR|ENTRYPOINT|CMD)[ \t]+(.*?)\s*$',
+    re.MULTILINE | re.IGNORECASE
+)
+_SCRIPT_PORT_RE = re.compile(r'--port[=\s]+(\d+)')
+# port=/listen= values or a bind "host:port" string, in one pass per file
+_PY_PORTS_RE = re.compile(r'(?:port|listen)[=\s]*(\d+)|bind[=\s]*["\'][^"\']*:(\d+)["\']')
+_ENV_PORT_RE = re.compile(r'PORT[=\s]*(\d+)', re.IGNORECASE)
+_SAFE_NAME_RE = re.compile(r'[^a-zA-Z0-9_.-]')
+
+# Maps every Latin-1 character Docker doesn't allow in names to "_"
+_SAFE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
+_SAFE_NAME_TABLE = str.maketrans({
+    chr(i): "_" for i in range(256) if chr(i) not in _SAFE_NAME_CHARS
+})
+
+# Node.js framework dependencies and their default ports, in priority order
+_NODE_FRAMEWORK_PORTS = (
+    ("express", 3000),
+    ("koa", 3000),
+    ("fastify", 3000),
+    ("next", 3000),
+    ("nuxt", 3000),
+    ("vue", 8080),
+    ("react", 3000),
+    ("angular", 4200),
+)
+
+# Root-level framework files and the default ports they imply
+_FRAMEWORK_FILES = {
+    "next.config.js": [3000],
+    "nuxt.config.js": [3000],
+    "angular.json": [4200],
+    "vue.config.js": [8080],
+    "gatsby-config.js": [8000],
+    "svelte.config.js": [5000],
+    "manage.py": [8000],  # Django
+    "app.py": [5000],     # Flask
+    "main.py": [8000],    # FastAPI
+}
+
+_ENV_FILES = (".env", ".env.local", ".env.development", ".env.production")
+
+# Directories never worth scanning for port settings
+_SKIP_DIRS = frozenset({
+    "node_modules", ".git", ".venv", "venv", "__pycache__",
+    "dist", "build", ".tox", ".mypy_cache"
+})
+# One thread per independent detector in detect_project_ports
+DETECTOR_WORKERS = 5
+
+# Port settings sit near the top of a source file; don't read more than this
+SOURCE_READ_LIMIT = 256 * 1024
+# The source scan stops after this many files with ports, or files read
+PY_SCAN_MAX_MATCHES = 10
+PY_SCAN_MAX_FILES = 200
+# Entry points and settings live near the root, even in monorepos
+PY_SCAN_MAX_DEPTH = 3
+
+
+def _root_names(repo_path: str) -> Set[str]:
+    """Names of the entries at the repository root, from one directory read"""
+    try:
+        with os.scandir(repo_path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime, size) of a file for cache keys, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _ports_cache_key(repo_path: str, names: Set[str]) -> Tuple:
+    """Stats of every file port detection may read
+    
+    Covers the root entries, the root config files and the Python sources
+    the scan would visit, so adding or editing any of them changes the key.
+    """
+    config_files = ("Dockerfile", "package.json", "requirements.txt") + _ENV_FILES
+    sources = itertools.islice(_iter_py_files(repo_path), PY_SCAN_MAX_FILES)
+    return (
+        frozenset(names),
+        tuple(_stat_key(os.path.join(repo_path, name)) for name in config_files if name in names),
+        tuple((path, _stat_key(path)) for path in sources)
+    )
+
 
 def detect_project_ports(repo_path: str) -> PortDetectionResult:
-    """Detect ports from various project sources"""
+    """Detect ports from various project sources
+    
+    Results are memoized until a file the detection reads changes; listing
+    and stat-ing them is much cheaper than reading and parsing them.
+    """
     try:
-        detected_ports = []
-        dockerfile_ports = []
-        recommended_ports = []
-        config_ports = []
-        default_ports = []
-        
-        # Check Dockerfile for EXPOSE directives
-        dockerfile_path = os.path.join(repo_path, "Dockerfile")
-        if os.path.exists(dockerfile_path):
-            dockerfile_info = parse_dockerfile_info(dockerfile_path)
-            dockerfile_ports = dockerfile_info.exposed_ports
-            detected_ports.extend(dockerfile_ports)
-        
-        # Check package.json for Node.js projects
-        package_json_path = os.path.join(repo_path, "package.json")
-        if os.path.exists(package_json_path):
-            config_ports.extend(detect_nodejs_ports(package_json_path))
-        
-        # Check Python configuration files
-        config_ports.extend(detect_python_ports(repo_path))
-        
-        # Check for common framework configurations
-        framework_ports = detect_framework_ports(repo_path)
-        default_ports.extend(framework_ports)
-        
-        # Check for environment files
-        env_ports = detect_env_ports(repo_path)
-        config_ports.extend(env_ports)
-        
-        # Combine all detected ports
-        all_ports = set(detected_ports + config_ports + default_ports)
-        detected_ports = sorted(list(all_ports))
-        
-        # Generate recommendations based on project type
-        if not detected_ports:
-            project_type = detect_project_type(repo_path)
-            recommended_ports = get_default_ports_for_type(project_type)
-        
-        return PortDetectionResult(
-            detected_ports=detected_ports,
-            dockerfile_ports=dockerfile_ports,
-            recommended_ports=recommended_ports,
-            config_ports=config_ports,
-            default_ports=default_ports
-        )
-        
+        names = _root_names(repo_path)
+        result = _detect_project_ports_cached(repo_path, _ports_cache_key(repo_path, names))
+        return result.copy(deep=True)
     except Exception as e:
         logging.error(f"Port detection failed: {e}")
         return PortDetectionResult()
 
 
+@functools.lru_cache(maxsize=128)
+def _detect_project_ports_cached(repo_path: str, key: Tuple) -> PortDetectionResult:
+    """Cached port detection keyed by the stats of the files it reads
+    
+    Failures raise, so they are never cached.
+    """
+    return _detect_project_ports(repo_path, key[0])
+
+
+def _detect_project_ports(repo_path: str, names: Set[str]) -> PortDetectionResult:
+    """Run every port detector over the repository"""
+    dockerfile_ports = []
+    recommended_ports = []
+    config_ports: Set[int] = set()
+    default_ports: Set[int] = set()
+    
+    # The detectors read independent files, so run them side by side;
+    # the Python source walk usually dominates
+    with ThreadPoolExecutor(max_workers=DETECTOR_WORKERS) as executor:
+        dockerfile_future = (
+            executor.submit(parse_dockerfile_info, os.path.join(repo_path, "Dockerfile"))
+            if "Dockerfile" in names else None
+        )
+        nodejs_future = (
+            executor.submit(detect_nodejs_ports, os.path.join(repo_path, "package.json"))
+            if "package.json" in names else None
+        )
+        python_future = executor.submit(detect_python_ports, repo_path, names)
+        framework_future = executor.submit(detect_framework_ports, repo_path, names)
+        env_future = executor.submit(detect_env_ports, repo_path, names)
+    
+    # Check Dockerfile for EXPOSE directives
+    if dockerfile_future is not None:
+        dockerfile_ports = dockerfile_future.result().exposed_ports
+    
+    # Check package.json for Node.js projects
+    if nodejs_future is not None:
+        config_ports |= nodejs_future.result()
+    
+    # Check Python configuration files
+    config_ports |= python_future.result()
+    
+    # Check for common framework configurations
+    default_ports |= framework_future.result()
+    
+    # Check for environment files
+    config_ports |= env_future.result()
+    
+    # Combine all detected ports
+    detected_ports = sorted(config_ports.union(dockerfile_ports, default_ports))
+    
+    # Generate recommendations based on project type
+    if not detected_ports:
+        project_type = detect_project_type(repo_path, names)
+        recommended_ports = get_default_ports_for_type(project_type)
+    
+    return PortDetectionResult(
+        detected_ports=detected_ports,
+        dockerfile_ports=dockerfile_ports,
+        recommended_ports=recommended_ports,
+        config_ports=sorted(config_ports),
+        default_ports=sorted(default_ports)
+    )
+
+
+def _set_base_image(info: DockerfileInfo, rest: str) -> None:
+    info.base_image = rest.split()[0]
+
+
+def _add_exposed_ports(info: DockerfileInfo, rest: str) -> None:
+    info.exposed_ports.extend(int(p) for p in _DIGIT_RE.findall(rest))
+
+
+def _add_env_var(info: DockerfileInfo, rest: str) -> None:
+    parts = rest.split(None, 1)
+    if len(parts) == 2:
+        info.env_vars[parts[0]] = parts[1]
+
+
+def _add_build_arg(info: DockerfileInfo, rest: str) -> None:
+    info.build_args.append(rest.split()[0])
+
+
+def _add_labels(info: DockerfileInfo, rest: str) -> None:
+    info.labels.update(_LABEL_RE.findall(rest))
+
+
+def _set_working_dir(info: DockerfileInfo, rest: str) -> None:
+    info.working_dir = rest.split()[0]
+
+
+def _set_entrypoint(info: DockerfileInfo, rest: str) -> None:
+    info.entrypoint = parse_docker_command(rest)
+
+
+def _set_cmd(info: DockerfileInfo, rest: str) -> None:
+    info.cmd = parse_docker_command(rest)
+
+
+# Dockerfile instruction -> handler applying its arguments to DockerfileInfo
+_DOCKERFILE_HANDLERS = {
+    "FROM": _set_base_image,
+    "EXPOSE": _add_exposed_ports,
+    "ENV": _add_env_var,
+    "ARG": _add_build_arg,
+    "LABEL": _add_labels,
+    "WORKDIR": _set_working_dir,
+    "ENTRYPOINT": _set_entrypoint,
+    "CMD": _set_cmd,
+}
+
+
 def parse_dockerfile_info(dockerfile_path: str) -> DockerfileInfo:
     """Parse Dockerfile to extract configuration information"""
     info = DockerfileInfo()
     
     try:
-        with open(dockerfile_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.upper().startswith("FROM"):
-                    info.base_image = line.split()[1]
-                elif line.upper().startswith("EXPOSE"):
-                    ports = re.findall(r'\d+', line)
-                    info.exposed_ports.extend(int(p) for p in ports)
-                elif line.upper().startswith("ENV"):
-                    parts = line.split(None, 2)
-                    if len(parts) >= 3:
-                        info.env_vars[parts[1]] = parts[2]
-                elif line.upper().startswith("ARG"):
-                    info.build_args.append(line.split()[1])
-                elif line.upper().startswith("LABEL"):
-                    label_matches = re.findall(r'(\w+)="([^"]+)"', line)
-                    for k, v in label_matches:
-                        info.labels[k] = v
-                elif line.upper().startswith("WORKDIR"):
-                    info.working_dir = line.split()[1]
-                elif line.upper().startswith("ENTRYPOINT"):
-                    info.entrypoint = parse_docker_command(line[10:].strip())
-                elif line.upper().startswith("CMD"):
-                    info.cmd = parse_docker_command(line[3:].strip())
+        # Dockerfiles are small: one read, decoded leniently so stray
+        # non-UTF-8 bytes don't abort the parse
+        with open(dockerfile_path, 'rb') as f:
+            content = f.read().decode('utf-8', 'replace')
+        
+        # One regex pass finds every instruction we care about
+        for match in _DOCKERFILE_DIRECTIVE_RE.finditer(content):
+            _DOCKERFILE_HANDLERS[match.group(1).upper()](info, match.group(2))
                     
     except FileNotFoundError:
         logging.warning(f"Dockerfile not found at {dockerfile_path}")
@@ -106,179 +268,189 @@ def parse_dockerfile_info(dockerfile_path: str) -> DockerfileInfo:
     return info
 
 
-def detect_nodejs_ports(package_json_path: str) -> List[int]:
+def detect_nodejs_ports(package_json_path: str) -> Set[int]:
     """Detect ports from Node.js package.json"""
-    ports = []
+    ports: Set[int] = set()
     
     try:
-        with open(package_json_path, 'r') as f:
-            package_data = json.load(f)
+        # Parse straight from bytes; orjson skips the separate decode step
+        with open(package_json_path, 'rb') as f:
+            package_data = _loads(f.read())
         
         # Check scripts for port references
         scripts = package_data.get("scripts", {})
         for script in scripts.values():
-            port_matches = re.findall(r'--port[=\s]+(\d+)', script)
-            ports.extend(int(p) for p in port_matches)
+            port_matches = _SCRIPT_PORT_RE.findall(script)
+            ports.update(int(p) for p in port_matches)
             
             # Check for common port patterns
             if "3000" in script:
-                ports.append(3000)
+                ports.add(3000)
             elif "8000" in script:
-                ports.append(8000)
+                ports.add(8000)
             elif "5000" in script:
-                ports.append(5000)
+                ports.add(5000)
         
-        # Check dependencies for framework defaults
-        dependencies = {**package_data.get("dependencies", {}), 
-                       **package_data.get("devDependencies", {})}
+        # Check dependencies for framework defaults (first match wins)
+        dependencies = package_data.get("dependencies") or {}
+        dev_dependencies = package_data.get("devDependencies") or {}
         
-        if "express" in dependencies:
-            ports.append(3000)
-        elif "koa" in dependencies:
-            ports.append(3000)
-        elif "fastify" in dependencies:
-            ports.append(3000)
-        elif "next" in dependencies:
-            ports.append(3000)
-        elif "nuxt" in dependencies:
-            ports.append(3000)
-        elif "vue" in dependencies:
-            ports.append(8080)
-        elif "react" in dependencies:
-            ports.append(3000)
-        elif "angular" in dependencies:
-            ports.append(4200)
+        for name, port in _NODE_FRAMEWORK_PORTS:
+            if name in dependencies or name in dev_dependencies:
+                ports.add(port)
+                break
             
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, ValueError) as e:
         logging.warning(f"Failed to parse package.json: {e}")
     except Exception as e:
         logging.error(f"Error detecting Node.js ports: {e}")
         
-    return list(set(ports))
+    return ports
 
 
-def detect_python_ports(repo_path: str) -> List[int]:
-    """Detect ports from Python project files"""
-    ports = []
+def _iter_py_files(root: str, max_depth: int = PY_SCAN_MAX_DEPTH) -> Iterator[str]:
+    """Yield paths of .py files under root, skipping vendored/build directories
+    
+    Directories deeper than max_depth below root are not entered.
+    """
+    stack = [(root, 0)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS and depth < max_depth:
+                        stack.append((entry.path, depth + 1))
+                elif entry.name.endswith('.py') and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
+
+def detect_python_ports(repo_path: str, names: Optional[Set[str]] = None) -> Set[int]:
+    """Detect ports from Python project files
+    
+    A framework named in requirements.txt is taken as authoritative;
+    only without one are the sources scanned.
+    """
+    if names is None:
+        names = _root_names(repo_path)
+    ports: Set[int] = set()
     
     # Check requirements.txt for framework hints
     requirements_path = os.path.join(repo_path, "requirements.txt")
-    if os.path.exists(requirements_path):
+    if "requirements.txt" in names:
         try:
             with open(requirements_path, 'r') as f:
                 requirements = f.read().lower()
                 
             if "django" in requirements:
-                ports.append(8000)
+                return {8000}
             elif "flask" in requirements:
-                ports.append(5000)
+                return {5000}
             elif "fastapi" in requirements:
-                ports.append(8000)
+                return {8000}
             elif "tornado" in requirements:
-                ports.append(8888)
+                return {8888}
             elif "bottle" in requirements:
-                ports.append(8080)
+                return {8080}
                 
         except Exception as e:
             logging.error(f"Error reading requirements.txt: {e}")
     
     # Check Python files for port configurations
-    for root, dirs, files in os.walk(repo_path):
-        for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, 'r') as f:
-                        content = f.read()
-                    
-                    # Look for app.run(), uvicorn.run(), etc.
-                    port_patterns = [
-                        r'port[=\s]*(\d+)',
-                        r'PORT[=\s]*(\d+)',
-                        r'listen[=\s]*(\d+)',
-                        r'bind[=\s]*["\'].*:(\d+)["\']'
-                    ]
-                    
-                    for pattern in port_patterns:
-                        matches = re.findall(pattern, content)
-                        ports.extend(int(p) for p in matches)
-                        
-                except Exception as e:
-                    logging.debug(f"Error reading {file_path}: {e}")
+    matched_files = 0
+    for scanned_files, file_path in enumerate(_iter_py_files(repo_path), 1):
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read(SOURCE_READ_LIMIT)
+            
+            # Look for app.run(), uvicorn.run(), etc.
+            found = [int(m.group(1) or m.group(2)) for m in _PY_PORTS_RE.finditer(content)]
+            if found:
+                ports.update(found)
+                matched_files += 1
+                
+        except Exception as e:
+            logging.debug(f"Error reading {file_path}: {e}")
+        
+        if matched_files >= PY_SCAN_MAX_MATCHES or scanned_files >= PY_SCAN_MAX_FILES:
+            break
                     
-    return list(set(ports))
+    return ports
 
 
-def detect_framework_ports(repo_path: str) -> List[int]:
+def detect_framework_ports(repo_path: str, names: Optional[Set[str]] = None) -> Set[int]:
     """Detect framework-specific default ports"""
-    ports = []
+    if names is None:
+        names = _root_names(repo_path)
     
     # Check for specific framework files
-    framework_files = {
-        "next.config.js": [3000],
-        "nuxt.config.js": [3000],
-        "angular.json": [4200],
-        "vue.config.js": [8080],
-        "gatsby-config.js": [8000],
-        "svelte.config.js": [5000],
-        "manage.py": [8000],  # Django
-        "app.py": [5000],     # Flask
-        "main.py": [8000],    # FastAPI
+    return {
+        port
+        for filename, default_ports in _FRAMEWORK_FILES.items() if filename in names
+        for port in default_ports
     }
-    
-    for filename, default_ports in framework_files.items():
-        if os.path.exists(os.path.join(repo_path, filename)):
-            ports.extend(default_ports)
-    
-    return list(set(ports))
 
 
-def detect_env_ports(repo_path: str) -> List[int]:
+def detect_env_ports(repo_path: str, names: Optional[Set[str]] = None) -> Set[int]:
     """Detect ports from environment files"""
-    ports = []
-    
-    env_files = [".env", ".env.local", ".env.development", ".env.production"]
+    if names is None:
+        names = _root_names(repo_path)
+    ports: Set[int] = set()
     
-    for env_file in env_files:
-        env_path = os.path.join(repo_path, env_file)
-        if os.path.exists(env_path):
+    for env_file in _ENV_FILES:
+        if env_file in names:
+            env_path = os.path.join(repo_path, env_file)
             try:
-                with open(env_path, 'r') as f:
-                    content = f.read()
-                
-                # Look for PORT environment variables
-                port_matches = re.findall(r'PORT[=\s]*(\d+)', content, re.IGNORECASE)
-                ports.extend(int(p) for p in port_matches)
+                # Env files can hold large secrets (PEM blocks, tokens), so
+                # stream them and only regex lines whose key mentions a port
+                with open(env_path, 'r', errors='ignore') as f:
+                    for line in f:
+                        key, sep, _ = line.partition('=')
+                        if not sep or "port" not in key.lower():
+                            continue
+                        match = _ENV_PORT_RE.search(line)
+                        if match:
+                            ports.add(int(match.group(1)))
                 
             except Exception as e:
                 logging.error(f"Error reading {env_path}: {e}")
     
-    return list(set(ports))
+    return ports
 
 
-def detect_project_type(repo_path: str) -> str:
+def detect_project_type(repo_path: str, names: Optional[Set[str]] = None) -> str:
     """Detect the primary project type/framework"""
+    if names is None:
+        names = _root_names(repo_path)
     
     # Check for specific files
-    if os.path.exists(os.path.join(repo_path, "package.json")):
+    if "package.json" in names:
         return "node"
-    elif os.path.exists(os.path.join(repo_path, "requirements.txt")) or \
-         os.path.exists(os.path.join(repo_path, "pyproject.toml")):
+    elif "requirements.txt" in names or "pyproject.toml" in names:
         return "python"
-    elif os.path.exists(os.path.join(repo_path, "Cargo.toml")):
+    elif "Cargo.toml" in names:
         return "rust"
-    elif os.path.exists(os.path.join(repo_path, "go.mod")):
+    elif "go.mod" in names:
         return "go"
-    elif os.path.exists(os.path.join(repo_path, "pom.xml")):
+    elif "pom.xml" in names:
         return "java"
-    elif os.path.exists(os.path.join(repo_path, "Gemfile")):
+    elif "Gemfile" in names:
         return "ruby"
-    elif os.path.exists(os.path.join(repo_path, "composer.json")):
+    elif "composer.json" in names:
         return "php"
     
     return "unknown"
 
 
+def get_port_mappings(port_detection: PortDetectionResult, limit: int = 3) -> Dict[str, str]:
+    """Map the first few detected ports 1:1 from host to container"""
+    return {str(port): str(port) for port in port_detection.detected_ports[:limit]}
+
+
 def get_default_ports_for_type(project_type: str) -> List[int]:
     """Get default ports for project type"""
     defaults = {
@@ -298,18 +470,26 @@ def get_default_ports_for_type(project_type: str) -> List[int]:
 def parse_docker_command(command_str: str) -> List[str]:
     """Parse Docker ENTRYPOINT/CMD string into list"""
     try:
-        # Handle JSON format
-        if command_str.strip().startswith('['):
-            return json.loads(command_str)
+        # Handle JSON (exec) format; find the first non-space without copying
+        start = next((i for i, ch in enumerate(command_str) if not ch.isspace()), len(command_str))
+        if command_str[start:start + 1] == '[':
+            return json.loads(command_str[start:])
         
-        # Handle shell format - simple split for now
-        return command_str.split()
+        # Handle shell format, honouring quoted arguments
+        return shlex.split(command_str)
         
     except Exception as e:
         logging.error(f"Failed to parse Docker command: {e}")
         return [command_str]
 
 
+def _safe_name(value: str) -> str:
+    """Replace characters Docker doesn't allow in names with underscores"""
+    safe = value.translate(_SAFE_NAME_TABLE)
+    # The table only covers Latin-1; anything beyond needs the regex
+    return safe if safe.isascii() else _SAFE_NAME_RE.sub('_', safe)
+
+
 def generate_container_name(image_name: str, tag: str = "latest") -> str:
     """Generate a safe container name from image name and tag"""
     # Remove registry prefix if present
@@ -317,11 +497,11 @@ def generate_container_name(image_name: str, tag: str = "latest") -> str:
         image_name = image_name.split("/")[-1]
     
     # Replace invalid characters
-    safe_name = re.sub(r'[^a-zA-Z0-9_.-]', '_', image_name)
+    safe_name = _safe_name(image_name)
     
     # Add tag if not latest
     if tag != "latest":
-        safe_tag = re.sub(r'[^a-zA-Z0-9_.-]', '_', tag)
+        safe_tag = _safe_name(tag)
         safe_name = f"{safe_name}_{safe_tag}"
     
     return safe_name
@@ -34,20 +34,34 @@ from .auth import (
     exchange_code_for_token,
     get_authenticated_user,
     store_user_session,
+    store_user_repositories,
+    store_user_repositories_async,
     get_user_session,
+    get_user_session_async,
+    get_user_session_dict,
     get_all_users,
-    validate_token
+    get_all_users_async,
+    validate_token,
+    get_github_client,
+    aclose_github_client
 )
 
 # Repository services
 from .services import (
     fetch_user_repositories,
+    iter_user_repositories,
+    dump_repositories,
     get_repository_info,
+    GitHubBatcher,
     clone_repository,
+    clone_repositories,
     push_repository_changes,
     get_repository_branches,
     get_repository_commits,
-    search_repositories
+    fetch_repo_bundle,
+    fetch_repo_bundles,
+    search_repositories,
+    iter_search_repositories
 )
 
 # Utilities
@@ -81,18 +95,32 @@ __all__ = [
     "exchange_code_for_token",
     "get_authenticated_user",
     "store_user_session",
+    "store_user_repositories",
+    "store_user_repositories_async",
     "get_user_session",
+    "get_user_session_async",
+    "get_user_session_dict",
     "get_all_users",
+    "get_all_users_async",
     "validate_token",
+    "get_github_client",
+    "aclose_github_client",
     
     # Repository services
     "fetch_user_repositories",
+    "iter_user_repositories",
+    "dump_repositories",
     "get_repository_info",
+    "GitHubBatcher",
     "clone_repository",
+    "clone_repositories",
     "push_repository_changes",
     "get_repository_branches",
     "get_repository_commits",
+    "fetch_repo_bundle",
+    "fetch_repo_bundles",
     "search_repositories",
+    "iter_search_repositories",
     
     # Utilities
     "parse_git_url",
@@ -11,11 +11,18 @@ from .oauth import (
     exchange_code_for_token,
     get_authenticated_user,
     store_user_session,
+    store_user_repositories,
+    store_user_repositories_async,
     get_user_session,
+    get_user_session_async,
+    get_user_session_dict,
     get_all_users,
+    get_all_users_async,
     revoke_user_session,
     validate_token,
-    refresh_user_data
+    refresh_user_data,
+    get_github_client,
+    aclose_github_client
 )
 
 __all__ = [
@@ -24,9 +31,16 @@ __all__ = [
     "exchange_code_for_token",
     "get_authenticated_user",
     "store_user_session",
+    "store_user_repositories",
+    "store_user_repositories_async",
     "get_user_session",
+    "get_user_session_async",
+    "get_user_session_dict",
     "get_all_users",
+    "get_all_users_async",
     "revoke_user_session",
     "validate_token",
-    "refresh_user_data"
+    "refresh_user_data",
+    "get_github_client",
+    "aclose_github_client"
 ]
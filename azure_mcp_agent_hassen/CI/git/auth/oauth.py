@@ -5,15 +5,37 @@ Handles GitHub OAuth flow, token management, and user authentication
 for GitHub API access.
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import time
 import webbrowser
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 import httpx
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
-from ..models import LoginResponse, AuthToken, GitHubUser
+from ..models import LoginResponse, AuthToken, GitHubUser, Repository
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
 
 load_dotenv()
 
@@ -24,15 +46,140 @@ GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
 if not (GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET):
     raise RuntimeError("GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET must be set in environment variables")
 
-# Global user storage (token -> user data)
-authenticated_users: Dict[str, Dict[str, Any]] = {}
+# Sessions expire SESSION_TTL seconds after they were last written (reads
+# don't extend them); needs cachetools or Redis
+SESSION_TTL = 3600
+SESSION_MAX_USERS = 10_000
 
+# Setting REDIS_URL shares sessions between server workers
+REDIS_URL = os.getenv("REDIS_URL")
 
-def get_github_login_url(scopes: Optional[str] = None) -> str:
-    """Generate GitHub OAuth authorization URL"""
-    if not scopes:
-        scopes = "repo read:user"
-    
+
+class _RedisSessions:
+    """Session mapping kept in Redis so every worker sees every login
+
+    Sessions are stored as JSON under "az_mcp:session:<hashed token>" and
+    expire SESSION_TTL seconds after they were last written. A sorted set
+    indexes them by first login so listing them needs no SCAN and comes
+    back oldest first, like the in-process stores. Calls block, so async
+    code should run them in a thread.
+    """
+
+    PREFIX = "az_mcp:session:"
+    INDEX = "az_mcp:sessions"
+
+    def __init__(self, url: str):
+        self._redis = redis.Redis.from_url(url)
+
+    @classmethod
+    def _key(cls, key: bytes) -> str:
+        return f"{cls.PREFIX}{key.hex()}"
+
+    @staticmethod
+    def _dump(session: Dict[str, Any]) -> str:
+        user = session["user"]
+        return json.dumps({
+            "user": user.dict() if user is not None else None,
+            "repositories": [repo.dict() for repo in session["repositories"]]
+        }, default=str)
+
+    @staticmethod
+    def _load(raw: bytes) -> Dict[str, Any]:
+        data = json.loads(raw)
+        return {
+            "user": GitHubUser(**data["user"]) if data["user"] is not None else None,
+            "repositories": [Repository(**repo) for repo in data["repositories"]]
+        }
+
+    def get(self, key: bytes, default: Any = None) -> Any:
+        raw = self._redis.get(self._key(key))
+        return self._load(raw) if raw is not None else default
+
+    def __setitem__(self, key: bytes, session: Dict[str, Any]) -> None:
+        name = self._key(key)
+        with self._redis.pipeline() as pipe:
+            pipe.set(name, self._dump(session), ex=SESSION_TTL)
+            pipe.zadd(self.INDEX, {name: time.time()}, nx=True)
+            pipe.execute()
+
+    def pop(self, key: bytes, default: Any = None) -> Any:
+        name = self._key(key)
+        # GET + DEL in one transaction (GETDEL needs Redis 6.2)
+        with self._redis.pipeline() as pipe:
+            pipe.get(name)
+            pipe.delete(name)
+            pipe.zrem(self.INDEX, name)
+            raw, _, _ = pipe.execute()
+        return self._load(raw) if raw is not None else default
+
+    def values(self) -> List[Dict[str, Any]]:
+        names = self._redis.zrange(self.INDEX, 0, -1)
+        if not names:
+            return []
+        raws = self._redis.mget(names)
+        expired = [name for name, raw in zip(names, raws) if raw is None]
+        if expired:
+            self._redis.zrem(self.INDEX, *expired)
+        return [self._load(raw) for raw in raws if raw is not None]
+
+    def __len__(self) -> int:
+        names = self._redis.zrange(self.INDEX, 0, -1)
+        return self._redis.exists(*names) if names else 0
+
+
+# Global user storage (hashed token -> user data); raw tokens are never kept
+authenticated_users: Dict[bytes, Dict[str, Any]] = (
+    _RedisSessions(REDIS_URL) if REDIS_URL and REDIS_AVAILABLE
+    else TTLCache(maxsize=SESSION_MAX_USERS, ttl=SESSION_TTL) if CACHETOOLS_AVAILABLE
+    else {}
+)
+
+
+def _session_key(token: str) -> bytes:
+    """Key a session by a digest of its token rather than the token itself"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+# Shared GitHub client so every API call reuses pooled TLS connections
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Get the shared GitHub HTTP client for the running event loop"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the loop that opened them
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client is not None and not _client.is_closed:
+            _retire_client(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            headers={"Accept": "application/vnd.github.v3+json"}
+        )
+        _client_loop = loop
+    return _client
+
+
+def _retire_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a client left behind by another event loop, on that loop"""
+    if loop is not None and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        # A closed loop can't run aclose; its sockets go with the client
+        logging.debug("Dropping GitHub client of a closed event loop")
+
+
+async def aclose_github_client() -> None:
+    """Close the shared GitHub client (call on application shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _build_login_url(scopes: str) -> str:
     return (
         f"https://github.com/login/oauth/authorize"
         f"?client_id={GITHUB_CLIENT_ID}"
@@ -40,6 +187,17 @@ def get_github_login_url(scopes: Optional[str] = None) -> str:
     )
 
 
+# The client ID is fixed for the process, so the default URL is built once
+GITHUB_LOGIN_URL = _build_login_url("repo read:user")
+
+
+def get_github_login_url(scopes: Optional[str] = None) -> str:
+    """Generate GitHub OAuth authorization URL"""
+    if not scopes:
+        return GITHUB_LOGIN_URL
+    return _build_login_url(scopes)
+
+
 def initiate_github_login(open_browser: bool = True) -> LoginResponse:
     """Initiate GitHub OAuth login process"""
     try:
@@ -64,29 +222,27 @@ def initiate_github_login(open_browser: bool = True) -> LoginResponse:
 async def exchange_code_for_token(code: str) -> AuthToken:
     """Exchange OAuth code for access token"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://github.com/login/oauth/access_token",
-                data={
-                    "client_id": GITHUB_CLIENT_ID,
-                    "client_secret": GITHUB_CLIENT_SECRET,
-                    "code": code
-                },
-                headers={"Accept": "application/json"}
-            )
-            response.raise_for_status()
-            data = response.json()
-            print("data:", data)
-            access_token = data.get("access_token")
-            if not access_token:
-                raise HTTPException(status_code=400, detail="Failed to obtain access token")
-            
-            return AuthToken(
-                access_token=access_token,
-                token_type=data.get("token_type", "bearer"),
-                scope=data.get("scope"),
-                expires_in=data.get("expires_in")
-            )
+        response = await get_github_client().post(
+            "https://github.com/login/oauth/access_token",
+            data={
+                "client_id": GITHUB_CLIENT_ID,
+                "client_secret": GITHUB_CLIENT_SECRET,
+                "code": code
+            },
+            headers={"Accept": "application/json"}
+        )
+        response.raise_for_status()
+        data = response.json()
+        access_token = data.get("access_token")
+        if not access_token:
+            raise HTTPException(status_code=400, detail="Failed to obtain access token")
+        
+        return AuthToken(
+            access_token=access_token,
+            token_type=data.get("token_type", "bearer"),
+            scope=data.get("scope"),
+            expires_in=data.get("expires_in")
+        )
             
     except httpx.HTTPError as e:
         logging.error(f"HTTP error during token exchange: {e}")
@@ -99,27 +255,23 @@ async def exchange_code_for_token(code: str) -> AuthToken:
 async def get_authenticated_user(token: str) -> GitHubUser:
     """Get user information using access token"""
     try:
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        headers = {"Authorization": f"token {token}"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://api.github.com/user", headers=headers)
-            response.raise_for_status()
-            user_data = response.json()
-            
-            return GitHubUser(
-                login=user_data["login"],
-                id=user_data["id"],
-                name=user_data.get("name"),
-                email=user_data.get("email"),
-                bio=user_data.get("bio"),
-                avatar_url=user_data.get("avatar_url"),
-                public_repos=user_data.get("public_repos", 0),
-                followers=user_data.get("followers", 0),
-                following=user_data.get("following", 0)
-            )
+        response = await get_github_client().get("https://api.github.com/user", headers=headers)
+        response.raise_for_status()
+        user_data = response.json()
+        
+        return GitHubUser(
+            login=user_data["login"],
+            id=user_data["id"],
+            name=user_data.get("name"),
+            email=user_data.get("email"),
+            bio=user_data.get("bio"),
+            avatar_url=user_data.get("avatar_url"),
+            public_repos=user_data.get("public_repos", 0),
+            followers=user_data.get("followers", 0),
+            following=user_data.get("following", 0)
+        )
             
     except httpx.HTTPError as e:
         logging.error(f"HTTP error getting user info: {e}")
@@ -130,42 +282,75 @@ async def get_authenticated_user(token: str) -> GitHubUser:
 
 
 def store_user_session(token: str, user: GitHubUser) -> None:
-    """Store user session data"""
-    authenticated_users[token] = {
-        "user": user.dict(),
+    """Store user session data (the GitHubUser model is kept as-is)"""
+    authenticated_users[_session_key(token)] = {
+        "user": user,
         "repositories": []
     }
 
 
+def store_user_repositories(token: str, repositories: List[Any]) -> None:
+    """Attach a user's repository list to their session, creating it if needed"""
+    key = _session_key(token)
+    session = authenticated_users.get(key) or {"user": None, "repositories": []}
+    session["repositories"] = repositories
+    authenticated_users[key] = session
+
+
 def get_user_session(token: str) -> Optional[Dict[str, Any]]:
     """Get stored user session data"""
-    return authenticated_users.get(token)
+    return authenticated_users.get(_session_key(token))
 
 
-def get_all_users() -> Dict[str, Dict[str, Any]]:
-    """Get all authenticated users (for debugging/admin)"""
-    return authenticated_users
+def get_user_session_dict(token: str) -> Optional[Dict[str, Any]]:
+    """Get stored user session data with the user serialized to a plain dict"""
+    session = get_user_session(token)
+    if session is None:
+        return None
+    user = session["user"]
+    return {**session, "user": user.dict() if user is not None else None}
+
+
+def get_all_users() -> List[Dict[str, Any]]:
+    """Get all active user sessions (for debugging/admin); tokens are not exposed"""
+    return list(authenticated_users.values())
+
+
+async def _session_call(fn: Callable[..., Any], *args) -> Any:
+    """Run a session-store call, off the event loop when the store is Redis"""
+    if isinstance(authenticated_users, _RedisSessions):
+        return await asyncio.to_thread(fn, *args)
+    # In-process stores are not thread-safe and never block
+    return fn(*args)
+
+
+async def store_user_repositories_async(token: str, repositories: List[Any]) -> None:
+    """Async variant of store_user_repositories that keeps the event loop free"""
+    await _session_call(store_user_repositories, token, repositories)
+
+
+async def get_user_session_async(token: str) -> Optional[Dict[str, Any]]:
+    """Async variant of get_user_session that keeps the event loop free"""
+    return await _session_call(get_user_session, token)
+
+
+async def get_all_users_async() -> List[Dict[str, Any]]:
+    """Async variant of get_all_users that keeps the event loop free"""
+    return await _session_call(get_all_users)
 
 
 def revoke_user_session(token: str) -> bool:
     """Remove user session"""
-    if token in authenticated_users:
-        del authenticated_users[token]
-        return True
-    return False
+    return authenticated_users.pop(_session_key(token), None) is not None
 
 
 async def validate_token(token: str) -> bool:
     """Validate GitHub access token"""
     try:
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        headers = {"Authorization": f"token {token}"}
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://api.github.com/user", headers=headers)
-            return response.status_code == 200
+        response = await get_github_client().get("https://api.github.com/user", headers=headers)
+        return response.status_code == 200
             
     except Exception as e:
         logging.error(f"Token validation error: {e}")
@@ -173,17 +358,18 @@ async def validate_token(token: str) -> bool:
 
 
 async def refresh_user_data(token: str) -> Optional[GitHubUser]:
-    """Refresh user data for existing token"""
+    """Refresh user data for existing token (an invalid token yields None)"""
     try:
-        if await validate_token(token):
-            user = await get_authenticated_user(token)
-            
-            # Update stored session
-            if token in authenticated_users:
-                authenticated_users[token]["user"] = user.dict()
-            
-            return user
-        return None
+        # Fetching the user validates the token too; a 401 lands in the except
+        user = await get_authenticated_user(token)
+        
+        # Update stored session (written back so a shared store sees it too)
+        key = _session_key(token)
+        session = await _session_call(authenticated_users.get, key)
+        if session is not None:
+            await _session_call(authenticated_users.__setitem__, key, {**session, "user": user})
+        
+        return user
         
     except Exception as e:
         logging.error(f"Failed to refresh user data: {e}")
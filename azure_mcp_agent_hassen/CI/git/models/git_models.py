@@ -5,7 +5,7 @@ Pydantic models for Git operations including repository information,
 authentication responses, and GitHub API interactions.
 """
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AliasChoices, AliasPath, BaseModel, Field, HttpUrl
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -15,13 +15,14 @@ class Repository(BaseModel):
     name: str = Field(..., description="Repository name")
     full_name: str = Field(..., description="Full repository name (owner/repo)")
     description: Optional[str] = Field(None, description="Repository description")
-    url: str = Field(..., description="Repository HTML URL")
+    url: str = Field(..., validation_alias=AliasChoices("html_url", "url"), description="Repository HTML URL")
     clone_url: Optional[str] = Field(None, description="Repository clone URL")
     ssh_url: Optional[str] = Field(None, description="Repository SSH URL")
     private: bool = Field(default=False, description="Whether repository is private")
     default_branch: str = Field(default="main", description="Default branch name")
     language: Optional[str] = Field(None, description="Primary programming language")
-    stars_count: int = Field(default=0, description="Number of stars")
+    stars_count: int = Field(default=0, validation_alias=AliasChoices("stargazers_count", "stars_count"),
+                             description="Number of stars")
     forks_count: int = Field(default=0, description="Number of forks")
     created_at: Optional[datetime] = Field(None, description="Repository creation date")
     updated_at: Optional[datetime] = Field(None, description="Last update date")
@@ -76,19 +77,25 @@ class CloneResult(BaseModel):
 class GitCommit(BaseModel):
     """Git commit information"""
     sha: str = Field(..., description="Commit SHA hash")
-    author_name: str = Field(..., description="Commit author name")
-    author_email: str = Field(..., description="Commit author email")
-    message: str = Field(..., description="Commit message")
-    date: datetime = Field(..., description="Commit date")
-    url: Optional[str] = Field(None, description="Commit URL on GitHub")
+    author_name: str = Field(..., validation_alias=AliasChoices(AliasPath("commit", "author", "name"), "author_name"),
+                             description="Commit author name")
+    author_email: str = Field(..., validation_alias=AliasChoices(AliasPath("commit", "author", "email"), "author_email"),
+                              description="Commit author email")
+    message: str = Field(..., validation_alias=AliasChoices(AliasPath("commit", "message"), "message"),
+                         description="Commit message")
+    date: datetime = Field(..., validation_alias=AliasChoices(AliasPath("commit", "author", "date"), "date"),
+                           description="Commit date")
+    url: Optional[str] = Field(None, validation_alias=AliasChoices("html_url", "url"), description="Commit URL on GitHub")
 
 
 class GitBranch(BaseModel):
     """Git branch information"""
     name: str = Field(..., description="Branch name")
-    commit_sha: str = Field(..., description="Latest commit SHA")
+    commit_sha: str = Field(..., validation_alias=AliasChoices(AliasPath("commit", "sha"), "commit_sha"),
+                            description="Latest commit SHA")
     is_default: bool = Field(default=False, description="Whether this is the default branch")
-    is_protected: bool = Field(default=False, description="Whether branch is protected")
+    is_protected: bool = Field(default=False, validation_alias=AliasChoices("protected", "is_protected"),
+                               description="Whether branch is protected")
 
 
 class PullRequest(BaseModel):
@@ -7,20 +7,34 @@ repository management, authentication, and API interactions.
 
 from .repositories import (
     fetch_user_repositories,
+    iter_user_repositories,
+    dump_repositories,
     get_repository_info,
+    GitHubBatcher,
     clone_repository,
+    clone_repositories,
     push_repository_changes,
     get_repository_branches,
     get_repository_commits,
-    search_repositories
+    fetch_repo_bundle,
+    fetch_repo_bundles,
+    search_repositories,
+    iter_search_repositories
 )
 
 __all__ = [
     "fetch_user_repositories",
+    "iter_user_repositories",
+    "dump_repositories",
     "get_repository_info",
+    "GitHubBatcher",
     "clone_repository",
+    "clone_repositories",
     "push_repository_changes", 
     "get_repository_branches",
     "get_repository_commits",
-    "search_repositories"
+    "fetch_repo_bundle",
+    "fetch_repo_bundles",
+    "search_repositories",
+    "iter_search_repositories"
 ]
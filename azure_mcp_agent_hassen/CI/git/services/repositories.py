@@ -5,51 +5,237 @@ Business logic for repository operations including cloning,
 fetching repository information, and GitHub API interactions.
 """
 
+import asyncio
+import copy
+import hashlib
 import os
 import subprocess
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import urlparse
 import httpx
+from pydantic import BaseModel, TypeAdapter
 
 from ..models import Repository, CloneRequest, CloneResult, GitCommit, GitBranch, RepositoryStats
-from ..auth import validate_token
+from ..auth import get_github_client
+
+T = TypeVar("T")
+
+
+class _SearchResults(BaseModel):
+    """Body of a GitHub search response; only the items are kept"""
+    items: List[Repository] = []
+
+
+# Response bodies are decoded and validated in one pydantic-core pass, so
+# GitHub's many unused fields never become Python objects; the models map
+# GitHub's field names
+RepositoryList = TypeAdapter(List[Repository])
+BranchList = TypeAdapter(List[GitBranch])
+CommitList = TypeAdapter(List[GitCommit])
+
+
+def dump_repositories(repositories: List[Repository]) -> bytes:
+    """Serialize already-validated repositories to JSON in one pydantic-core pass"""
+    return RepositoryList.dump_json(repositories)
+
+
+# Submodules fetched in parallel by a recursive clone
+CLONE_JOBS = os.cpu_count() or 8
+
+# Conditional-request cache: (URL + query, token digest, with links) -> (ETag,
+# parsed result, monotonic time it was last confirmed). A 304 reply carries no body and doesn't
+# count against the rate limit.
+ETAG_CACHE_MAX = 2048
+_ETAG_CACHE: Dict[Tuple[str, bytes, bool], Tuple[str, Any, float]] = {}
+
+# Repository info, branches and search results younger than this are served
+# without contacting GitHub at all
+FRESH_TTL = 60.0
+
+# Listing pages requested concurrently once the page count is known
+PAGE_CONCURRENCY = 8
+
+# Cache key -> request currently fetching it
+_INFLIGHT: Dict[Tuple[str, bytes, bool], "asyncio.Future[Any]"] = {}
+
+
+async def _get_with_etag(url: str, headers: Dict[str, str], parse: Callable[[bytes], T],
+                         params: Optional[Dict[str, Any]] = None, max_age: float = 0,
+                         with_links: bool = False) -> Any:
+    """GET a GitHub resource, reusing the cached result when it hasn't changed
+
+    Results confirmed within `max_age` seconds are returned without a
+    request. With `with_links` the result is a (parsed, Link header links)
+    pair, for paginated listings. Entries are scoped to the caller's token
+    since private data differs per user. Every caller gets its own copy of
+    the result, so changing it doesn't touch the cache. Raises
+    httpx.HTTPStatusError for error responses.
+    """
+    auth = headers.get("Authorization", "")
+    key = (str(httpx.URL(url).copy_merge_params(params or {})), hashlib.blake2b(auth.encode(), digest_size=16).digest(), with_links)
+    cached = _ETAG_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[2] < max_age:
+        return copy.deepcopy(cached[1])
+
+    # Concurrent identical reads share one request
+    request = _INFLIGHT.get(key)
+    if request is None:
+        request = asyncio.ensure_future(_fetch_with_etag(key, url, headers, parse, params))
+        _INFLIGHT[key] = request
+        request.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # Shielded so one caller giving up doesn't cancel the others
+    return copy.deepcopy(await asyncio.shield(request))
+
+
+async def _fetch_with_etag(key: Tuple[str, bytes, bool], url: str, headers: Dict[str, str],
+                           parse: Callable[[bytes], T], params: Optional[Dict[str, Any]]) -> Any:
+    """Issue the conditional GET behind _get_with_etag and update the cache"""
+    cached = _ETAG_CACHE.get(key)
+    if cached is not None:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    response = await get_github_client().get(url, headers=headers, params=params)
+    if response.status_code == 304 and cached is not None:
+        _ETAG_CACHE[key] = (cached[0], cached[1], time.monotonic())
+        return cached[1]
+    response.raise_for_status()
+
+    result = parse(response.content)
+    if key[2]:
+        result = (result, response.links)
+    etag = response.headers.get("ETag")
+    if etag:
+        _ETAG_CACHE.pop(key, None)
+        if len(_ETAG_CACHE) >= ETAG_CACHE_MAX:
+            _ETAG_CACHE.pop(next(iter(_ETAG_CACHE)))
+        _ETAG_CACHE[key] = (etag, result, time.monotonic())
+    return result
+
+
+async def _iter_repository_pages(url: str, headers: Dict[str, str], params: Dict[str, Any],
+                                 parse: Callable[[bytes], List[Repository]] = RepositoryList.validate_json
+                                 ) -> AsyncIterator[Repository]:
+    """Yield repositories across every page of a GitHub listing
+
+    When the first response's `Link` header gives the last page, all
+    remaining pages are requested at once (at most PAGE_CONCURRENCY in
+    flight); otherwise `rel="next"` is followed, requesting each page while
+    the caller consumes the previous one. Pages go through the ETag cache,
+    so unchanged ones cost a bodiless 304 and no re-validation. Raises
+    httpx.HTTPError.
+    """
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async def get_page(page_url: httpx.URL) -> Tuple[List[Repository], Dict[str, Any]]:
+        async with semaphore:
+            return await _get_with_etag(str(page_url), headers, parse, with_links=True)
+
+    pending = [asyncio.create_task(_get_with_etag(url, headers, parse, params=params, with_links=True))]
+    try:
+        while pending:
+            repositories, links = await pending.pop(0)
+
+            # Next/last links already carry the query string
+            if not pending and "next" in links:
+                next_url = httpx.URL(links["next"]["url"])
+                last_url = httpx.URL(links["last"]["url"]) if "last" in links else None
+                if last_url is not None and "page" in next_url.params and "page" in last_url.params:
+                    pending = [
+                        asyncio.create_task(get_page(next_url.copy_set_param("page", page)))
+                        for page in range(int(next_url.params["page"]), int(last_url.params["page"]) + 1)
+                    ]
+                else:
+                    pending = [asyncio.create_task(get_page(next_url))]
+
+            for repository in repositories:
+                yield repository
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# The repository fields _graphql_repository reads
+_REPOSITORY_FIELDS = """
+fragment RepositoryFields on Repository {
+  name nameWithOwner description url sshUrl isPrivate
+  defaultBranchRef { name }
+  primaryLanguage { name }
+  stargazerCount forkCount createdAt updatedAt
+}
+"""
+
+# All of the viewer's repositories, 100 per request (same affiliations as REST /user/repos)
+_VIEWER_REPOSITORIES_QUERY = """
+query($cursor: String) {
+  viewer {
+    repositories(first: 100, after: $cursor,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+      nodes { ...RepositoryFields }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+""" + _REPOSITORY_FIELDS
+
+
+def _graphql_repository(node: Dict[str, Any]) -> Repository:
+    """Build a Repository from a GraphQL repository node"""
+    return Repository(
+        name=node["name"],
+        full_name=node["nameWithOwner"],
+        description=node.get("description"),
+        url=node["url"],
+        clone_url=f"{node['url']}.git",
+        ssh_url=node.get("sshUrl"),
+        private=node.get("isPrivate", False),
+        default_branch=(node.get("defaultBranchRef") or {}).get("name", "main"),
+        language=(node.get("primaryLanguage") or {}).get("name"),
+        stars_count=node.get("stargazerCount", 0),
+        forks_count=node.get("forkCount", 0),
+        created_at=node.get("createdAt"),
+        updated_at=node.get("updatedAt")
+    )
 
 
 async def fetch_user_repositories(token: str) -> List[Repository]:
-    """Fetch repositories for authenticated user"""
+    """Fetch all repositories for authenticated user
+
+    Uses one GraphQL query per 100 repositories; an invalid token is
+    rejected by the first request.
+    """
     try:
-        if not await validate_token(token):
-            raise ValueError("Invalid or expired token")
+        client = get_github_client()
+        headers = {"Authorization": f"bearer {token}"}
         
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://api.github.com/user/repos", headers=headers)
+        repositories = []
+        cursor = None
+        while True:
+            response = await client.post(
+                "https://api.github.com/graphql",
+                json={"query": _VIEWER_REPOSITORIES_QUERY, "variables": {"cursor": cursor}},
+                headers=headers
+            )
+            if response.status_code == 401:
+                raise ValueError("Invalid or expired token")
             response.raise_for_status()
-            repos_data = response.json()
-            
-            repositories = []
-            for repo in repos_data:
-                repositories.append(Repository(
-                    name=repo["name"],
-                    full_name=repo["full_name"],
-                    description=repo.get("description"),
-                    url=repo["html_url"],
-                    clone_url=repo["clone_url"],
-                    ssh_url=repo["ssh_url"],
-                    private=repo["private"],
-                    default_branch=repo.get("default_branch", "main"),
-                    language=repo.get("language"),
-                    stars_count=repo.get("stargazers_count", 0),
-                    forks_count=repo.get("forks_count", 0)
-                ))
-            
-            return repositories
+            body = response.json()
+            # Partial results (e.g. SAML-protected orgs the token can't see)
+            # come back as null nodes next to "errors"; only fail without data
+            viewer = (body.get("data") or {}).get("viewer")
+            if viewer is None:
+                errors = body.get("errors") or [{}]
+                raise ValueError(errors[0].get("message", "GraphQL query failed"))
+            for error in body.get("errors") or ():
+                logging.warning(f"Skipping repositories GitHub could not return: {error.get('message')}")
             
+            page = viewer["repositories"]
+            repositories.extend(_graphql_repository(node) for node in page["nodes"] if node is not None)
+            if not page["pageInfo"]["hasNextPage"]:
+                return repositories
+            cursor = page["pageInfo"]["endCursor"]
+        
     except httpx.HTTPError as e:
         logging.error(f"HTTP error fetching repositories: {e}")
         raise ValueError(f"Failed to fetch repositories: {str(e)}")
@@ -58,32 +244,27 @@ async def fetch_user_repositories(token: str) -> List[Repository]:
         raise ValueError(f"Repository fetch error: {str(e)}")
 
 
+def iter_user_repositories(token: str, per_page: int = 100) -> AsyncIterator[Repository]:
+    """Stream all of the authenticated user's repositories, page by page"""
+    return _iter_repository_pages(
+        "https://api.github.com/user/repos",
+        {"Authorization": f"token {token}"},
+        {"per_page": per_page}
+    )
+
+
 async def get_repository_info(owner: str, repo: str, token: Optional[str] = None) -> Repository:
     """Get detailed information about a specific repository"""
     try:
-        headers = {"Accept": "application/vnd.github.v3+json"}
+        headers = {}
         if token:
             headers["Authorization"] = f"token {token}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers)
-            response.raise_for_status()
-            repo_data = response.json()
-            
-            return Repository(
-                name=repo_data["name"],
-                full_name=repo_data["full_name"],
-                description=repo_data.get("description"),
-                url=repo_data["html_url"],
-                clone_url=repo_data["clone_url"],
-                ssh_url=repo_data["ssh_url"],
-                private=repo_data["private"],
-                default_branch=repo_data.get("default_branch", "main"),
-                language=repo_data.get("language"),
-                stars_count=repo_data.get("stargazers_count", 0),
-                forks_count=repo_data.get("forks_count", 0)
-            )
-            
+        return await _get_with_etag(
+            f"https://api.github.com/repos/{owner}/{repo}", headers, Repository.model_validate_json,
+            max_age=FRESH_TTL
+        )
+        
     except httpx.HTTPError as e:
         logging.error(f"HTTP error getting repository info: {e}")
         raise ValueError(f"Failed to get repository info: {str(e)}")
@@ -127,9 +308,12 @@ def clone_repository(clone_request: CloneRequest) -> CloneResult:
         
         if clone_request.depth:
             cmd.extend(["--depth", str(clone_request.depth)])
+        else:
+            # Blobless partial clone: full history, file contents fetched on demand
+            cmd.append("--filter=blob:none")
         
         if clone_request.recursive:
-            cmd.append("--recursive")
+            cmd.extend(["--recurse-submodules", "--jobs", str(CLONE_JOBS)])
         
         cmd.extend([clone_request.repo_url, repo_path])
         
@@ -162,6 +346,20 @@ def clone_repository(clone_request: CloneRequest) -> CloneResult:
         )
 
 
+async def clone_repositories(clone_requests: List[CloneRequest], concurrency: int = 4) -> List[CloneResult]:
+    """Clone several repositories concurrently, at most `concurrency` at a time
+
+    Results are returned in the same order as the requests.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def clone_one(clone_request: CloneRequest) -> CloneResult:
+        async with semaphore:
+            return await asyncio.to_thread(clone_repository, clone_request)
+
+    return list(await asyncio.gather(*(clone_one(request) for request in clone_requests)))
+
+
 def push_repository_changes(repo_path: str, commit_message: str = "Add workflow files") -> Dict[str, Any]:
     """
     Add all changes and push to repository
@@ -174,7 +372,6 @@ def push_repository_changes(repo_path: str, commit_message: str = "Add workflow
         Dict containing status and message
     """
     try:
-        # Ensure we're in the repository directory
         if not os.path.exists(repo_path):
             return {
                 "status": "error",
@@ -187,60 +384,55 @@ def push_repository_changes(repo_path: str, commit_message: str = "Add workflow
                 "message": f"No git repository found at: {repo_path}"
             }
         
-        # Change to repository directory
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        # Add all changes
+        add_result = subprocess.run(
+            ["git", "add", "."],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
         
-        try:
-            # Add all changes
-            add_result = subprocess.run(
-                ["git", "add", "."],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Check if there are changes to commit
-            status_result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            if not status_result.stdout.strip():
-                return {
-                    "status": "info",
-                    "message": "No changes to commit"
-                }
-            
-            # Commit changes
-            commit_result = subprocess.run(
-                ["git", "commit", "-m", commit_message],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Push changes
-            push_result = subprocess.run(
-                ["git", "push"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+        # Check if there are changes to commit
+        status_result = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        
+        if not status_result.stdout.strip():
             return {
-                "status": "success",
-                "message": f"Successfully committed and pushed changes: {commit_message}",
-                "commit_output": commit_result.stdout,
-                "push_output": push_result.stdout
+                "status": "info",
+                "message": "No changes to commit"
             }
-            
-        finally:
-            # Always return to original directory
-            os.chdir(original_cwd)
-            
+        
+        # Commit changes
+        commit_result = subprocess.run(
+            ["git", "commit", "-m", commit_message],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        
+        # Push changes
+        push_result = subprocess.run(
+            ["git", "push"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        
+        return {
+            "status": "success",
+            "message": f"Successfully committed and pushed changes: {commit_message}",
+            "commit_output": commit_result.stdout,
+            "push_output": push_result.stdout
+        }
+        
     except subprocess.CalledProcessError as e:
         logging.error(f"Git operation failed: {e.stderr}")
         return {
@@ -256,28 +448,185 @@ def push_repository_changes(repo_path: str, commit_message: str = "Add workflow
         }
 
 
+def _repositories_query(count: int) -> str:
+    """Build a GraphQL query looking up `count` repositories as aliases r0, r1, ..."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    lookups = "\n".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepositoryFields }}"
+        for i in range(count)
+    )
+    return f"query({params}) {{\n{lookups}\n}}\n{_REPOSITORY_FIELDS}"
+
+
+async def _query_repositories(repos: List[Tuple[str, str]], token: str) -> List[Any]:
+    """Look up several repositories with one aliased GraphQL query
+
+    Returns a Repository or a ValueError per entry of `repos`, so one
+    missing repository doesn't fail the others.
+    """
+    aliases: Dict[Tuple[str, str], str] = {}
+    variables: Dict[str, str] = {}
+    for owner, repo in repos:
+        if (owner, repo) not in aliases:
+            index = len(aliases)
+            aliases[(owner, repo)] = f"r{index}"
+            variables[f"o{index}"] = owner
+            variables[f"n{index}"] = repo
+    
+    response = await get_github_client().post(
+        "https://api.github.com/graphql",
+        json={"query": _repositories_query(len(aliases)), "variables": variables},
+        headers={"Authorization": f"bearer {token}"}
+    )
+    if response.status_code == 401:
+        raise ValueError("Invalid or expired token")
+    response.raise_for_status()
+    body = response.json()
+    
+    data = body.get("data") or {}
+    # Errors for one lookup carry its alias as the first path element
+    errors: Dict[Optional[str], str] = {}
+    for error in body.get("errors") or ():
+        alias = (error.get("path") or [None])[0]
+        errors.setdefault(alias, error.get("message", "GraphQL query failed"))
+    
+    results: List[Any] = []
+    for key in repos:
+        alias = aliases[key]
+        node = data.get(alias)
+        if node is None:
+            message = errors.get(alias) or errors.get(None) or "Repository not found"
+            results.append(ValueError(f"Repository info error: {message}"))
+        else:
+            results.append(_graphql_repository(node))
+    return results
+
+
+class GitHubBatcher:
+    """Collect get_repository_info calls into micro-batches
+
+    Lookups arriving within `max_queue_time` seconds of each other (up to
+    `max_batch_size`) are sent as one aliased GraphQL query per token, with
+    at most `max_concurrency` queries in flight. GraphQL needs a token, so
+    anonymous lookups go through get_repository_info instead.
+    """
+
+    def __init__(self, max_batch_size: int = 10, max_queue_time: float = 0.02,
+                 max_concurrency: int = 10):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self.max_concurrency = max_concurrency
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: set = set()
+
+    async def process(self, owner: str, repo: str, token: Optional[str] = None) -> Repository:
+        """Queue a repository lookup and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run(self._queue))
+        future = loop.create_future()
+        await self._queue.put((owner, repo, token, future))
+        return await future
+
+    def close(self) -> None:
+        """Stop the dispatcher; lookups that haven't finished fail with RuntimeError"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, future = self._queue.get_nowait()
+                self._fail(future)
+        for task in list(self._pending):
+            task.cancel()
+
+    @staticmethod
+    def _fail(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_exception(RuntimeError("batcher closed"))
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_queue_time
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                # A query can only use one token, so split the batch by token
+                groups: Dict[Optional[str], list] = {}
+                for owner, repo, token, future in batch:
+                    groups.setdefault(token, []).append((owner, repo, future))
+                # Don't wait for the queries, so a slow one doesn't hold up the next batch
+                for token, lookups in groups.items():
+                    task = loop.create_task(self._dispatch(semaphore, token, lookups))
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Lookups collected during the batch window were never dispatched
+            for *_, future in batch:
+                self._fail(future)
+            raise
+
+    async def _dispatch(self, semaphore: asyncio.Semaphore, token: Optional[str],
+                        lookups: List[Tuple[str, str, asyncio.Future]]) -> None:
+        # Skip lookups whose caller gave up while they were queued
+        lookups = [lookup for lookup in lookups if not lookup[2].done()]
+        if not lookups:
+            return
+        try:
+            async with semaphore:
+                if token is None:
+                    results = await asyncio.gather(
+                        *(get_repository_info(owner, repo) for owner, repo, _ in lookups),
+                        return_exceptions=True
+                    )
+                else:
+                    results = await _query_repositories(
+                        [(owner, repo) for owner, repo, _ in lookups], token
+                    )
+        except asyncio.CancelledError:
+            for *_, future in lookups:
+                self._fail(future)
+            raise
+        except httpx.HTTPError as e:
+            logging.error(f"HTTP error getting repository info: {e}")
+            results = [ValueError(f"Failed to get repository info: {str(e)}")] * len(lookups)
+        except Exception as e:
+            results = [e] * len(lookups)
+        
+        for (*_, future), result in zip(lookups, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 async def get_repository_branches(owner: str, repo: str, token: Optional[str] = None) -> List[GitBranch]:
     """Get all branches for a repository"""
     try:
-        headers = {"Accept": "application/vnd.github.v3+json"}
+        headers = {}
         if token:
             headers["Authorization"] = f"token {token}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://api.github.com/repos/{owner}/{repo}/branches", headers=headers)
-            response.raise_for_status()
-            branches_data = response.json()
-            
-            branches = []
-            for branch in branches_data:
-                branches.append(GitBranch(
-                    name=branch["name"],
-                    commit_sha=branch["commit"]["sha"],
-                    is_protected=branch.get("protected", False)
-                ))
-            
-            return branches
-            
+        return await _get_with_etag(
+            f"https://api.github.com/repos/{owner}/{repo}/branches", headers,
+            BranchList.validate_json,
+            max_age=FRESH_TTL
+        )
+        
     except httpx.HTTPError as e:
         logging.error(f"HTTP error getting branches: {e}")
         raise ValueError(f"Failed to get branches: {str(e)}")
@@ -286,38 +635,24 @@ async def get_repository_branches(owner: str, repo: str, token: Optional[str] =
         raise ValueError(f"Branches error: {str(e)}")
 
 
-async def get_repository_commits(owner: str, repo: str, branch: str = "main", 
+async def get_repository_commits(owner: str, repo: str, branch: Optional[str] = "main", 
                                limit: int = 10, token: Optional[str] = None) -> List[GitCommit]:
-    """Get recent commits for a repository branch"""
+    """Get recent commits for a repository branch (None for the default branch)"""
     try:
-        headers = {"Accept": "application/vnd.github.v3+json"}
+        headers = {}
         if token:
             headers["Authorization"] = f"token {token}"
         
-        params = {"sha": branch, "per_page": limit}
+        params = {"per_page": limit}
+        if branch:
+            params["sha"] = branch
+        
+        return await _get_with_etag(
+            f"https://api.github.com/repos/{owner}/{repo}/commits", headers,
+            CommitList.validate_json,
+            params=params
+        )
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.github.com/repos/{owner}/{repo}/commits",
-                headers=headers,
-                params=params
-            )
-            response.raise_for_status()
-            commits_data = response.json()
-            
-            commits = []
-            for commit in commits_data:
-                commits.append(GitCommit(
-                    sha=commit["sha"],
-                    author_name=commit["commit"]["author"]["name"],
-                    author_email=commit["commit"]["author"]["email"],
-                    message=commit["commit"]["message"],
-                    date=commit["commit"]["author"]["date"],
-                    url=commit["html_url"]
-                ))
-            
-            return commits
-            
     except httpx.HTTPError as e:
         logging.error(f"HTTP error getting commits: {e}")
         raise ValueError(f"Failed to get commits: {str(e)}")
@@ -330,7 +665,7 @@ async def search_repositories(query: str, sort: str = "stars", order: str = "des
                             limit: int = 10, token: Optional[str] = None) -> List[Repository]:
     """Search GitHub repositories"""
     try:
-        headers = {"Accept": "application/vnd.github.v3+json"}
+        headers = {}
         if token:
             headers["Authorization"] = f"token {token}"
         
@@ -341,32 +676,55 @@ async def search_repositories(query: str, sort: str = "stars", order: str = "des
             "per_page": limit
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://api.github.com/search/repositories", headers=headers, params=params)
-            response.raise_for_status()
-            search_data = response.json()
-            
-            repositories = []
-            for repo in search_data.get("items", []):
-                repositories.append(Repository(
-                    name=repo["name"],
-                    full_name=repo["full_name"],
-                    description=repo.get("description"),
-                    url=repo["html_url"],
-                    clone_url=repo["clone_url"],
-                    ssh_url=repo["ssh_url"],
-                    private=repo["private"],
-                    default_branch=repo.get("default_branch", "main"),
-                    language=repo.get("language"),
-                    stars_count=repo.get("stargazers_count", 0),
-                    forks_count=repo.get("forks_count", 0)
-                ))
-            
-            return repositories
-            
+        return await _get_with_etag(
+            "https://api.github.com/search/repositories", headers,
+            lambda content: _SearchResults.model_validate_json(content).items,
+            params=params,
+            max_age=FRESH_TTL
+        )
+        
     except httpx.HTTPError as e:
         logging.error(f"HTTP error searching repositories: {e}")
         raise ValueError(f"Failed to search repositories: {str(e)}")
     except Exception as e:
         logging.error(f"Unexpected error searching repositories: {e}")
         raise ValueError(f"Repository search error: {str(e)}")
+
+
+def iter_search_repositories(query: str, sort: str = "stars", order: str = "desc",
+                             per_page: int = 100, token: Optional[str] = None) -> AsyncIterator[Repository]:
+    """Stream every search result (GitHub stops after 1000), page by page"""
+    headers = {"Authorization": f"token {token}"} if token else {}
+    return _iter_repository_pages(
+        "https://api.github.com/search/repositories",
+        headers,
+        {"q": query, "sort": sort, "order": order, "per_page": per_page},
+        lambda content: _SearchResults.model_validate_json(content).items
+    )
+
+
+# Concurrent bundle fetches kept under GitHub's secondary rate limit
+BUNDLE_CONCURRENCY = 10
+
+
+async def fetch_repo_bundle(owner: str, repo: str, token: Optional[str] = None,
+                            commit_limit: int = 10) -> Dict[str, Any]:
+    """Fetch a repository's info, branches and recent default-branch commits at once"""
+    info, branches, commits = await asyncio.gather(
+        get_repository_info(owner, repo, token),
+        get_repository_branches(owner, repo, token),
+        get_repository_commits(owner, repo, branch=None, limit=commit_limit, token=token)
+    )
+    return {"repository": info, "branches": branches, "commits": commits}
+
+
+async def fetch_repo_bundles(repos: List[Tuple[str, str]], token: Optional[str] = None,
+                             concurrency: int = BUNDLE_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Fetch bundles for several (owner, repo) pairs, in request order"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(owner: str, repo: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_repo_bundle(owner, repo, token)
+
+    return list(await asyncio.gather(*(fetch_one(owner, repo) for owner, repo in repos)))
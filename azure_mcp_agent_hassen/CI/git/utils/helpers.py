@@ -8,135 +8,235 @@ validation, formatting, and local Git repository management.
 import os
 import subprocess
 import logging
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Any
 from urllib.parse import urlparse
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from ..models import RepositoryStats, GitCommit
 
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
 
-def parse_git_url(git_url: str) -> Dict[str, str]:
-    """Parse Git URL to extract owner, repository, and other components"""
+
+# SSH remotes (git@github.com:owner/repo[.git])
+_SSH_URL_RE = re.compile(r"git@github\.com:([^/]+)/(.+?)(?:\.git)?$")
+# Characters that are invalid in file names on common file systems
+_UNSAFE_NAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+def _match_git_url(git_url: str) -> Optional[Dict[str, str]]:
+    """Parse a GitHub URL into its components, or None if it isn't one"""
+    # Handle SSH URLs (git@github.com:owner/repo.git)
+    ssh_match = _SSH_URL_RE.match(git_url)
+    
+    if ssh_match:
+        owner, repo = ssh_match.groups()
+        return {
+            "owner": owner,
+            "repo": repo,
+            "url_type": "ssh",
+            "host": "github.com",
+            "full_name": f"{owner}/{repo}"
+        }
+    
+    # Handle HTTPS URLs
     try:
-        # Handle SSH URLs (git@github.com:owner/repo.git)
-        ssh_pattern = r"git@github\.com:([^/]+)/(.+)\.git"
-        ssh_match = re.match(ssh_pattern, git_url)
-        
-        if ssh_match:
-            owner, repo = ssh_match.groups()
+        parsed = urlparse(git_url)
+        hostname = parsed.hostname
+    except ValueError:
+        return None
+    if hostname == "github.com":
+        path_parts = parsed.path.strip("/").split("/")
+        if len(path_parts) >= 2:
+            owner = path_parts[0]
+            repo = path_parts[1]
+            
+            # Remove .git extension if present
+            if repo.endswith(".git"):
+                repo = repo[:-4]
+            
             return {
                 "owner": owner,
                 "repo": repo,
-                "url_type": "ssh",
-                "host": "github.com",
+                "url_type": "https",
+                "host": hostname,
                 "full_name": f"{owner}/{repo}"
             }
-        
-        # Handle HTTPS URLs
-        parsed = urlparse(git_url)
-        if parsed.hostname == "github.com":
-            path_parts = parsed.path.strip("/").split("/")
-            if len(path_parts) >= 2:
-                owner = path_parts[0]
-                repo = path_parts[1]
-                
-                # Remove .git extension if present
-                if repo.endswith(".git"):
-                    repo = repo[:-4]
-                
-                return {
-                    "owner": owner,
-                    "repo": repo,
-                    "url_type": "https",
-                    "host": parsed.hostname,
-                    "full_name": f"{owner}/{repo}"
-                }
-        
-        raise ValueError("URL format not recognized")
-        
-    except Exception as e:
-        logging.error(f"Failed to parse Git URL: {e}")
+    
+    return None
+
+
+def parse_git_url(git_url: str) -> Dict[str, str]:
+    """Parse Git URL to extract owner, repository, and other components"""
+    components = _match_git_url(git_url)
+    if components is None:
+        logging.error(f"Failed to parse Git URL: {git_url}")
         raise ValueError(f"Invalid Git URL format: {git_url}")
+    return components
 
 
 def validate_git_url(git_url: str) -> bool:
     """Validate if a URL is a valid Git repository URL"""
-    try:
-        parse_git_url(git_url)
-        return True
-    except ValueError:
-        return False
+    return _match_git_url(git_url) is not None
 
 
 def format_repo_name(repo_name: str) -> str:
     """Format repository name for file system safety"""
     # Remove invalid characters for file systems
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', repo_name)
+    safe_name = _UNSAFE_NAME_RE.sub('_', repo_name)
     # Remove leading/trailing dots and spaces
     safe_name = safe_name.strip('. ')
     return safe_name or "unnamed_repo"
 
 
+def _commit_time(commit: "pygit2.Commit") -> datetime:
+    """Author time of a libgit2 commit in its own timezone"""
+    offset = timezone(timedelta(minutes=commit.author.offset))
+    return datetime.fromtimestamp(commit.author.time, offset)
+
+
+def _local_repo_info_pygit2(repo_path: str) -> Dict[str, Any]:
+    """get_local_repo_info read in-process through libgit2"""
+    repo = pygit2.Repository(repo_path)
+    commit = repo.head.peel(pygit2.Commit)
+    return {
+        "status": "ok",
+        "current_branch": "" if repo.head_is_detached else repo.head.shorthand,
+        "remote_url": repo.remotes["origin"].url,
+        "last_commit": {
+            "sha": str(commit.id),
+            "author_name": commit.author.name,
+            "author_email": commit.author.email,
+            # Same subject line as git's %s
+            "message": commit.message.strip().split("\n\n", 1)[0].replace("\n", " "),
+            "date": _commit_time(commit).strftime("%Y-%m-%d %H:%M:%S %z")
+        },
+        "has_changes": bool(repo.status()),
+        "repo_path": repo_path
+    }
+
+
+def _history_stats_pygit2(repo_path: str) -> Dict[str, Any]:
+    """Commit count, contributor count and newest author date from one walk of all refs"""
+    repo = pygit2.Repository(repo_path)
+    walker = None
+    for name in repo.references:
+        try:
+            target = repo.references[name].peel(pygit2.Commit).id
+        except (pygit2.GitError, ValueError):
+            # Refs that don't lead to a commit (e.g. tagged trees)
+            continue
+        if walker is None:
+            walker = repo.walk(target)
+        else:
+            walker.push(target)
+    if not repo.head_is_unborn:
+        walker = walker or repo.walk(repo.head.target)
+        walker.push(repo.head.target)
+
+    total_commits = 0
+    authors = set()
+    last_commit = None
+    for commit in walker or ():
+        total_commits += 1
+        authors.add(commit.author.name)
+        if last_commit is None or commit.author.time > last_commit.author.time:
+            last_commit = commit
+
+    return {
+        "total_commits": total_commits,
+        "total_contributors": len(authors),
+        "last_activity": _commit_time(last_commit) if last_commit else None
+    }
+
+
+def _history_stats_git(repo_path: str) -> Dict[str, Any]:
+    """_history_stats_pygit2 through the git CLI, streamed from a single git log"""
+    total_commits = 0
+    authors = set()
+    last_time, last_date = -1, None
+    
+    # One line per commit across all refs: mailmapped author, unix time, ISO date
+    cmd = ["git", "log", "--all", "--format=%aN%x00%at%x00%aI"]
+    # Raw bytes throughout; only the winning date is ever decoded
+    with subprocess.Popen(cmd, cwd=repo_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        for line in proc.stdout:
+            author, timestamp, date = line.rstrip(b"\n").split(b"\0")
+            total_commits += 1
+            authors.add(author)
+            if int(timestamp) > last_time:
+                last_time, last_date = int(timestamp), date
+        stderr = proc.stderr.read().decode(errors="replace")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    
+    return {
+        "total_commits": total_commits,
+        "total_contributors": len(authors),
+        "last_activity": datetime.fromisoformat(last_date.decode()) if last_date else None
+    }
+
+
 def get_local_repo_info(repo_path: str) -> Dict[str, Any]:
     """Get information about a local Git repository"""
     try:
         if not os.path.exists(repo_path) or not os.path.exists(os.path.join(repo_path, ".git")):
             return {"status": "error", "error": "Not a Git repository"}
         
-        # Change to repository directory
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        if PYGIT2_AVAILABLE:
+            return _local_repo_info_pygit2(repo_path)
         
-        try:
-            # Get current branch
-            current_branch = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True, text=True, check=True
-            ).stdout.strip()
-            
-            # Get remote origin URL
-            remote_url = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                capture_output=True, text=True, check=True
-            ).stdout.strip()
-            
-            # Get last commit info
-            last_commit = subprocess.run(
-                ["git", "log", "-1", "--format=%H|%an|%ae|%s|%ad", "--date=iso"],
-                capture_output=True, text=True, check=True
-            ).stdout.strip()
-            
-            # Get repository status
-            status_output = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True, text=True, check=True
-            ).stdout.strip()
-            
-            # Parse last commit info
-            commit_parts = last_commit.split("|")
-            last_commit_info = None
-            if len(commit_parts) == 5:
-                last_commit_info = {
-                    "sha": commit_parts[0],
-                    "author_name": commit_parts[1],
-                    "author_email": commit_parts[2],
-                    "message": commit_parts[3],
-                    "date": commit_parts[4]
-                }
-            
-            return {
-                "status": "ok",
-                "current_branch": current_branch,
-                "remote_url": remote_url,
-                "last_commit": last_commit_info,
-                "has_changes": bool(status_output),
-                "repo_path": repo_path
+        # Get current branch
+        current_branch = subprocess.run(
+            ["git", "branch", "--show-current"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        
+        # Get remote origin URL
+        remote_url = subprocess.run(
+            ["git", "config", "--get", "remote.origin.url"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        
+        # Get last commit info
+        last_commit = subprocess.run(
+            ["git", "log", "-1", "--format=%H|%an|%ae|%s|%ad", "--date=iso"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        
+        # Get repository status
+        status_output = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        
+        # Parse last commit info
+        commit_parts = last_commit.split("|")
+        last_commit_info = None
+        if len(commit_parts) == 5:
+            last_commit_info = {
+                "sha": commit_parts[0],
+                "author_name": commit_parts[1],
+                "author_email": commit_parts[2],
+                "message": commit_parts[3],
+                "date": commit_parts[4]
             }
-            
-        finally:
-            os.chdir(original_cwd)
-            
+        
+        return {
+            "status": "ok",
+            "current_branch": current_branch,
+            "remote_url": remote_url,
+            "last_commit": last_commit_info,
+            "has_changes": bool(status_output),
+            "repo_path": repo_path
+        }
+        
     except subprocess.CalledProcessError as e:
         logging.error(f"Git command failed: {e.stderr}")
         return {"status": "error", "error": f"Git command failed: {e.stderr}"}
@@ -151,21 +251,17 @@ def get_local_branches(repo_path: str) -> List[str]:
         if not os.path.exists(repo_path) or not os.path.exists(os.path.join(repo_path, ".git")):
             return []
         
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        if PYGIT2_AVAILABLE:
+            return sorted(pygit2.Repository(repo_path).branches.local)
+        
+        result = subprocess.run(
+            ["git", "branch", "--format=%(refname:short)"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        )
+        
+        branches = [branch.strip() for branch in result.stdout.split("\n") if branch.strip()]
+        return branches
         
-        try:
-            result = subprocess.run(
-                ["git", "branch", "--format=%(refname:short)"],
-                capture_output=True, text=True, check=True
-            )
-            
-            branches = [branch.strip() for branch in result.stdout.split("\n") if branch.strip()]
-            return branches
-            
-        finally:
-            os.chdir(original_cwd)
-            
     except subprocess.CalledProcessError as e:
         logging.error(f"Failed to get local branches: {e.stderr}")
         return []
@@ -174,35 +270,60 @@ def get_local_branches(repo_path: str) -> List[str]:
         return []
 
 
+def _matches_origin(repo_path: str) -> bool:
+    """Whether origin's copy of the current branch is at the local HEAD"""
+    try:
+        if PYGIT2_AVAILABLE:
+            head = pygit2.Repository(repo_path).head
+            local_sha, local_ref = str(head.target), head.name
+        else:
+            local_sha, local_ref = subprocess.run(
+                ["git", "rev-parse", "HEAD", "--symbolic-full-name", "HEAD"],
+                cwd=repo_path, capture_output=True, text=True, check=True
+            ).stdout.split()
+        if not local_ref.startswith("refs/heads/"):
+            return False
+        remote = subprocess.run(
+            ["git", "ls-remote", "origin", local_ref],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.split()
+        return bool(remote) and remote[0] == local_sha
+    except Exception:
+        # Unborn or detached HEAD, missing remote, ...: let the pull decide
+        return False
+
+
 def pull_latest_changes(repo_path: str, branch: Optional[str] = None) -> Dict[str, Any]:
     """Pull latest changes from remote repository"""
     try:
         if not os.path.exists(repo_path) or not os.path.exists(os.path.join(repo_path, ".git")):
             return {"status": "error", "error": "Not a Git repository"}
         
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        # Switch to branch if specified
+        if branch:
+            subprocess.run(["git", "checkout", branch], cwd=repo_path, capture_output=True, text=True, check=True)
         
-        try:
-            # Switch to branch if specified
-            if branch:
-                subprocess.run(["git", "checkout", branch], capture_output=True, text=True, check=True)
-            
-            # Pull latest changes
-            result = subprocess.run(
-                ["git", "pull", "origin"],
-                capture_output=True, text=True, check=True
-            )
-            
+        # Skip the pull when origin's branch already points at our HEAD; a
+        # ref listing is far cheaper than pull's fetch negotiation
+        if _matches_origin(repo_path):
             return {
                 "status": "ok",
-                "message": "Successfully pulled latest changes",
-                "output": result.stdout
+                "message": "Already up to date",
+                "output": ""
             }
-            
-        finally:
-            os.chdir(original_cwd)
-            
+        
+        # Pull latest changes
+        result = subprocess.run(
+            ["git", "pull", "origin"],
+            cwd=repo_path, capture_output=True, text=True, check=True
+        )
+        
+        return {
+            "status": "ok",
+            "message": "Successfully pulled latest changes",
+            "output": result.stdout
+        }
+        
     except subprocess.CalledProcessError as e:
         logging.error(f"Git pull failed: {e.stderr}")
         return {"status": "error", "error": f"Git pull failed: {e.stderr}"}
@@ -215,11 +336,19 @@ def get_repository_size(repo_path: str) -> int:
     """Get repository size in bytes"""
     try:
         total_size = 0
-        for dirpath, dirnames, filenames in os.walk(repo_path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                if os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
+        pending = [repo_path]
+        while pending:
+            # DirEntry caches the file type, so each entry costs at most one stat
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total_size += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        # Vanished mid-walk
+                        continue
         return total_size
     except Exception as e:
         logging.error(f"Failed to calculate repository size: {e}")
@@ -232,54 +361,21 @@ def analyze_repository_stats(repo_path: str) -> RepositoryStats:
         if not os.path.exists(repo_path) or not os.path.exists(os.path.join(repo_path, ".git")):
             return RepositoryStats()
         
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        # The lookups are independent; run them side by side
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            branches_future = pool.submit(get_local_branches, repo_path)
+            size_future = pool.submit(get_repository_size, repo_path)
+            if PYGIT2_AVAILABLE:
+                history = _history_stats_pygit2(repo_path)
+            else:
+                history = _history_stats_git(repo_path)
+        
+        return RepositoryStats(
+            total_branches=len(branches_future.result()),
+            repository_size=size_future.result() // 1024,  # Convert to KB
+            **history
+        )
         
-        try:
-            # Get total commits
-            commit_count_result = subprocess.run(
-                ["git", "rev-list", "--all", "--count"],
-                capture_output=True, text=True, check=True
-            )
-            total_commits = int(commit_count_result.stdout.strip())
-            
-            # Get total branches
-            branches = get_local_branches(repo_path)
-            total_branches = len(branches)
-            
-            # Get contributors
-            contributors_result = subprocess.run(
-                ["git", "shortlog", "-sn", "--all"],
-                capture_output=True, text=True, check=True
-            )
-            total_contributors = len(contributors_result.stdout.strip().split("\n")) if contributors_result.stdout.strip() else 0
-            
-            # Get last activity
-            last_commit_result = subprocess.run(
-                ["git", "log", "-1", "--format=%ad", "--date=iso"],
-                capture_output=True, text=True, check=True
-            )
-            last_activity = None
-            if last_commit_result.stdout.strip():
-                try:
-                    last_activity = datetime.fromisoformat(last_commit_result.stdout.strip().replace(' ', 'T'))
-                except:
-                    pass
-            
-            # Get repository size
-            repo_size = get_repository_size(repo_path) // 1024  # Convert to KB
-            
-            return RepositoryStats(
-                total_commits=total_commits,
-                total_branches=total_branches,
-                total_contributors=total_contributors,
-                last_activity=last_activity,
-                repository_size=repo_size
-            )
-            
-        finally:
-            os.chdir(original_cwd)
-            
     except subprocess.CalledProcessError as e:
         logging.error(f"Git command failed during analysis: {e.stderr}")
         return RepositoryStats()
@@ -288,11 +384,9 @@ def analyze_repository_stats(repo_path: str) -> RepositoryStats:
         return RepositoryStats()
 
 
-def create_git_ignore(repo_path: str, template: str = "python") -> Dict[str, Any]:
-    """Create or update .gitignore file with template"""
-    try:
-        gitignore_templates = {
-            "python": """# Byte-compiled / optimized / DLL files
+# .gitignore templates, pre-encoded for writing
+_GITIGNORE_TEMPLATES: Mapping[str, bytes] = MappingProxyType({
+    "python": b"""# Byte-compiled / optimized / DLL files
 __pycache__/
 *.py[cod]
 *$py.class
@@ -318,7 +412,7 @@ dist/
 build/
 *.egg-info/
 """,
-            "node": """# Dependencies
+    "node": b"""# Dependencies
 node_modules/
 npm-debug.log*
 yarn-debug.log*
@@ -344,7 +438,7 @@ build/
 .env.test.local
 .env.production.local
 """,
-            "general": """# OS generated files
+    "general": b"""# OS generated files
 .DS_Store
 .DS_Store?
 ._*
@@ -365,12 +459,16 @@ Thumbs.db
 # Environment
 .env
 """
-        }
-        
+})
+
+
+def create_git_ignore(repo_path: str, template: str = "python") -> Dict[str, Any]:
+    """Create or update .gitignore file with template"""
+    try:
         gitignore_path = os.path.join(repo_path, ".gitignore")
-        template_content = gitignore_templates.get(template, gitignore_templates["general"])
+        template_content = _GITIGNORE_TEMPLATES.get(template, _GITIGNORE_TEMPLATES["general"])
         
-        with open(gitignore_path, "w") as f:
+        with open(gitignore_path, "wb") as f:
             f.write(template_content)
         
         return {
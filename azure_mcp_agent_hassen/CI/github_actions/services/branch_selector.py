@@ -1,9 +1,12 @@
-from ...git.services.repositories import get_repository_branches  # assuming you have this
+import asyncio
 
-def select_branch(owner: str, repo: str, token: str) -> str:
-    branches = get_repository_branches(owner, repo, token)
+from ...git.services.repositories import get_repository_branches
+
+async def select_branch(owner: str, repo: str, token: str) -> str:
+    branches = await get_repository_branches(owner, repo, token)
     print("\nAvailable branches:")
     for idx, b in enumerate(branches, start=1):
         print(f"{idx}. {b.name}")
-    choice = int(input("\nSelect branch number: ")) - 1
+    # input() blocks, so prompt from a worker thread to keep the event loop free
+    choice = int(await asyncio.to_thread(input, "\nSelect branch number: ")) - 1
     return branches[choice].name
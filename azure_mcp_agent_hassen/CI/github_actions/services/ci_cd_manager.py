@@ -1,15 +1,20 @@
+import asyncio
+
 from .branch_selector import select_branch
 from .workflows import create_deploy_workflow
 from ...docker import build_image
 
-def setup_ci_cd(owner: str, repo: str, token: str):
-    branch = select_branch(owner, repo, token)
+async def setup_ci_cd(owner: str, repo: str, token: str, repo_path: str = "."):
+    branch = await select_branch(owner, repo, token)
     docker_image = f"{repo.lower()}:{branch}"
 
-    print(f"\n📦 Building Docker image {docker_image}...")
-    build_image(docker_image)
-
-    print("\n⚙️ Creating GitHub Actions workflow...")
-    create_deploy_workflow(branch, docker_image)
+    # The image build and the workflow file don't depend on each other
+    print(f"\n📦 Building Docker image {docker_image} and creating GitHub Actions workflow...")
+    build_result, _ = await asyncio.gather(
+        asyncio.to_thread(build_image, repo_path, repo.lower(), branch),
+        asyncio.to_thread(create_deploy_workflow, branch, repo, docker_image)
+    )
+    if build_result.get("status") != "ok":
+        raise RuntimeError(f"Docker build failed: {build_result.get('error')}")
 
     print("\n🎉 CI/CD pipeline ready!")
@@ -1,13 +1,19 @@
 import yaml
 from pathlib import Path
 
+# libyaml's C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 def save_yaml_file(path: Path, data: dict):
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        yaml.dump(data, f, sort_keys=False)
+    with open(path, "wb") as f:
+        yaml.dump(data, f, Dumper=_Dumper, sort_keys=False, encoding="utf-8")
 
 def load_yaml_file(path: Path) -> dict:
     if not path.exists():
         return {}
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_Loader)
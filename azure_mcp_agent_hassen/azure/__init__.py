@@ -27,7 +27,7 @@ from .models import (
 )
 
 # CLI client
-from .cli import az_command, load_azure_session, save_azure_session ,az_command_async
+from .cli import az_command, load_azure_session, save_azure_session ,az_command_async, az_command_text_async, az_json_async
 
 # Services
 from .services import (
@@ -35,10 +35,14 @@ from .services import (
     get_azure_subscriptions,
     azure_health_check,
     get_azure_vm_usage_and_cost,
+    get_azure_vm_usage_and_cost_async,
     get_azure_vm_details,
     list_azure_resource_groups,
     create_resource_group,
-    delete_resource_group
+    delete_resource_group,
+    list_azure_resource_groups_async,
+    create_resource_group_async,
+    delete_resource_group_async
 )
 
 # Utilities
@@ -73,6 +77,7 @@ __all__ = [
     "list_azure_vms",
     "get_vm_details",
     "get_vm_usage_and_cost", 
+    "get_azure_vm_usage_and_cost_async",
     "start_vm",
     "stop_vm",
     "restart_vm",
@@ -81,6 +86,9 @@ __all__ = [
     "list_azure_resource_groups",
     "create_resource_group",
     "delete_resource_group",
+    "list_azure_resource_groups_async",
+    "create_resource_group_async",
+    "delete_resource_group_async",
     
     # Utilities and monitoring
     "format_azure_cost",
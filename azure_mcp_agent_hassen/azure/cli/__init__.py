@@ -7,19 +7,44 @@ Azure CLI command execution and session management utilities.
 from .client import (
     az_command,
     az_command_async,
+    az_command_text_async,
+    az_json_async,
     save_azure_session,
     load_azure_session,
+    get_default_subscription_id,
+    invalidate_default_subscription,
     ensure_cost_extension_installed,
     check_azure_cli_available,
     check_azure_login_status
 )
+from .cache import cached, is_ok
+from .sdk import (
+    AZURE_SDK_AVAILABLE,
+    get_credential,
+    get_compute_client,
+    get_resource_client,
+    get_monitor_client,
+    to_cli_dict
+)
 
 __all__ = [
     "az_command",
     "az_command_async",
+    "az_command_text_async",
+    "az_json_async",
     "save_azure_session",
     "load_azure_session",
+    "get_default_subscription_id",
+    "invalidate_default_subscription",
     "ensure_cost_extension_installed",
     "check_azure_cli_available",
-    "check_azure_login_status"
+    "check_azure_login_status",
+    "cached",
+    "is_ok",
+    "AZURE_SDK_AVAILABLE",
+    "get_credential",
+    "get_compute_client",
+    "get_resource_client",
+    "get_monitor_client",
+    "to_cli_dict"
 ]
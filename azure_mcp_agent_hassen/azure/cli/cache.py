@@ -0,0 +1,144 @@
+"""
+Azure Result Cache
+
+Small on-disk JSON cache for slow, read-mostly Azure lookups. Entries
+live under CACHE_DIR, expire by file modification time and are keyed by
+the CLI's current account, so switching accounts or subscriptions (even
+from another process) never serves the previous account's results.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+CACHE_DIR = Path.home() / ".cache" / "az_mcp"
+CALL_CACHE_DIR = CACHE_DIR / "calls"
+# Cache files of any function are removed once they are this old
+CALL_CACHE_MAX_AGE = 24 * 3600
+
+# The CLI records the logged-in account and default subscription here
+AZURE_PROFILE = Path(os.getenv("AZURE_CONFIG_DIR") or Path.home() / ".azure") / "azureProfile.json"
+# (profile mtime_ns, (subscription ID, tenant ID)) of the last profile read
+_ACCOUNT_SCOPE: Tuple[int, Tuple[Optional[str], Optional[str]]] = (-1, (None, None))
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write a file via a temp file + rename so readers never see partial data"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def account_scope() -> Tuple[Optional[str], Optional[str]]:
+    """Get the (subscription ID, tenant ID) of the CLI's default account
+
+    Read from the CLI profile, re-parsed only when the file changes;
+    (None, None) when there is no profile or no default subscription.
+    """
+    global _ACCOUNT_SCOPE
+    try:
+        mtime_ns = AZURE_PROFILE.stat().st_mtime_ns
+    except OSError:
+        return None, None
+    if mtime_ns == _ACCOUNT_SCOPE[0]:
+        return _ACCOUNT_SCOPE[1]
+    
+    scope = (None, None)
+    try:
+        # The CLI writes the profile with a UTF-8 BOM
+        profile = json.loads(AZURE_PROFILE.read_text(encoding="utf-8-sig"))
+        for subscription in profile.get("subscriptions", []):
+            if subscription.get("isDefault"):
+                scope = (subscription.get("id"), subscription.get("tenantId"))
+                break
+    except (OSError, ValueError) as e:
+        logging.warning("Failed to read Azure CLI profile: %s", e)
+    _ACCOUNT_SCOPE = (mtime_ns, scope)
+    return scope
+
+
+def is_ok(result: Any) -> bool:
+    """Cache predicate for service results: only keep successful responses"""
+    return isinstance(result, dict) and result.get("status") == "ok"
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise SDK values (datetimes, enums) that json can't handle natively"""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def cached(ttl: float, cache_if: Callable[[Any], bool] = lambda result: True):
+    """Cache a function's JSON-serialisable results on disk for `ttl` seconds
+
+    Entries are keyed by the function, its arguments and the current
+    account (see account_scope). Writes sweep out this function's expired
+    entries (at most once per `ttl`) and any entry older than
+    CALL_CACHE_MAX_AGE, so entries with one-off arguments don't pile up.
+    The wrapped function gains a `cache_clear()` that drops all of its
+    entries.
+    """
+    def decorator(fn: Callable) -> Callable:
+        prefix = f"{fn.__module__}.{fn.__qualname__}"
+        next_sweep = 0.0
+
+        def sweep(now: float) -> None:
+            nonlocal next_sweep
+            if now < next_sweep:
+                return
+            next_sweep = now + ttl
+            try:
+                with os.scandir(CALL_CACHE_DIR) as entries:
+                    for entry in entries:
+                        age = now - entry.stat().st_mtime
+                        if age >= CALL_CACHE_MAX_AGE or (entry.name.startswith(f"{prefix}-") and age >= ttl):
+                            os.unlink(entry.path)
+            except OSError:
+                pass
+
+        def entry_path(args: tuple, kwargs: dict) -> Path:
+            key = json.dumps([account_scope(), args, sorted(kwargs.items())], default=_json_default)
+            digest = hashlib.sha256(key.encode()).hexdigest()
+            return CALL_CACHE_DIR / f"{prefix}-{digest}.json"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            path = entry_path(args, kwargs)
+            try:
+                if time.time() - path.stat().st_mtime < ttl:
+                    return json.loads(path.read_text())
+            except (OSError, ValueError):
+                pass
+
+            result = fn(*args, **kwargs)
+            if cache_if(result):
+                sweep(time.time())
+                try:
+                    write_atomic(path, json.dumps(result, default=_json_default))
+                except (OSError, TypeError, ValueError) as e:
+                    logging.warning("Failed to cache %s result: %s", prefix, e)
+            return result
+
+        def cache_clear() -> None:
+            for path in CALL_CACHE_DIR.glob(f"{prefix}-*.json"):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
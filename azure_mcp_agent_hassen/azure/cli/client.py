@@ -7,14 +7,30 @@ Core Azure CLI command execution and session management.
 import os
 import subprocess
 import asyncio
+import copy
+import functools
+import itertools
 import json
 import platform
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+from .cache import CACHE_DIR, account_scope, write_atomic
+
+# orjson parses large CLI payloads (e.g. `vm list`) several times faster
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps_indented(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_indented(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 # Azure CLI command based on platform
 if platform.system() == "Windows":
@@ -23,55 +39,163 @@ else:
     AZ_CMD = "az"
 
 STORAGE_FILE = Path("azure_auth_data.json")
+DEFAULT_SUBSCRIPTION_FILE = CACHE_DIR / "default_sub"
+
+# Read-only commands are cached briefly, in memory only, so duplicate lookups
+# in one request collapse; reads like `keys list` or `get-access-token`
+# return secrets, so they must never be written to disk
+READ_ONLY_VERBS = ("show", "list")
+AZ_READ_CACHE_TTL = 5
+# (account, args) -> (monotonic time, parsed output)
+_AZ_READS: Dict[tuple, Tuple[float, Any]] = {}
+
+
+def _is_read_only(args: tuple) -> bool:
+    """Check whether an az command only reads state (`... list`, `... show`, `... get-*`)"""
+    positional = list(itertools.takewhile(lambda arg: not arg.startswith("-"), args))
+    return bool(positional) and (
+        positional[-1] in READ_ONLY_VERBS or positional[-1].startswith("get-")
+    )
 
 
-def az_command(*args) -> Dict[str, Any]:
-    """Execute Azure CLI command and return JSON output"""
-    env = os.environ.copy()
+def _run_az(*args, extra_env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Run an Azure CLI command and parse its JSON output"""
+    # The child inherits our environment unless overrides are requested
+    env = {**os.environ, **extra_env} if extra_env else None
     result = subprocess.run(
         [AZ_CMD, *args, "--output", "json"],
         capture_output=True,
-        text=True,
         env=env
     )
     if result.returncode != 0:
-        raise RuntimeError(result.stderr)
+        raise RuntimeError(result.stderr.decode())
     try:
-        return json.loads(result.stdout)
+        return _loads(result.stdout)
     except json.JSONDecodeError as e:
-        logging.error(f"JSON decode error: {str(e)}, stdout: {result.stdout}")
-        raise RuntimeError(f"Failed to parse JSON output: {str(e)}, stdout: {result.stdout}")
+        logging.error("JSON decode error: %s, stdout: %r", e, result.stdout)
+        raise RuntimeError(f"Failed to parse JSON output: {str(e)}, stdout: {result.stdout!r}")
 
 
-async def az_command_async(cmd: str) -> str:
-    """Execute Azure CLI command asynchronously"""
-    args = [AZ_CMD] + cmd.split()
+def _run_az_cached(*args) -> Dict[str, Any]:
+    """Run a read-only az command, reusing its output for AZ_READ_CACHE_TTL seconds"""
+    key = (account_scope(), args)
+    now = time.monotonic()
+    hit = _AZ_READS.get(key)
+    if hit is None or now - hit[0] >= AZ_READ_CACHE_TTL:
+        for expired in [k for k, (at, _) in _AZ_READS.items() if now - at >= AZ_READ_CACHE_TTL]:
+            del _AZ_READS[expired]
+        hit = _AZ_READS[key] = (now, _run_az(*args))
+    # Callers may annotate what they get back (e.g. VM costs)
+    return copy.deepcopy(hit[1])
+
+
+def az_command(*args, extra_env: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Execute Azure CLI command and return JSON output"""
+    if _is_read_only(args) and not extra_env:
+        return _run_az_cached(*args)
+    
+    result = _run_az(*args, extra_env=extra_env)
+    # Anything else may have changed state the cached reads describe
+    _AZ_READS.clear()
+    return result
+
+
+async def az_json_async(*args) -> Any:
+    """Execute Azure CLI command asynchronously and return JSON output"""
     proc = await asyncio.create_subprocess_exec(
-        *args,
+        AZ_CMD, *args, "--output", "json",
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE
     )
     stdout, stderr = await proc.communicate()
 
     if proc.returncode != 0:
-        return f"❌ Error: {stderr.decode()}"
+        raise RuntimeError(stderr.decode())
+    if not stdout.strip():
+        # Commands like `account set` print nothing on success
+        return None
+    try:
+        return _loads(stdout)
+    except json.JSONDecodeError as e:
+        logging.error("JSON decode error: %s, stdout: %r", e, stdout)
+        raise RuntimeError(f"Failed to parse JSON output: {str(e)}, stdout: {stdout!r}")
+
 
+async def az_command_text_async(*args) -> str:
+    """Execute Azure CLI command asynchronously and return its output as printed"""
+    proc = await asyncio.create_subprocess_exec(
+        AZ_CMD, *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.decode())
     return stdout.decode()
 
 
+async def az_command_async(cmd: str) -> str:
+    """Execute Azure CLI command asynchronously"""
+    try:
+        return await az_command_text_async(*cmd.split())
+    except RuntimeError as e:
+        return f"❌ Error: {e}"
+
+
 def save_azure_session(subscriptions: List[Dict]) -> None:
     """Save Azure session data to file"""
-    STORAGE_FILE.write_text(json.dumps(subscriptions, indent=2))
+    STORAGE_FILE.write_bytes(_dumps_indented(subscriptions))
     logging.debug("Azure session saved to file")
 
 
 def load_azure_session() -> Optional[List[Dict]]:
     """Load Azure session data from file"""
     if STORAGE_FILE.exists():
-        return json.loads(STORAGE_FILE.read_text())
+        return _loads(STORAGE_FILE.read_bytes())
     return None
 
 
+def get_default_subscription_id() -> str:
+    """Get the CLI's default subscription ID
+    
+    Taken from the CLI profile when there is one, so an `az login` or
+    `az account set` elsewhere is picked up; otherwise from `az account
+    show`, cached in memory and on disk.
+    """
+    subscription_id, _ = account_scope()
+    return subscription_id or _show_default_subscription_id()
+
+
+@functools.lru_cache(maxsize=1)
+def _show_default_subscription_id() -> str:
+    """Get the default subscription ID from `az account show`, cached in memory and on disk"""
+    try:
+        cached = DEFAULT_SUBSCRIPTION_FILE.read_text().strip()
+        if cached:
+            return cached
+    except OSError:
+        pass
+    
+    subscription_id = az_command("account", "show")["id"]
+    
+    try:
+        write_atomic(DEFAULT_SUBSCRIPTION_FILE, subscription_id)
+    except OSError as e:
+        logging.warning("Failed to cache default subscription: %s", e)
+    
+    return subscription_id
+
+
+def invalidate_default_subscription() -> None:
+    """Forget the cached default subscription ID"""
+    _show_default_subscription_id.cache_clear()
+    try:
+        DEFAULT_SUBSCRIPTION_FILE.unlink()
+    except FileNotFoundError:
+        pass
+
+
 def ensure_cost_extension_installed() -> None:
     """Ensure Azure Cost Management extension is installed"""
     try:
@@ -81,7 +205,7 @@ def ensure_cost_extension_installed() -> None:
         if "already installed" in str(e):
             logging.debug("costmanagement extension already installed.")
         else:
-            logging.error(f"Failed to install costmanagement extension: {e}")
+            logging.error("Failed to install costmanagement extension: %s", e)
 
 
 def check_azure_cli_available() -> bool:
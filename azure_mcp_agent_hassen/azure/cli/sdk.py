@@ -0,0 +1,63 @@
+"""
+Azure SDK Clients
+
+Long-lived Azure management SDK clients for the hot read paths. Each
+client is created once per subscription and reused, avoiding the
+interpreter startup that every `az` subprocess pays. The SDK packages
+are optional; callers fall back to `az_command` when they are missing.
+"""
+
+import functools
+import re
+from typing import Any, Dict, Tuple
+
+try:
+    from azure.identity import DefaultAzureCredential
+    from azure.mgmt.compute import ComputeManagementClient
+    from azure.mgmt.monitor import MonitorManagementClient
+    from azure.mgmt.resource import ResourceManagementClient
+    AZURE_SDK_AVAILABLE = True
+except ImportError:
+    AZURE_SDK_AVAILABLE = False
+
+# REST keys of flattened properties look like "properties.hardwareProfile"
+_UNESCAPED_DOT = re.compile(r"(?<!\\)\.")
+
+
+@functools.lru_cache(maxsize=1)
+def get_credential() -> "DefaultAzureCredential":
+    """Get the shared Azure credential (picks up an existing `az login`)"""
+    return DefaultAzureCredential()
+
+
+@functools.lru_cache(maxsize=None)
+def get_compute_client(subscription_id: str) -> "ComputeManagementClient":
+    """Get the cached compute client for a subscription"""
+    return ComputeManagementClient(get_credential(), subscription_id)
+
+
+@functools.lru_cache(maxsize=None)
+def get_resource_client(subscription_id: str) -> "ResourceManagementClient":
+    """Get the cached resource client for a subscription"""
+    return ResourceManagementClient(get_credential(), subscription_id)
+
+
+@functools.lru_cache(maxsize=None)
+def get_monitor_client(subscription_id: str) -> "MonitorManagementClient":
+    """Get the cached monitor client for a subscription"""
+    return MonitorManagementClient(get_credential(), subscription_id)
+
+
+def _cli_key(key: str, attr_desc: Dict[str, Any], value: Any) -> Tuple[str, Any]:
+    """Map an SDK attribute to the camelCase key `az` prints for it"""
+    return _UNESCAPED_DOT.split(attr_desc["key"])[-1].replace("\\.", "."), value
+
+
+def to_cli_dict(model: Any) -> Dict[str, Any]:
+    """Convert an SDK model to the same dict shape as `az ... --output json`"""
+    return model.as_dict(keep_readonly=True, key_transformer=_cli_key)
+
+
+def subscription_from_resource_id(resource_id: str) -> str:
+    """Extract the subscription ID from an ARM resource ID"""
+    return resource_id.split("/")[2]
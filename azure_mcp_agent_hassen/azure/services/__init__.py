@@ -8,12 +8,16 @@ authentication, compute resources, resource management, and monitoring.
 from .auth import launch_azure_login, get_azure_subscriptions, azure_health_check
 from .compute import (
     get_azure_vm_usage_and_cost,
+    get_azure_vm_usage_and_cost_async,
     get_azure_vm_details
 )
 from .resources import (
     list_azure_resource_groups,
     create_resource_group,
-    delete_resource_group
+    delete_resource_group,
+    list_azure_resource_groups_async,
+    create_resource_group_async,
+    delete_resource_group_async
 )
 
 __all__ = [
@@ -24,10 +28,14 @@ __all__ = [
     
     # Compute services
     "get_azure_vm_usage_and_cost",
+    "get_azure_vm_usage_and_cost_async",
     "get_azure_vm_details",
     
     # Resource management
     "list_azure_resource_groups",
     "create_resource_group",
-    "delete_resource_group"
+    "delete_resource_group",
+    "list_azure_resource_groups_async",
+    "create_resource_group_async",
+    "delete_resource_group_async"
 ]
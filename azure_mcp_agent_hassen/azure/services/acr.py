@@ -8,9 +8,6 @@ import logging
 from typing import Dict, List, Optional
 from ..cli.client import AZ_CMD
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
-
 
 class ACRService:
     """Azure Container Registry management service"""
@@ -112,22 +109,22 @@ class ACRService:
     
     async def push_image_to_acr(self, local_image: str, acr_name: str, repo_name: str, tag: str = "latest") -> Dict:
         """Push Docker image to ACR"""
-        logging.info(f"Starting ACR push process for image: {local_image}")
-        logging.info(f"ACR name: {acr_name}, repo name: {repo_name}, tag: {tag}")
+        logging.info("Starting ACR push process for image: %s", local_image)
+        logging.info("ACR name: %s, repo name: %s, tag: %s", acr_name, repo_name, tag)
         
         try:
             acr_url = f"{acr_name}.azurecr.io"
             target_image = f"{acr_url}/{repo_name}:{tag}"
             
-            logging.info(f"Target ACR image: {target_image}")
+            logging.info("Target ACR image: %s", target_image)
             
             # First, let's check if Docker is running and list available images
             list_cmd = ["docker", "images"]
             list_result = subprocess.run(list_cmd, capture_output=True, text=True, timeout=30)
-            logging.info(f"Available Docker images:\n{list_result.stdout}")
+            logging.info("Available Docker images:\n%s", list_result.stdout)
             
             if list_result.returncode != 0:
-                logging.error(f"Failed to list Docker images: {list_result.stderr}")
+                logging.error("Failed to list Docker images: %s", list_result.stderr)
                 return {
                     "status": "error",
                     "message": f"Docker not available or not running: {list_result.stderr}",
@@ -140,15 +137,15 @@ class ACRService:
             
             # Tag image for ACR
             tag_cmd = ["docker", "tag", local_image, target_image]
-            logging.info(f"Executing tag command: {' '.join(tag_cmd)}")
+            logging.info("Executing tag command: %s", ' '.join(tag_cmd))
             
             tag_result = subprocess.run(tag_cmd, capture_output=True, text=True, timeout=60)
-            logging.info(f"Tag command stdout: {tag_result.stdout}")
-            logging.info(f"Tag command stderr: {tag_result.stderr}")
-            logging.info(f"Tag command return code: {tag_result.returncode}")
+            logging.info("Tag command stdout: %s", tag_result.stdout)
+            logging.info("Tag command stderr: %s", tag_result.stderr)
+            logging.info("Tag command return code: %s", tag_result.returncode)
             
             if tag_result.returncode != 0:
-                logging.error(f"Failed to tag image: {tag_result.stderr}")
+                logging.error("Failed to tag image: %s", tag_result.stderr)
                 return {
                     "status": "error",
                     "message": f"Failed to tag image: {tag_result.stderr}",
@@ -166,15 +163,15 @@ class ACRService:
             
             # Push to ACR
             push_cmd = ["docker", "push", target_image]
-            logging.info(f"Executing push command: {' '.join(push_cmd)}")
+            logging.info("Executing push command: %s", ' '.join(push_cmd))
             
             push_result = subprocess.run(push_cmd, capture_output=True, text=True, timeout=600)
-            logging.info(f"Push command stdout: {push_result.stdout}")
-            logging.info(f"Push command stderr: {push_result.stderr}")
-            logging.info(f"Push command return code: {push_result.returncode}")
+            logging.info("Push command stdout: %s", push_result.stdout)
+            logging.info("Push command stderr: %s", push_result.stderr)
+            logging.info("Push command return code: %s", push_result.returncode)
             
             if push_result.returncode == 0:
-                logging.info(f"Successfully pushed {local_image} to ACR as {target_image}")
+                logging.info("Successfully pushed %s to ACR as %s", local_image, target_image)
                 return {
                     "status": "success",
                     "local_image": local_image,
@@ -185,7 +182,7 @@ class ACRService:
                     }
                 }
             else:
-                logging.error(f"Failed to push to ACR: {push_result.stderr}")
+                logging.error("Failed to push to ACR: %s", push_result.stderr)
                 return {
                     "status": "error",
                     "message": f"Failed to push to ACR: {push_result.stderr}",
@@ -197,7 +194,7 @@ class ACRService:
                 }
                 
         except Exception as e:
-            logging.exception(f"Exception occurred during ACR push: {str(e)}")
+            logging.exception("Exception occurred during ACR push: %s", e)
             return {
                 "status": "error",
                 "message": f"Exception pushing to ACR: {str(e)}",
@@ -6,23 +6,39 @@ Handles Azure login, session management, and authentication status.
 
 import subprocess
 import logging
+import platform
+import time
 from typing import Optional
 
 from ..models.azure_models import AzureLoginResponse, AzureSubscriptionsResponse
-from ..cli.client import az_command, save_azure_session, load_azure_session, AZ_CMD
+from ..cli.client import (
+    az_command,
+    save_azure_session,
+    load_azure_session,
+    invalidate_default_subscription,
+    AZ_CMD,
+    STORAGE_FILE
+)
+
+# Saved subscriptions younger than this are served without calling `az`
+SUBSCRIPTIONS_MAX_AGE = 3600
 
 
 def launch_azure_login() -> AzureLoginResponse:
     """Launch Azure CLI login process"""
     try:
-        subprocess.Popen(f'start "" "{AZ_CMD}" login', shell=True)
+        # Launch az directly (no intermediate shell) in its own console/session
+        if platform.system() == "Windows":
+            subprocess.Popen([AZ_CMD, "login"], creationflags=subprocess.CREATE_NEW_CONSOLE)
+        else:
+            subprocess.Popen([AZ_CMD, "login"], start_new_session=True)
         logging.debug("Azure login window launched")
         return AzureLoginResponse(
             status="launched", 
             message="Azure login window opened. Please complete authentication in the browser."
         )
     except Exception as e:
-        logging.error(f"Failed to launch Azure login: {e}")
+        logging.error("Failed to launch Azure login: %s", e)
         return AzureLoginResponse(
             status="error", 
             message="Failed to launch login window",
@@ -30,32 +46,43 @@ def launch_azure_login() -> AzureLoginResponse:
         )
 
 
-def get_azure_subscriptions() -> AzureSubscriptionsResponse:
-    """Get list of Azure subscriptions"""
+def get_azure_subscriptions(force_refresh: bool = False) -> AzureSubscriptionsResponse:
+    """Get list of Azure subscriptions, reusing the saved session while it is fresh"""
     try:
-        # Check if user is logged in
-        check_login = subprocess.run(
-            [AZ_CMD, "account", "show"],
-            capture_output=True,
-            text=True
-        )
-        logging.debug("Checked Azure login status")
+        if not force_refresh:
+            try:
+                is_fresh = time.time() - STORAGE_FILE.stat().st_mtime < SUBSCRIPTIONS_MAX_AGE
+            except OSError:
+                is_fresh = False
+            subscriptions = load_azure_session() if is_fresh else None
+            if subscriptions:
+                return AzureSubscriptionsResponse(
+                    status="ok",
+                    subscriptions=subscriptions,
+                    message="from cache"
+                )
 
-        if check_login.returncode != 0:
+        # List subscriptions directly; a login error here means the user isn't logged in
+        try:
+            subscriptions = az_command("account", "list")
+        except RuntimeError as e:
+            message = str(e).lower()
+            if "az login" not in message and "please run" not in message:
+                raise
+            subscriptions = []
+
+        if not subscriptions:
             logging.warning("User is NOT logged in to Azure")
             return AzureSubscriptionsResponse(
                 status="not_logged_in",
                 message="Azure login not complete. Please run launch_azure_login() first."
             )
 
-        logging.debug("User is logged in to Azure. Listing subscriptions...")
-
-        # List subscriptions
-        subscriptions = az_command("account", "list")
-        logging.debug(f"Retrieved {len(subscriptions)} Azure subscriptions")
+        logging.debug("Retrieved %s Azure subscriptions", len(subscriptions))
 
         # Save session to file
         save_azure_session(subscriptions)
+        invalidate_default_subscription()
 
         return AzureSubscriptionsResponse(
             status="ok",
@@ -77,5 +104,5 @@ def azure_health_check() -> dict:
     try:
         return {"status": "ok", "message": "Azure MCP utilities are working"}
     except Exception as e:
-        logging.error(f"Azure health check failed: {e}")
+        logging.error("Azure health check failed: %s", e)
         return {"status": "error", "error": str(e)}
@@ -4,18 +4,88 @@ Azure Virtual Machine Services
 Handles Azure VM operations, usage analysis, and cost management.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Optional, Dict, Any
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Dict, Any, Tuple
 
 from ..models.azure_models import AzureVMUsageResponse
-from ..cli.client import az_command, load_azure_session, ensure_cost_extension_installed
+from ..cli.cache import cached, is_ok
+from ..cli.client import (
+    az_command,
+    az_json_async,
+    load_azure_session,
+    ensure_cost_extension_installed
+)
+from ..cli.sdk import AZURE_SDK_AVAILABLE, get_compute_client, to_cli_dict
 
+# Cost values the API uses for "no data"
+_SKIP_COSTS = frozenset({None, "None", ""})
+COST_PERIOD_DAYS = 30
 
-def get_azure_vm_usage_and_cost() -> AzureVMUsageResponse:
-    """Fetch details and costs of all Azure VMs for the subscription"""
-    logging.debug("Starting Azure VM usage and cost analysis")
+
+@functools.lru_cache(maxsize=1)
+def _cost_time_period(today: date) -> Tuple[str, str]:
+    """Get the (from, to) bounds of the cost window ending on `today`"""
+    start = datetime.combine(today - timedelta(days=COST_PERIOD_DAYS), time.min, timezone.utc)
+    end = datetime.combine(today, time.max.replace(microsecond=0), timezone.utc)
+    return start.isoformat(), end.isoformat()
+
+
+def _cost_value(value: Any) -> float:
+    """Parse a cost cell, treating malformed values as zero"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _cost_query_args(subscription_id: str) -> Tuple[str, ...]:
+    """az arguments for the cost query, grouped server-side to one row per resource"""
+    time_from, time_to = _cost_time_period(datetime.now(timezone.utc).date())
+    return (
+        "costmanagement", "query",
+        "--scope", f"/subscriptions/{subscription_id}",
+        "--type", "Usage",
+        "--timeframe", "Custom",
+        "--time-period", f"from={time_from}", f"to={time_to}",
+        "--dataset-aggregation", '{"totalCost":{"name":"PreTaxCost","function":"Sum"}}',
+        "--dataset-grouping", "name=ResourceId", "type=Dimension"
+    )
+
+
+def _query_vm_costs(subscription_id: str) -> Dict[str, Any]:
+    """Run the cost management query"""
+    ensure_cost_extension_installed()
+    return az_command(*_cost_query_args(subscription_id))
+
+
+async def _query_vm_costs_async(subscription_id: str) -> Dict[str, Any]:
+    """Async variant of _query_vm_costs"""
+    await asyncio.to_thread(ensure_cost_extension_installed)
+    return await az_json_async(*_cost_query_args(subscription_id))
+
+
+def _costs_by_resource(properties: Dict[str, Any]) -> Tuple[Dict[str, float], Optional[str]]:
+    """Map lower-cased resource IDs to their cost, plus the reported currency"""
+    columns = [column.get("name") for column in properties.get("columns", [])]
+    cost_index = columns.index("totalCost") if "totalCost" in columns else 0
+    resource_index = columns.index("ResourceId") if "ResourceId" in columns else 1
+    currency_index = columns.index("Currency") if "Currency" in columns else None
     
-    result = AzureVMUsageResponse(
+    rows = [row for row in properties.get("rows", []) if len(row) > resource_index]
+    costs = {
+        str(row[resource_index]).lower(): _cost_value(row[cost_index])
+        for row in rows
+        if row[cost_index] not in _SKIP_COSTS
+    }
+    currency = rows[0][currency_index] if rows and currency_index is not None else None
+    return costs, currency
+
+
+def _new_usage_result() -> AzureVMUsageResponse:
+    return AzureVMUsageResponse(
         status="ok",
         vms=[],
         total_cost=0.0,
@@ -23,87 +93,126 @@ def get_azure_vm_usage_and_cost() -> AzureVMUsageResponse:
         debug=[]
     )
 
-    try:
-        # Load subscriptions
-        logging.debug("Loading Azure subscriptions")
-        result.debug.append("Loading Azure subscriptions")
+
+def _usage_subscription(result: AzureVMUsageResponse) -> Optional[str]:
+    """Pick the subscription to report on, or mark the result as not logged in"""
+    logging.debug("Loading Azure subscriptions")
+    result.debug.append("Loading Azure subscriptions")
+    
+    subscriptions = load_azure_session()
+    if not subscriptions:
+        logging.warning("No Azure subscriptions found")
+        result.status = "not_logged_in"
+        result.debug.append("No subscriptions found - please log in first")
+        return None
+
+    # Use the first subscription
+    subscription = subscriptions[0]
+    subscription_id = subscription.get("id")
+    result.debug.append(f"Using subscription: {subscription.get('name')} ({subscription_id})")
+    return subscription_id
+
+
+def _merge_usage(result: AzureVMUsageResponse, vms: Any, cost_data: Any) -> AzureVMUsageResponse:
+    """Fill in the VM list and costs; either input may be the exception its call raised"""
+    if isinstance(vms, Exception):
+        result.vm_error = str(vms)
+        result.debug.append(f"VM list error: {str(vms)}")
+        vms = []
+    else:
+        result.debug.append(f"Found {len(vms)} VMs")
+        result.vms = vms
+
+    if isinstance(cost_data, Exception):
+        result.cost_error = str(cost_data)
+        result.debug.append(f"Cost query error: {str(cost_data)}")
+    elif cost_data and "properties" in cost_data:
+        costs, currency = _costs_by_resource(cost_data["properties"])
+        for vm in vms:
+            vm["cost"] = costs.get(vm.get("id", "").lower(), 0.0)
         
-        subscriptions = load_azure_session()
-        if not subscriptions:
-            logging.warning("No Azure subscriptions found")
-            result.status = "not_logged_in"
-            result.debug.append("No subscriptions found - please log in first")
-            return result
+        total_cost = sum(costs.values())
+        result.total_cost = total_cost
+        result.currency = currency or "USD"  # Default currency
+        result.debug.append(f"Retrieved cost data for {len(costs)} resources: ${total_cost}")
+    else:
+        result.debug.append("No cost data available")
+
+    return result
+
+
+def _usage_failed(result: AzureVMUsageResponse, e: Exception) -> AzureVMUsageResponse:
+    logging.error("Unexpected error in Azure VM usage analysis: %s", e)
+    result.status = "error"
+    result.debug.append(f"Unexpected error: {str(e)}")
+    return result
+
 
-        # Use the first subscription
-        subscription = subscriptions[0]
-        subscription_id = subscription.get("id")
-        result.debug.append(f"Using subscription: {subscription.get('name')} ({subscription_id})")
+async def get_azure_vm_usage_and_cost_async() -> AzureVMUsageResponse:
+    """Fetch details and costs of all Azure VMs for the subscription"""
+    logging.debug("Starting Azure VM usage and cost analysis")
+    result = _new_usage_result()
+
+    try:
+        subscription_id = _usage_subscription(result)
+        if subscription_id is None:
+            return result
         
-        # Set subscription context
-        az_command("account", "set", "--subscription", subscription_id)
-        result.debug.append("Set subscription context")
+        # VM list and cost query are independent, so run them concurrently
+        vms, cost_data = await asyncio.gather(
+            az_json_async("vm", "list", "--show-details", "--subscription", subscription_id),
+            _query_vm_costs_async(subscription_id),
+            return_exceptions=True
+        )
+        return _merge_usage(result, vms, cost_data)
+
+    except Exception as e:
+        return _usage_failed(result, e)
+
 
-        # Get VMs
+def get_azure_vm_usage_and_cost() -> AzureVMUsageResponse:
+    """Fetch details and costs of all Azure VMs for the subscription
+    
+    Runs the two az calls one after the other, so it is safe to call from
+    code that already has an event loop running.
+    """
+    logging.debug("Starting Azure VM usage and cost analysis")
+    result = _new_usage_result()
+
+    try:
+        subscription_id = _usage_subscription(result)
+        if subscription_id is None:
+            return result
+        
         try:
-            vms = az_command("vm", "list", "--show-details")
-            result.debug.append(f"Found {len(vms)} VMs")
-            result.vms = vms
+            vms = az_command("vm", "list", "--show-details", "--subscription", subscription_id)
         except Exception as e:
-            result.vm_error = str(e)
-            result.debug.append(f"VM list error: {str(e)}")
-
-        # Get cost information
+            vms = e
         try:
-            ensure_cost_extension_installed()
-            
-            # Query cost management
-            cost_data = az_command(
-                "costmanagement", "query",
-                "--type", "Usage",
-                "--dataset-aggregation", "totalCost=sum",
-                "--dataset-grouping", "name=ResourceId,type=Dimension",
-                "--time-period", "from=2024-01-01T00:00:00+00:00",
-                "--time-period", "to=2024-12-31T23:59:59+00:00"
-            )
-            
-            if cost_data and "properties" in cost_data:
-                rows = cost_data["properties"].get("rows", [])
-                total_cost = sum(float(row[0]) for row in rows if row and len(row) > 0)
-                result.total_cost = total_cost
-                result.currency = "USD"  # Default currency
-                result.debug.append(f"Retrieved cost data: ${total_cost}")
-            else:
-                result.debug.append("No cost data available")
-                
+            cost_data = _query_vm_costs(subscription_id)
         except Exception as e:
-            result.cost_error = str(e)
-            result.debug.append(f"Cost query error: {str(e)}")
-
-        return result
+            cost_data = e
+        return _merge_usage(result, vms, cost_data)
 
     except Exception as e:
-        logging.error(f"Unexpected error in Azure VM usage analysis: {str(e)}")
-        result.status = "error"
-        result.debug.append(f"Unexpected error: {str(e)}")
-        return result
+        return _usage_failed(result, e)
 
 
-def get_azure_vm_details(vm_name: str, resource_group: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
-    """Get detailed information about a specific Azure VM"""
+@cached(ttl=300, cache_if=is_ok)
+def _vm_details(vm_name: str, resource_group: str, subscription_id: str) -> Dict[str, Any]:
+    """Get a VM's configuration, which rarely changes; power state is left out"""
     try:
-        if not subscription_id:
-            subscriptions = load_azure_session()
-            if not subscriptions:
-                return {"status": "not_logged_in", "message": "Please log in first"}
-            subscription_id = subscriptions[0].get("id")
-
-        vm_details = az_command(
-            "vm", "show",
-            "--name", vm_name,
-            "--resource-group", resource_group,
-            "--subscription", subscription_id
-        )
+        if AZURE_SDK_AVAILABLE:
+            vm_details = to_cli_dict(
+                get_compute_client(subscription_id).virtual_machines.get(resource_group, vm_name)
+            )
+        else:
+            vm_details = az_command(
+                "vm", "show",
+                "--name", vm_name,
+                "--resource-group", resource_group,
+                "--subscription", subscription_id
+            )
         
         return {
             "status": "ok",
@@ -112,10 +221,49 @@ def get_azure_vm_details(vm_name: str, resource_group: str, subscription_id: Opt
                 "location": vm_details.get("location"),
                 "vm_size": vm_details.get("hardwareProfile", {}).get("vmSize"),
                 "os_type": vm_details.get("storageProfile", {}).get("osDisk", {}).get("osType"),
-                "provisioning_state": vm_details.get("provisioningState"),
-                "power_state": vm_details.get("instanceView", {}).get("statuses", [{}])[-1].get("displayStatus")
+                "provisioning_state": vm_details.get("provisioningState")
             }
         }
     except Exception as e:
-        logging.error(f"Failed to get Azure VM details: {e}")
+        logging.error("Failed to get Azure VM details: %s", e)
+        return {"status": "error", "error": str(e)}
+
+
+def _vm_power_state(vm_name: str, resource_group: str, subscription_id: str) -> Optional[str]:
+    """Get a VM's current power state (e.g. "VM running")"""
+    if AZURE_SDK_AVAILABLE:
+        statuses = get_compute_client(subscription_id).virtual_machines.instance_view(
+            resource_group, vm_name
+        ).statuses or []
+        return statuses[-1].display_status if statuses else None
+    return az_command(
+        "vm", "get-instance-view",
+        "--name", vm_name,
+        "--resource-group", resource_group,
+        "--subscription", subscription_id,
+        "--query", "instanceView.statuses[-1].displayStatus"
+    )
+
+
+def get_azure_vm_details(vm_name: str, resource_group: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Get detailed information about a specific Azure VM
+    
+    The configuration is cached for a few minutes; the power state is
+    always read live since a VM can be started or stopped at any time.
+    """
+    try:
+        if not subscription_id:
+            subscriptions = load_azure_session()
+            if not subscriptions:
+                return {"status": "not_logged_in", "message": "Please log in first"}
+            subscription_id = subscriptions[0].get("id")
+
+        result = _vm_details(vm_name, resource_group, subscription_id)
+        if result["status"] != "ok":
+            return result
+        
+        power_state = _vm_power_state(vm_name, resource_group, subscription_id)
+        return {**result, "vm_details": {**result["vm_details"], "power_state": power_state}}
+    except Exception as e:
+        logging.error("Failed to get Azure VM details: %s", e)
         return {"status": "error", "error": str(e)}
@@ -2,8 +2,10 @@
 Helm Charts Service for Kubernetes Deployments
 Handles Helm chart generation and deployment to AKS
 """
+import asyncio
+import functools
+import json
 import subprocess
-import yaml
 import os
 from typing import Dict, List, Optional
 from pathlib import Path
@@ -12,6 +14,13 @@ from pathlib import Path
 from ..cli.client import AZ_CMD
 
 
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """Import PyYAML on first use so loading this module stays cheap"""
+    import yaml
+    return yaml
+
+
 class HelmService:
     """Helm charts management service"""
     
@@ -43,7 +52,7 @@ class HelmService:
             }
             
             with open(os.path.join(chart_path, "Chart.yaml"), "w") as f:
-                yaml.dump(chart_yaml, f, default_flow_style=False)
+                _yaml().dump(chart_yaml, f, default_flow_style=False)
             
             # values.yaml
             values_yaml = {
@@ -96,7 +105,7 @@ class HelmService:
             }
             
             with open(os.path.join(chart_path, "values.yaml"), "w") as f:
-                yaml.dump(values_yaml, f, default_flow_style=False)
+                _yaml().dump(values_yaml, f, default_flow_style=False)
             
             # Deployment template
             deployment_template = f"""apiVersion: apps/v1
@@ -288,7 +297,7 @@ app.kubernetes.io/instance: {{{{ .Release.Name }}}}
             if values_override:
                 values_file = os.path.join(chart_path, "custom-values.yaml")
                 with open(values_file, "w") as f:
-                    yaml.dump(values_override, f, default_flow_style=False)
+                    _yaml().dump(values_override, f, default_flow_style=False)
                 cmd.extend(["--values", values_file])
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
@@ -329,7 +338,7 @@ app.kubernetes.io/instance: {{{{ .Release.Name }}}}
             if values_override:
                 values_file = os.path.join(chart_path, "upgrade-values.yaml")
                 with open(values_file, "w") as f:
-                    yaml.dump(values_override, f, default_flow_style=False)
+                    _yaml().dump(values_override, f, default_flow_style=False)
                 cmd.extend(["--values", values_file])
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
@@ -381,10 +390,24 @@ app.kubernetes.io/instance: {{{{ .Release.Name }}}}
         """List Helm releases in namespace"""
         try:
             cmd = ["helm", "list", "--namespace", namespace, "--output", "json"]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return {
+                    "status": "error",
+                    "message": "Timed out listing Helm releases after 60 seconds"
+                }
             
-            if result.returncode == 0:
-                releases = yaml.safe_load(result.stdout) if result.stdout.strip() else []
+            if proc.returncode == 0:
+                output = stdout.decode()
+                releases = json.loads(output) if output.strip() else []
                 return {
                     "status": "success",
                     "namespace": namespace,
@@ -394,7 +417,7 @@ app.kubernetes.io/instance: {{{{ .Release.Name }}}}
             else:
                 return {
                     "status": "error",
-                    "message": f"Failed to list Helm releases: {result.stderr}"
+                    "message": f"Failed to list Helm releases: {stderr.decode()}"
                 }
                 
         except Exception as e:
@@ -402,3 +425,16 @@ app.kubernetes.io/instance: {{{{ .Release.Name }}}}
                 "status": "error",
                 "message": f"Exception listing Helm releases: {str(e)}"
             }
+    
+    async def batch_list(self, namespaces: List[str], concurrency: int = 8) -> List[Dict]:
+        """List Helm releases for several namespaces concurrently"""
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _list(namespace: str) -> Dict:
+            async with sem:
+                return await self.list_helm_releases(namespace)
+        
+        return await asyncio.gather(
+            *(_list(ns) for ns in namespaces),
+            return_exceptions=True
+        )
@@ -4,48 +4,68 @@ Azure Resource Management Services
 Handles Azure resource groups and general resource operations.
 """
 
+import asyncio
 import logging
+from operator import itemgetter
 from typing import Optional, Dict, Any
 
-from ..cli.client import az_command, load_azure_session
+from ..cli.cache import cached, is_ok
+from ..cli.client import az_command, get_default_subscription_id
+from ..cli.sdk import AZURE_SDK_AVAILABLE, get_resource_client
 
+# Pulls both fields out of an `az group list` entry in a single C call
+_get_name_location = itemgetter("name", "location")
 
+
+def _resolve_subscription(subscription_id: Optional[str] = None) -> Optional[str]:
+    """Return the given subscription or the CLI's default one (None when not logged in)"""
+    if subscription_id:
+        return subscription_id
+    try:
+        return get_default_subscription_id()
+    except (RuntimeError, OSError) as e:
+        logging.debug("No default Azure subscription: %s", e)
+        return None
+
+
+@cached(ttl=3600, cache_if=is_ok)
 def list_azure_resource_groups(subscription_id: Optional[str] = None) -> Dict[str, Any]:
     """List all resource groups in Azure subscription"""
     try:
+        subscription_id = _resolve_subscription(subscription_id)
         if not subscription_id:
-            subscriptions = load_azure_session()
-            if not subscriptions:
-                return {"status": "not_logged_in", "message": "Please log in first"}
-            subscription_id = subscriptions[0].get("id")
+            return {"status": "not_logged_in", "message": "Please log in first"}
 
-        resource_groups = az_command("group", "list", "--subscription", subscription_id)
+        if AZURE_SDK_AVAILABLE:
+            name_locations = (
+                (group.name, group.location)
+                for group in get_resource_client(subscription_id).resource_groups.list()
+            )
+        else:
+            resource_groups = az_command("group", "list", "--subscription", subscription_id)
+            name_locations = map(_get_name_location, resource_groups)
+        
+        resource_groups_out = [
+            {"name": name, "location": location, "subscription_id": subscription_id}
+            for name, location in name_locations
+        ]
         
         return {
             "status": "ok",
-            "resource_groups": [
-                {
-                    "name": rg.get("name"),
-                    "location": rg.get("location"),
-                    "subscription_id": subscription_id
-                }
-                for rg in resource_groups
-            ],
-            "count": len(resource_groups)
+            "resource_groups": resource_groups_out,
+            "count": len(resource_groups_out)
         }
     except Exception as e:
-        logging.error(f"Failed to list Azure resource groups: {e}")
+        logging.error("Failed to list Azure resource groups: %s", e)
         return {"status": "error", "error": str(e)}
 
 
 def create_resource_group(name: str, location: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
     """Create a new Azure resource group"""
     try:
+        subscription_id = _resolve_subscription(subscription_id)
         if not subscription_id:
-            subscriptions = load_azure_session()
-            if not subscriptions:
-                return {"status": "not_logged_in", "message": "Please log in first"}
-            subscription_id = subscriptions[0].get("id")
+            return {"status": "not_logged_in", "message": "Please log in first"}
 
         result = az_command(
             "group", "create",
@@ -53,6 +73,7 @@ def create_resource_group(name: str, location: str, subscription_id: Optional[st
             "--location", location,
             "--subscription", subscription_id
         )
+        list_azure_resource_groups.cache_clear()
         
         return {
             "status": "ok",
@@ -64,18 +85,16 @@ def create_resource_group(name: str, location: str, subscription_id: Optional[st
             "message": f"Resource group '{name}' created successfully"
         }
     except Exception as e:
-        logging.error(f"Failed to create resource group: {e}")
+        logging.error("Failed to create resource group: %s", e)
         return {"status": "error", "error": str(e)}
 
 
 def delete_resource_group(name: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
     """Delete an Azure resource group"""
     try:
+        subscription_id = _resolve_subscription(subscription_id)
         if not subscription_id:
-            subscriptions = load_azure_session()
-            if not subscriptions:
-                return {"status": "not_logged_in", "message": "Please log in first"}
-            subscription_id = subscriptions[0].get("id")
+            return {"status": "not_logged_in", "message": "Please log in first"}
 
         az_command(
             "group", "delete",
@@ -83,11 +102,27 @@ def delete_resource_group(name: str, subscription_id: Optional[str] = None) -> D
             "--subscription", subscription_id,
             "--yes"  # Auto-confirm deletion
         )
+        list_azure_resource_groups.cache_clear()
         
         return {
             "status": "ok",
             "message": f"Resource group '{name}' deleted successfully"
         }
     except Exception as e:
-        logging.error(f"Failed to delete resource group: {e}")
+        logging.error("Failed to delete resource group: %s", e)
         return {"status": "error", "error": str(e)}
+
+
+async def list_azure_resource_groups_async(subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of list_azure_resource_groups that keeps the event loop free"""
+    return await asyncio.to_thread(list_azure_resource_groups, subscription_id)
+
+
+async def create_resource_group_async(name: str, location: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of create_resource_group that keeps the event loop free"""
+    return await asyncio.to_thread(create_resource_group, name, location, subscription_id)
+
+
+async def delete_resource_group_async(name: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Async variant of delete_resource_group that keeps the event loop free"""
+    return await asyncio.to_thread(delete_resource_group, name, subscription_id)
@@ -17,10 +17,14 @@ from .helpers import (
 
 from .monitoring import (
     get_resource_metrics,
+    get_resource_metrics_async,
     get_vm_performance_metrics,
+    get_metrics_batch,
+    get_many_vm_metrics,
     get_cost_analysis,
     get_resource_health,
-    monitor_vm_availability
+    monitor_vm_availability,
+    monitor_vm_availability_async
 )
 
 __all__ = [
@@ -35,8 +39,12 @@ __all__ = [
     
     # Monitoring utilities
     "get_resource_metrics",
+    "get_resource_metrics_async",
     "get_vm_performance_metrics", 
+    "get_metrics_batch",
+    "get_many_vm_metrics",
     "get_cost_analysis",
     "get_resource_health",
-    "monitor_vm_availability"
+    "monitor_vm_availability",
+    "monitor_vm_availability_async"
 ]
@@ -35,7 +35,7 @@ def format_azure_cost(cost_data: List[Dict]) -> Dict[str, Any]:
             "currency": cost_data[0].get("currency", "USD") if cost_data else "USD"
         }
     except Exception as e:
-        logging.error(f"Failed to format cost data: {e}")
+        logging.error("Failed to format cost data: %s", e)
         return {"total_cost": 0.0, "entries": [], "currency": "USD"}
 
 
@@ -84,7 +84,7 @@ def parse_azure_date(date_str: str) -> Optional[datetime]:
             return datetime.strptime(clean_date, '%Y-%m-%d')
         return None
     except Exception as e:
-        logging.error(f"Failed to parse Azure date '{date_str}': {e}")
+        logging.error("Failed to parse Azure date '%s': %s", date_str, e)
         return None
 
 
@@ -129,22 +129,26 @@ def sanitize_resource_name(name: str) -> str:
     return sanitized
 
 
+def _jmespath_literal(value: str) -> str:
+    """Escape a value for use inside a JMESPath raw string literal"""
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
 def build_azure_filter(resource_type: Optional[str] = None, 
                       location: Optional[str] = None,
                       tag_filters: Optional[Dict[str, str]] = None) -> str:
     """Build JMESPath filter for Azure CLI queries"""
-    filters = []
-    
-    if resource_type:
-        filters.append(f"type=='{resource_type}'")
+    parts = [f"type=='{_jmespath_literal(resource_type)}'"] if resource_type else []
     
     if location:
-        filters.append(f"location=='{location}'")
+        parts.append(f"location=='{_jmespath_literal(location)}'")
     
     if tag_filters:
-        for key, value in tag_filters.items():
-            filters.append(f"tags.{key}=='{value}'")
+        parts.extend(
+            f"tags.{key}=='{_jmespath_literal(value)}'"
+            for key, value in tag_filters.items()
+        )
     
-    if filters:
-        return f"[?{' && '.join(filters)}]"
-    return ""
+    if not parts:
+        return ""
+    return f"[?{' && '.join(parts)}]"
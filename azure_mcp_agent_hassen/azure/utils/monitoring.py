@@ -5,34 +5,126 @@ Utilities for monitoring Azure resources, collecting metrics,
 and handling cost analysis data.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 
-from ..cli.client import az_command
+import httpx
 
+from ..cli.cache import cached, is_ok
+from ..cli.client import az_command, az_json_async, get_default_subscription_id
+from ..cli.sdk import (
+    AZURE_SDK_AVAILABLE,
+    get_credential,
+    get_monitor_client,
+    to_cli_dict,
+    subscription_from_resource_id
+)
 
+# Common VM metrics
+VM_METRICS = (
+    "Percentage CPU",
+    "Network In Total", 
+    "Network Out Total",
+    "Disk Read Bytes",
+    "Disk Write Bytes"
+)
+
+# ARM resource ID / scope templates
+_SUBSCRIPTION_SCOPE_TMPL = "/subscriptions/{}"
+_RESOURCE_GROUP_SCOPE_TMPL = "/subscriptions/{}/resourceGroups/{}"
+_VM_RID_TMPL = "/subscriptions/{}/resourceGroups/{}/providers/Microsoft.Compute/virtualMachines/{}"
+
+# Instance view status code prefixes reported by monitor_vm_availability
+_STATE_PREFIXES = ("PowerState", "ProvisioningState")
+
+# Cap concurrent metric queries to stay under ARM throttling limits
+METRICS_CONCURRENCY = 16
+
+# Azure Monitor batch metrics endpoint (regional, up to 50 resources per call)
+METRICS_BATCH_SIZE = 50
+METRICS_BATCH_API_VERSION = "2023-10-01"
+METRICS_BATCH_SCOPE = "https://metrics.monitor.azure.com/.default"
+
+
+def _metrics_window(start_time: Optional[str] = None,
+                    end_time: Optional[str] = None) -> Tuple[str, str]:
+    """Resolve the metrics time range, defaulting to the last 24 hours"""
+    if not start_time:
+        start_time = (datetime.utcnow() - timedelta(hours=24)).isoformat()
+    if not end_time:
+        end_time = datetime.utcnow().isoformat()
+    return start_time, end_time
+
+
+def _metrics_args(resource_id: str, metric_names: List[str],
+                  start_time: str, end_time: str) -> List[str]:
+    """Build `az monitor metrics list` arguments"""
+    return [
+        "monitor", "metrics", "list",
+        "--resource", resource_id,
+        "--metric", ",".join(metric_names),
+        "--start-time", start_time,
+        "--end-time", end_time,
+        "--aggregation", "Average"
+    ]
+
+
+def _query_metrics_sdk(resource_id: str, metric_names: List[str],
+                       start_time: str, end_time: str) -> Dict[str, Any]:
+    """Query metrics through the cached monitor client"""
+    client = get_monitor_client(subscription_from_resource_id(resource_id))
+    response = client.metrics.list(
+        resource_id,
+        timespan=f"{start_time}/{end_time}",
+        metricnames=",".join(metric_names),
+        aggregation="Average"
+    )
+    return to_cli_dict(response)
+
+
+@cached(ttl=60, cache_if=is_ok)
 def get_resource_metrics(resource_id: str, metric_names: List[str], 
                         start_time: Optional[str] = None,
                         end_time: Optional[str] = None) -> Dict[str, Any]:
     """Get metrics for a specific Azure resource"""
     try:
-        # Default to last 24 hours if no time range specified
-        if not start_time:
-            start_time = (datetime.utcnow() - timedelta(hours=24)).isoformat()
-        if not end_time:
-            end_time = datetime.utcnow().isoformat()
+        start_time, end_time = _metrics_window(start_time, end_time)
         
-        metrics_str = ",".join(metric_names)
+        if AZURE_SDK_AVAILABLE:
+            result = _query_metrics_sdk(resource_id, metric_names, start_time, end_time)
+        else:
+            result = az_command(*_metrics_args(resource_id, metric_names, start_time, end_time))
         
-        result = az_command(
-            "monitor", "metrics", "list",
-            "--resource", resource_id,
-            "--metric", metrics_str,
-            "--start-time", start_time,
-            "--end-time", end_time,
-            "--aggregation", "Average"
-        )
+        return {
+            "status": "ok",
+            "metrics": result.get("value", []),
+            "timespan": f"{start_time} to {end_time}"
+        }
+        
+    except Exception as e:
+        logging.error("Failed to get resource metrics: %s", e)
+        return {"status": "error", "error": str(e)}
+
+
+async def get_resource_metrics_async(resource_id: str, metric_names: List[str],
+                                     start_time: Optional[str] = None,
+                                     end_time: Optional[str] = None) -> Dict[str, Any]:
+    """Get metrics for a specific Azure resource asynchronously"""
+    try:
+        start_time, end_time = _metrics_window(start_time, end_time)
+        
+        if AZURE_SDK_AVAILABLE:
+            result = await asyncio.to_thread(
+                _query_metrics_sdk, resource_id, metric_names, start_time, end_time
+            )
+        else:
+            result = await az_json_async(
+                *_metrics_args(resource_id, metric_names, start_time, end_time)
+            )
         
         return {
             "status": "ok",
@@ -41,7 +133,7 @@ def get_resource_metrics(resource_id: str, metric_names: List[str],
         }
         
     except Exception as e:
-        logging.error(f"Failed to get resource metrics: {e}")
+        logging.error("Failed to get resource metrics: %s", e)
         return {"status": "error", "error": str(e)}
 
 
@@ -50,33 +142,140 @@ def get_vm_performance_metrics(vm_name: str, resource_group: str,
     """Get performance metrics for a specific VM"""
     try:
         # Construct resource ID
-        if not subscription_id:
-            # Get default subscription
-            account_info = az_command("account", "show")
-            subscription_id = account_info.get("id")
-        
-        resource_id = (
-            f"/subscriptions/{subscription_id}/"
-            f"resourceGroups/{resource_group}/"
-            f"providers/Microsoft.Compute/virtualMachines/{vm_name}"
-        )
+        subscription_id = subscription_id or get_default_subscription_id()
         
-        # Common VM metrics
-        vm_metrics = [
-            "Percentage CPU",
-            "Network In Total", 
-            "Network Out Total",
-            "Disk Read Bytes",
-            "Disk Write Bytes"
-        ]
+        resource_id = _VM_RID_TMPL.format(subscription_id, resource_group, vm_name)
         
-        return get_resource_metrics(resource_id, vm_metrics)
+        return get_resource_metrics(resource_id, VM_METRICS)
         
     except Exception as e:
-        logging.error(f"Failed to get VM performance metrics: {e}")
+        logging.error("Failed to get VM performance metrics: %s", e)
         return {"status": "error", "error": str(e)}
 
 
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield successive lists of at most `size` items"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _resource_namespace(resource_id: str) -> str:
+    """Extract the metric namespace (e.g. Microsoft.Compute/virtualMachines) from a resource ID
+    
+    Raises ValueError for IDs without a provider segment (e.g. a resource group).
+    """
+    parts = resource_id.strip("/").split("/")
+    lowered = [part.lower() for part in parts]
+    index = lowered.index("providers") if "providers" in lowered else len(parts)
+    if index + 2 >= len(parts):
+        raise ValueError(f"Not a provider resource ID: {resource_id}")
+    return f"{parts[index + 1]}/{parts[index + 2]}"
+
+
+async def _fetch_metrics_batch(client: httpx.AsyncClient, region: str,
+                               subscription_id: str, namespace: str,
+                               resource_ids: List[str], metric_names: List[str],
+                               start_time: str, end_time: str) -> Dict[str, Dict[str, Any]]:
+    """Query one batch of same-type resources through the batch metrics endpoint"""
+    token = await asyncio.to_thread(get_credential().get_token, METRICS_BATCH_SCOPE)
+    response = await client.post(
+        f"https://{region}.metrics.monitor.azure.com/subscriptions/{subscription_id}/metrics:getBatch",
+        params={
+            "api-version": METRICS_BATCH_API_VERSION,
+            "metricnamespace": namespace,
+            "metricnames": ",".join(metric_names),
+            "starttime": start_time,
+            "endtime": end_time,
+            "aggregation": "average"
+        },
+        json={"resourceids": resource_ids},
+        headers={"Authorization": f"Bearer {token.token}"}
+    )
+    response.raise_for_status()
+    
+    # The service may normalise resource ID casing; map back to the caller's IDs
+    requested = {resource_id.lower(): resource_id for resource_id in resource_ids}
+    timespan = f"{start_time} to {end_time}"
+    return {
+        requested.get(entry["resourceid"].lower(), entry["resourceid"]): {
+            "status": "ok",
+            "metrics": entry.get("value", []),
+            "timespan": timespan
+        }
+        for entry in response.json().get("values", [])
+    }
+
+
+async def get_metrics_batch(resource_ids: List[str], metric_names: List[str],
+                            start_time: Optional[str] = None,
+                            end_time: Optional[str] = None,
+                            region: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Get metrics for many resources, keyed by resource ID
+    
+    With a region and the Azure SDK installed, resources are sent to the
+    regional batch metrics endpoint 50 at a time. Otherwise each resource
+    is queried individually with bounded concurrency.
+    """
+    start_time, end_time = _metrics_window(start_time, end_time)
+    
+    if not (region and AZURE_SDK_AVAILABLE):
+        semaphore = asyncio.Semaphore(METRICS_CONCURRENCY)
+        
+        async def fetch(resource_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await get_resource_metrics_async(
+                    resource_id, metric_names, start_time, end_time
+                )
+        
+        results = await asyncio.gather(*(fetch(resource_id) for resource_id in resource_ids))
+        return dict(zip(resource_ids, results))
+    
+    # The batch endpoint takes one subscription and one metric namespace per call;
+    # malformed IDs get their own error entry instead of failing the batch
+    metrics: Dict[str, Dict[str, Any]] = {}
+    groups: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for resource_id in resource_ids:
+        try:
+            key = (subscription_from_resource_id(resource_id), _resource_namespace(resource_id))
+        except (ValueError, IndexError):
+            metrics[resource_id] = {"status": "error", "error": f"Invalid resource ID: {resource_id}"}
+            continue
+        groups[key].append(resource_id)
+    
+    batches = [
+        (subscription_id, namespace, chunk)
+        for (subscription_id, namespace), ids in groups.items()
+        for chunk in _chunked(ids, METRICS_BATCH_SIZE)
+    ]
+    
+    async with httpx.AsyncClient(timeout=60) as client:
+        batch_results = await asyncio.gather(
+            *(
+                _fetch_metrics_batch(client, region, subscription_id, namespace, chunk,
+                                     metric_names, start_time, end_time)
+                for subscription_id, namespace, chunk in batches
+            ),
+            return_exceptions=True
+        )
+    
+    for (_, _, chunk), result in zip(batches, batch_results):
+        if isinstance(result, Exception):
+            logging.error("Failed to get batch metrics: %s", result)
+            result = {resource_id: {"status": "error", "error": str(result)} for resource_id in chunk}
+        metrics.update(result)
+    
+    return {
+        resource_id: metrics.get(resource_id, {"status": "error", "error": "No metrics returned"})
+        for resource_id in resource_ids
+    }
+
+
+async def get_many_vm_metrics(vm_ids: List[str], region: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Get performance metrics for many VMs, keyed by resource ID"""
+    return await get_metrics_batch(vm_ids, VM_METRICS, region=region)
+
+
 def get_cost_analysis(subscription_id: Optional[str] = None,
                      resource_group: Optional[str] = None,
                      timeframe: str = "MonthToDate") -> Dict[str, Any]:
@@ -84,19 +283,12 @@ def get_cost_analysis(subscription_id: Optional[str] = None,
     try:
         cmd_args = ["costmanagement", "query"]
         
+        subscription_id = subscription_id or get_default_subscription_id()
+        
         if resource_group:
-            if not subscription_id:
-                account_info = az_command("account", "show")
-                subscription_id = account_info.get("id")
-            
-            scope = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}"
+            scope = _RESOURCE_GROUP_SCOPE_TMPL.format(subscription_id, resource_group)
         else:
-            if subscription_id:
-                scope = f"/subscriptions/{subscription_id}"
-            else:
-                # Use default subscription
-                account_info = az_command("account", "show")
-                scope = f"/subscriptions/{account_info.get('id')}"
+            scope = _SUBSCRIPTION_SCOPE_TMPL.format(subscription_id)
         
         cmd_args.extend(["--scope", scope])
         cmd_args.extend(["--timeframe", timeframe])
@@ -111,7 +303,7 @@ def get_cost_analysis(subscription_id: Optional[str] = None,
         }
         
     except Exception as e:
-        logging.error(f"Failed to get cost analysis: {e}")
+        logging.error("Failed to get cost analysis: %s", e)
         return {"status": "error", "error": str(e)}
 
 
@@ -131,54 +323,68 @@ def get_resource_health(resource_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logging.error(f"Failed to check resource health: {e}")
+        logging.error("Failed to check resource health: %s", e)
         return {"status": "error", "error": str(e)}
 
 
-def monitor_vm_availability(vm_name: str, resource_group: str,
-                           subscription_id: Optional[str] = None) -> Dict[str, Any]:
-    """Monitor VM availability and status"""
+def _vm_args(vm_name: str, resource_group: str, subscription_id: Optional[str]) -> Tuple[str, ...]:
+    return (
+        "--name", vm_name,
+        "--resource-group", resource_group,
+        "--subscription", subscription_id or get_default_subscription_id()
+    )
+
+
+def _availability(vm_name: str, vm_details: Dict[str, Any], instance_view: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the availability report from `vm show` and `vm get-instance-view` output"""
+    # Bucket status codes by their prefix (e.g. "PowerState/running")
+    states = dict.fromkeys(_STATE_PREFIXES)
+    for status in instance_view.get("instanceView", instance_view).get("statuses", ()):
+        code = status.get("code", "")
+        prefix = code.partition("/")[0]
+        if prefix in states:
+            states[prefix] = code
+    
+    return {
+        "status": "ok",
+        "vm_name": vm_name,
+        "power_state": states["PowerState"] or "Unknown",
+        "provisioning_state": states["ProvisioningState"] or "Unknown",
+        "location": vm_details.get("location"),
+        "vm_size": vm_details.get("hardwareProfile", {}).get("vmSize"),
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
+
+async def monitor_vm_availability_async(vm_name: str, resource_group: str,
+                                        subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Monitor VM availability and status, fetching details and instance view concurrently"""
     try:
-        if not subscription_id:
-            account_info = az_command("account", "show")
-            subscription_id = account_info.get("id")
-        
-        # Get VM details
-        vm_details = az_command(
-            "vm", "show",
-            "--name", vm_name,
-            "--resource-group", resource_group,
-            "--subscription", subscription_id
-        )
+        vm_args = _vm_args(vm_name, resource_group, subscription_id)
         
-        # Get instance view for current status
-        instance_view = az_command(
-            "vm", "get-instance-view",
-            "--name", vm_name,
-            "--resource-group", resource_group,
-            "--subscription", subscription_id
+        # VM details and instance view (for current status) are independent
+        vm_details, instance_view = await asyncio.gather(
+            az_json_async("vm", "show", *vm_args),
+            az_json_async("vm", "get-instance-view", *vm_args)
         )
+        return _availability(vm_name, vm_details, instance_view)
         
-        # Extract status information
-        power_state = "Unknown"
-        provisioning_state = "Unknown"
-        
-        for status in instance_view.get("statuses", []):
-            if status.get("code", "").startswith("PowerState/"):
-                power_state = status.get("code")
-            elif status.get("code", "").startswith("ProvisioningState/"):
-                provisioning_state = status.get("code")
-        
-        return {
-            "status": "ok",
-            "vm_name": vm_name,
-            "power_state": power_state,
-            "provisioning_state": provisioning_state,
-            "location": vm_details.get("location"),
-            "vm_size": vm_details.get("hardwareProfile", {}).get("vmSize"),
-            "last_updated": datetime.utcnow().isoformat()
-        }
+    except Exception as e:
+        logging.error("Failed to monitor VM availability: %s", e)
+        return {"status": "error", "error": str(e)}
+
+
+def monitor_vm_availability(vm_name: str, resource_group: str,
+                           subscription_id: Optional[str] = None) -> Dict[str, Any]:
+    """Monitor VM availability and status (safe to call with an event loop running)"""
+    try:
+        vm_args = _vm_args(vm_name, resource_group, subscription_id)
+        return _availability(
+            vm_name,
+            az_command("vm", "show", *vm_args),
+            az_command("vm", "get-instance-view", *vm_args)
+        )
         
     except Exception as e:
-        logging.error(f"Failed to monitor VM availability: {e}")
+        logging.error("Failed to monitor VM availability: %s", e)
         return {"status": "error", "error": str(e)}
@@ -1,14 +1,34 @@
 from fastapi import FastAPI, HTTPException, Query, Request, Form
-from fastapi.responses import RedirectResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi_mcp import FastApiMCP
+import asyncio
+import json
+import uuid
 import webbrowser
-from typing import List
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
 from dotenv import load_dotenv
 import os
+import shlex
 from fastapi import Body
 
+# orjson encodes responses several times faster than the stdlib json module
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 # Import utils - Clean modular structure  
 from azure_mcp_agent_hassen.CI.git import (
     # Core Models (only import ones that definitely exist)
@@ -20,11 +40,16 @@ from azure_mcp_agent_hassen.CI.git import (
     get_github_login_url,
     initiate_github_login,
     exchange_code_for_token,
-    get_all_users,
+    get_all_users_async,
+    get_user_session_async,
+    store_user_repositories_async,
     push_repository_changes,
+    get_github_client,
+    aclose_github_client,
     
     # Repository Services
     fetch_user_repositories,
+    dump_repositories,
     clone_repository
     
     # Note: Additional imports like AuthToken, GitHubUser, CloneResult, etc.
@@ -41,6 +66,7 @@ from azure_mcp_agent_hassen.CI.docker import (
     parse_dockerfile_info,
     # Port detection utilities
     detect_project_ports,
+    get_port_mappings,
     generate_container_name,
     # Models
     DeployRequest,
@@ -50,15 +76,16 @@ from azure_mcp_agent_hassen.CI.docker import (
 from .azure import (
     # Auth & session
     launch_azure_login,
+    get_azure_subscriptions as fetch_azure_subscriptions,
     load_azure_session,
     # VM operations
-    get_azure_vm_usage_and_cost,
+    get_azure_vm_usage_and_cost_async,
     get_azure_vm_details,
     # Resource management
-    list_azure_resource_groups,
+    list_azure_resource_groups_async,
     # CLI
     az_command,
-    az_command_async,
+    az_command_text_async,
     # Models
     AzureLoginResponse,
     AzureSubscriptionsResponse,
@@ -96,23 +123,120 @@ from azure_mcp_agent_hassen.azure.services.helm import HelmService
 from azure_mcp_agent_hassen.azure.services.deployment import AzureDeploymentService
 
 load_dotenv()
-users = get_all_users()
 
 # Initialize services
 acr_service = ACRService()
 helm_service = HelmService()
 deployment_service = AzureDeploymentService()
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled GitHub client (HTTP/2 when h2 is installed) for every request
+    app.state.http = get_github_client()
+    yield
+    await aclose_github_client()
+    await job_store.aclose()
+
+app = FastAPI(lifespan=lifespan, default_response_class=DEFAULT_RESPONSE_CLASS)
 
 # Static & templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
+# ---------- Background jobs ----------
+# Clones and image builds take minutes, so they run in a worker thread
+# and the request returns a job id to poll at /jobs/{id}. With REDIS_URL
+# set, job records live in Redis so any worker can answer the poll;
+# otherwise they stay in this process and only the newest JOBS_KEPT are kept.
+JOBS_KEPT = 256
+JOB_TTL = 24 * 3600
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_JOBS = bool(REDIS_URL and REDIS_AVAILABLE)
+
+class _MemoryJobs:
+    def __init__(self):
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["job_id"]] = job
+        while len(self._jobs) > JOBS_KEPT:
+            self._jobs.popitem(last=False)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    async def aclose(self) -> None:
+        pass
+
+class _RedisJobs:
+    """Job records kept in Redis as JSON, expiring JOB_TTL seconds after the last update"""
+
+    def __init__(self, url: str):
+        self._redis = redis_asyncio.Redis.from_url(url)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"az_mcp:job:{job_id}"
+
+    async def save(self, job: Dict[str, Any]) -> None:
+        await self._redis.set(self._key(job["job_id"]), json.dumps(job, default=str), ex=JOB_TTL)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.get(self._key(job_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+job_store = _RedisJobs(REDIS_URL) if SHARED_JOBS else _MemoryJobs()
+_job_tasks: set = set()
+
+async def _run_job(job: Dict[str, Any], fn: Callable[..., Dict[str, Any]], *args) -> None:
+    job["status"] = "running"
+    await job_store.save(job)
+    try:
+        job["result"] = await asyncio.to_thread(fn, *args)
+        job["status"] = "error" if job["result"].get("status") == "error" else "done"
+    except Exception as e:
+        job["status"] = "error"
+        job["result"] = {"status": "error", "error": str(e)}
+    await job_store.save(job)
+
+async def start_job(fn: Callable[..., Dict[str, Any]], *args) -> str:
+    """Run a blocking job in the background and return its id"""
+    job = {"job_id": uuid.uuid4().hex, "status": "queued", "result": None}
+    await job_store.save(job)
+    task = asyncio.create_task(_run_job(job, fn, *args))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+    return job["job_id"]
+
+def clone_job(repo_url: str) -> Dict[str, Any]:
+    clone_result = clone_repository(CloneRequest(repo_url=repo_url))
+    if clone_result.status == "error":
+        return {"status": "error", "error": clone_result.message}
+    return {"status": "ok", "message": "Repository cloned successfully", "local_path": clone_result.repo_path}
+
+def build_and_push_job(repo_path: str, image_name: str, tag: str) -> Dict[str, Any]:
+    login_result = docker_login()
+    if login_result["status"] != "ok":
+        return login_result
+    build_result = build_image(repo_path, image_name, tag)
+    if build_result["status"] != "ok":
+        return build_result
+    return push_image(image_name, tag)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 # ---------- Web UI Documentation ----------
 @app.get("/")
 async def documentation_home(request: Request):
-    logged_in = len(users) > 0
+    logged_in = len(await get_all_users_async()) > 0
     return templates.TemplateResponse("documentation.html", {"request": request, "logged_in": logged_in})
 
 @app.get("/workflow/order")
@@ -183,8 +307,8 @@ async def get_workflow_order():
                 "description": "Clone repository for local development",
                 "required": True,
                 "dependencies": [],
-                "expected_result": "Repository cloned to ./repos/repo-name",
-                "next_steps": ["Analyze repository structure"]
+                "expected_result": "Job id; /jobs/{id} reports ./repos/repo-name once cloned",
+                "next_steps": ["Poll /jobs/{id} until done, then analyze repository structure"]
             },
             {
                 "step": 5,
@@ -224,8 +348,8 @@ async def get_workflow_order():
                 "description": "Build Docker image from repository",
                 "required": True,
                 "dependencies": ["Step 4: Repository cloned", "Step 5: Port detection"],
-                "expected_result": "Docker image built successfully",
-                "next_steps": ["Test container locally or proceed to infrastructure"]
+                "expected_result": "Job id; /jobs/{id} reports the pushed image",
+                "next_steps": ["Poll /jobs/{id} until done, then test container locally or proceed to infrastructure"]
             },
             {
                 "step": 8,
@@ -512,7 +636,7 @@ async def github_callback(code: str = Query(...)):
     auth_token = await exchange_code_for_token(code)
     access_token = auth_token.access_token
     repos = await fetch_user_repositories(access_token)
-    users[access_token] = repos
+    await store_user_repositories_async(access_token, repos)
     return RedirectResponse("/")
 
 
@@ -520,7 +644,7 @@ async def github_callback(code: str = Query(...)):
 async def web_clone(request: Request, repo_url: str = Form(...)):
     try:
         clone_request = CloneRequest(repo_url=repo_url)
-        clone_result = clone_repository(clone_request)
+        clone_result = await run_in_threadpool(clone_repository, clone_request)
         path = clone_result.repo_path
         message = f"Repository cloned successfully: {path}"
     except Exception as e:
@@ -529,13 +653,8 @@ async def web_clone(request: Request, repo_url: str = Form(...)):
 
 @app.post("/web/deploy")
 async def web_deploy(request: Request, repo_path: str = Form(...), image_name: str = Form(...), tag: str = Form("latest")):
-    try:
-        docker_login()
-        built_image = build_image(repo_path, image_name, tag)
-        push_image(image_name, tag)
-        message = f"✅ Deployment successful: {built_image}"
-    except Exception as e:
-        message = f"❌ Deployment failed: {str(e)}"
+    job_id = await start_job(build_and_push_job, repo_path, image_name, tag)
+    message = f"🚀 Deployment started: track it at /jobs/{job_id}"
     return templates.TemplateResponse("index.html", {"request": request, "logged_in": True, "message": message})
 
 @app.post("/web/push")
@@ -545,7 +664,7 @@ async def web_push(request: Request, repo_path: str = Form(...), commit_message:
         if not os.path.isabs(repo_path):
             repo_path = os.path.abspath(os.path.join("./repos", repo_path))
         
-        result = push_repository_changes(repo_path, commit_message)
+        result = await run_in_threadpool(push_repository_changes, repo_path, commit_message)
         
         if result["status"] == "success":
             message = f"✅ Push successful: {result['message']}"
@@ -561,27 +680,31 @@ async def web_push(request: Request, repo_path: str = Form(...), commit_message:
 @app.get("/github/repos", response_model=List[Repository])
 async def get_repositories(token: str = Query(None)):
     if not token:
-        if not users:
+        sessions = await get_all_users_async()
+        if not sessions:
             raise HTTPException(status_code=401, detail="No authorized users. Authorize first via /github/login.")
-        return list(users.values())[0]
-    if token not in users:
-        raise HTTPException(status_code=404, detail="Token not found. Authorize first via /github/login.")
-    return users[token]
+        session = sessions[0]
+    else:
+        session = await get_user_session_async(token)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Token not found. Authorize first via /github/login.")
+    # The stored models are already validated; skip response_model revalidation
+    return Response(dump_repositories(session["repositories"]), media_type="application/json")
+
+# Same payload on every call
+GITHUB_LOGIN_RESPONSE = {
+    "login_url": get_github_login_url(),
+    "message": "Please open this URL in a browser to authenticate"
+}
 
 @app.get("/github/login", response_model=LoginResponse)
 async def github_login_mcp():
-    url = get_github_login_url()
-    webbrowser.open_new_tab(url)
-    return {"login_url": url, "message": "Please open this URL in a browser to authenticate"}
+    webbrowser.open_new_tab(GITHUB_LOGIN_RESPONSE["login_url"])
+    return GITHUB_LOGIN_RESPONSE
 
 @app.get("/clone")
-def clone_repository_endpoint(repo_url: str = Query(...)):
-    try:
-        clone_request = CloneRequest(repo_url=repo_url)
-        clone_result = clone_repository(clone_request)
-        return {"message": "Repository cloned successfully", "local_path": clone_result.repo_path}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def clone_repository_endpoint(repo_url: str = Query(...)):
+    return {"job_id": await start_job(clone_job, repo_url)}
 
 @app.post("/git/push")
 def push_repository_endpoint(repo_path: str = Query(...), commit_message: str = Query("Add workflow files")):
@@ -616,20 +739,19 @@ def push_repository_endpoint(repo_path: str = Query(...), commit_message: str =
 
 @app.post("/deploy")
 async def deploy(request: DeployRequest):
-    try:
-        docker_login()
-        built_image = build_image(request.repo_path, request.image_name, request.tag)
-        push_image(request.image_name, request.tag)
-        return {"status": "success", "image": f"{request.image_name}:{request.tag}"}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    return {"job_id": await start_job(build_and_push_job, request.repo_path, request.image_name, request.tag)}
 @app.get("/run_container")
 def run_docker_container(image: str = Query(...), tag: str = "latest", repo_path: str = Query(None)):
     if repo_path:
-        # Use auto-detection with repository context
+        # Use auto-detection with repository context; one detection feeds
+        # both the port mappings and the summary below
         port_detection = detect_project_ports(repo_path)
         container_name = generate_container_name(image, tag)
-        run_container(image, tag, container_name=container_name)
+        run_container(ContainerRunOptions(
+            image=f"{image}:{tag}",
+            name=container_name,
+            ports=get_port_mappings(port_detection)
+        ))
         
         return {
             "status": "running", 
@@ -644,7 +766,11 @@ def run_docker_container(image: str = Query(...), tag: str = "latest", repo_path
     else:
         # Fallback to default behavior
         container_name = generate_container_name(image, tag)
-        run_container(image, tag, container_name=container_name)
+        run_container(ContainerRunOptions(
+            image=f"{image}:{tag}",
+            name=container_name,
+            ports={"8000": "8000"}
+        ))
         return {
             "status": "running", 
             "image": f"{image}:{tag}",
@@ -711,8 +837,10 @@ async def azure_login_handler():
     """Wrapper for backward compatibility"""
     return launch_azure_login()
 
-async def get_azure_subscriptions():
+async def get_azure_subscriptions(force_refresh: bool = False):
     """Wrapper for backward compatibility"""
+    if force_refresh:
+        return await asyncio.to_thread(fetch_azure_subscriptions, force_refresh=True)
     try:
         subscriptions = load_azure_session()
         if subscriptions:
@@ -736,16 +864,7 @@ async def get_azure_subscriptions():
 async def azure_vm_usage_handler():
     """Wrapper for backward compatibility"""
     try:
-        result = get_azure_vm_usage_and_cost()
-        return AzureVMUsageResponse(
-            status=result.get("status", "error"),
-            vms=result.get("vms", []),
-            total_cost=result.get("total_cost", 0.0),
-            currency=result.get("currency"),
-            debug=result.get("debug", []),
-            vm_error=result.get("vm_error"),
-            cost_error=result.get("cost_error")
-        )
+        return await get_azure_vm_usage_and_cost_async()
     except Exception as e:
         return AzureVMUsageResponse(
             status="error",
@@ -776,9 +895,9 @@ async def azure_login():
     return await azure_login_handler()
 
 @app.get("/azure/subscriptions", response_model=AzureSubscriptionsResponse)  
-async def azure_subscriptions():
+async def azure_subscriptions(force_refresh: bool = Query(False)):
     """Get list of Azure subscriptions"""
-    return get_azure_subscriptions()
+    return await get_azure_subscriptions(force_refresh)
 
 @app.get("/azure/vms", response_model=AzureVMUsageResponse)
 async def azure_vm_usage():
@@ -788,7 +907,7 @@ async def azure_vm_usage():
 @app.get("/azure/resource-groups")
 async def azure_resource_groups(subscription_id: str = Query(None)):
     """List Azure resource groups"""
-    return list_azure_resource_groups(subscription_id)
+    return await list_azure_resource_groups_async(subscription_id)
 
 @app.get("/azure/vm-details")
 async def azure_vm_details(vm_name: str = Query(...), resource_group: str = Query(...), subscription_id: str = Query(None)):
@@ -803,7 +922,14 @@ async def azure_health():
 @app.post("/azure/command")
 async def azure_command_async(command: str = Query(...)):
     """Execute Azure CLI command asynchronously"""
-    result = await az_command_async(command)
+    try:
+        args = shlex.split(command)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid command: {e}")
+    try:
+        result = await az_command_text_async(*args)
+    except RuntimeError as e:
+        result = f"❌ Error: {e}"
     return {"command": command, "result": result}
 
 
@@ -858,7 +984,7 @@ async def setup_cicd_pipeline(
 ):
     try:
         # Use your CI/CD manager to setup the pipeline
-        setup_ci_cd(owner, repo, token)
+        await setup_ci_cd(owner, repo, token)
         
         return {
             "status": "success",
@@ -880,7 +1006,7 @@ async def select_repository_branch(
 ):
     try:
         # Get branches using your branch selector
-        selected_branch = select_branch(owner, repo, token)
+        selected_branch = await select_branch(owner, repo, token)
         
         return {
             "status": "success",
@@ -1285,5 +1411,23 @@ mcp = FastApiMCP(app)
 mcp.mount_http()
 
 if __name__ == "__main__":
+    import logging
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+    # loop/http "auto" already pick uvloop and httptools when installed.
+    # Sessions and background jobs are per-process unless REDIS_URL is set,
+    # so extra workers are opt-in and need the shared store.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1 and not SHARED_JOBS:
+        logging.warning("WEB_CONCURRENCY=%d ignored: set REDIS_URL (and install redis) "
+                        "to share jobs between workers; running a single worker", workers)
+        workers = 1
+    uvicorn.run(
+        "azure_mcp_agent_hassen.server:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level=os.getenv("LOG_LEVEL", "WARNING").lower()
+    )